@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 
+from auth_app.hashing import run_hashing
 from auth_app.models import CustomUser
 
 
@@ -27,7 +28,7 @@ class RegistrationSerializer(serializers.ModelSerializer):
         Validate user input during registration.
 
         Ensures that the provided passwords match and that the email
-        address has not already been registered.
+        address has not already been registered (ignoring case).
 
         Raises:
             serializers.ValidationError: If the passwords do not match
@@ -36,7 +37,7 @@ class RegistrationSerializer(serializers.ModelSerializer):
 
         if data['password'] != data['repeated_password']:
             raise serializers.ValidationError("Passwörter stimmen nicht überein.")
-        if CustomUser.objects.filter(email=data['email']).exists():
+        if CustomUser.objects.filter_by_email(data['email']).exists():
             raise serializers.ValidationError("Diese E-Mail wird bereits verwendet.")
         return data
 
@@ -45,13 +46,17 @@ class RegistrationSerializer(serializers.ModelSerializer):
         Create a new user instance with hashed password.
 
         Removes the repeated password from the validated data,
-        hashes the password, and saves the user instance.
+        hashes the password in the bounded hashing pool, and saves the
+        user instance.
 
         Args:
             validated_data (dict): Validated user input data.
 
         Returns:
             CustomUser: The newly created user instance.
+
+        Raises:
+            HashingBusy: If too many passwords are being hashed.
         """
 
         validated_data.pop('repeated_password')
@@ -59,7 +64,7 @@ class RegistrationSerializer(serializers.ModelSerializer):
             email=validated_data['email'],
             fullname=validated_data['fullname']
         )
-        user.set_password(validated_data['password'])
+        run_hashing(user.set_password, validated_data['password'])
         user.save()
         return user
     
@@ -1,15 +1,19 @@
 from django.urls import path, include
-from .views import RegistrationView, CustomLoginView
+from .views import RegistrationView, CustomLoginView, LogoutView, TokenRotateView
 
 # URL configuration for authentication endpoints.
 #
 # This module defines the routes for:
 # - User registration via `RegistrationView`
 # - User login via `CustomLoginView`
+# - Logout (deletes the auth token) via `LogoutView`
+# - Token rotation (replaces the auth token) via `TokenRotateView`
 # - Browsable API login/logout using Django REST framework's built-in views
 
 urlpatterns = [
     path('registration/', RegistrationView.as_view(), name='registration'),
     path('login/', CustomLoginView.as_view(), name='login'),
+    path('logout/', LogoutView.as_view(), name='logout'),
+    path('token/rotate/', TokenRotateView.as_view(), name='token-rotate'),
     path('api-auth/', include('rest_framework.urls', namespace='rest_framework')),
 ]
@@ -1,6 +1,7 @@
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.authtoken.models import Token
+
+from auth_app.authentication import issue_token
 
 
 def validate_login_data(data):
@@ -37,8 +38,8 @@ def get_user_token_response(user):
     """
     Generate a token response for an authenticated user.
 
-    Retrieves or creates a token for the given user and returns
-    a DRF Response containing the token and basic user info.
+    Returns the user's valid token (a new one if it is missing or has
+    expired, see `issue_token`) together with basic user info.
 
     Args:
         user (CustomUser): The authenticated user instance.
@@ -49,7 +50,7 @@ def get_user_token_response(user):
     """
 
     try:
-        token, created = Token.objects.get_or_create(user=user)
+        token = issue_token(user)
         return Response({
             'token': token.key,
             'fullname': user.fullname,
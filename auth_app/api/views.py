@@ -3,6 +3,10 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import authenticate, get_user_model
+from auth_app.authentication import issue_token, rotate_token
+from auth_app.hashing import HashingBusy
+from boards_app.api.permissions import IsAuthenticatedWithCustomMessage
+from core.throttling import EmailThrottle, IPThrottle
 from .utils import validate_login_data, get_user_token_response
 
 from .serializers import RegistrationSerializer
@@ -25,9 +29,13 @@ class RegistrationView(APIView):
     Returns:
         HTTP 201: If user is created successfully
         HTTP 400: If validation fails
+        HTTP 429: If too many registrations came from the IP or for the email
+        HTTP 503: If too many passwords are being hashed (see auth_app.hashing)
         HTTP 500: On unexpected server error
     """
     permission_classes = [permissions.AllowAny] 
+    throttle_classes = [IPThrottle, EmailThrottle]
+    throttle_scope = 'registration'
 
     def post(self, request, *args, **kwargs):
         """
@@ -49,7 +57,7 @@ class RegistrationView(APIView):
                 return Response(serializer.errors,
                      status=status.HTTP_400_BAD_REQUEST)
             user = serializer.save()
-            token, created = Token.objects.get_or_create(user=user)
+            token = issue_token(user)
             data = {
                 'token': token.key,
                 'fullname': user.fullname,
@@ -58,6 +66,8 @@ class RegistrationView(APIView):
             }
             return Response(
                 data, status=status.HTTP_201_CREATED)
+        except HashingBusy as e:
+            raise e
         except Exception as e:
             return Response(
                 {'detail': 'Interner Serverfehler.'},
@@ -76,11 +86,19 @@ class CustomLoginView(APIView):
         - Django's `authenticate` to check credentials
         - `get_user_token_response` to build the response
 
+    Attempts are throttled per IP and per email before any hashing or
+    database work (core.throttling). The password check runs in the
+    bounded hashing pool (auth_app.backends.HashingPoolBackend).
+
     Returns:
         HTTP 200: If login is successful
         HTTP 400: If credentials are invalid or data is missing
+        HTTP 429: If too many attempts came from the IP or for the email
+        HTTP 503: If too many passwords are being hashed
     """
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [IPThrottle, EmailThrottle]
+    throttle_scope = 'login'
 
     def post(self, request, *args, **kwargs):
         """
@@ -106,4 +124,54 @@ class CustomLoginView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        return get_user_token_response(user)
\ No newline at end of file
+        return get_user_token_response(user)
+
+
+class LogoutView(APIView):
+    """
+    View for logging out.
+
+    Deletes the user's auth token, so it can no longer be used by any
+    client. A new token is issued on the next login.
+
+    Returns:
+        HTTP 204: If the token was deleted
+        HTTP 401: If the request is not authenticated
+    """
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Handle POST requests to log out.
+        """
+
+        Token.objects.filter(user=request.user).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TokenRotateView(APIView):
+    """
+    View for rotating the auth token.
+
+    Replaces the user's token with a new one; the old token stops working
+    immediately. The response has the same shape as the login response.
+
+    Returns:
+        HTTP 200: With the new token
+        HTTP 401: If the request is not authenticated
+    """
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+
+    def post(self, request, *args, **kwargs):
+        """
+        Handle POST requests to rotate the token.
+        """
+
+        user = request.user
+        token = rotate_token(user)
+        return Response({
+            'token': token.key,
+            'fullname': user.fullname,
+            'email': user.email,
+            'user_id': user.id,
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,156 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from auth_app.models import ExpiringToken
+
+
+logger = logging.getLogger(__name__)
+
+
+# User columns loaded with the token on every authenticated request.
+# Other columns (password hash, last_login, ...) are deferred and only
+# loaded if something reads them.
+AUTH_USER_FIELDS = ('id', 'email', 'fullname', 'is_active')
+
+
+def token_queryset():
+    """
+    Return the Token queryset used for authentication: the token with its
+    user, restricted to AUTH_USER_FIELDS.
+    """
+
+    user_fields = [f'user__{field}' for field in AUTH_USER_FIELDS]
+    return ExpiringToken.objects.select_related('user').only('key', 'created', 'user', *user_fields)
+
+
+def token_ttl():
+    """
+    Return how long a token stays valid after its last renewal (setting AUTH_TOKEN_TTL).
+    """
+
+    return timedelta(seconds=getattr(settings, 'AUTH_TOKEN_TTL', 7 * 24 * 3600))
+
+
+def token_renew_interval():
+    """
+    Return how often a used token is renewed at most (setting AUTH_TOKEN_RENEW_INTERVAL).
+    """
+
+    return timedelta(seconds=getattr(settings, 'AUTH_TOKEN_RENEW_INTERVAL', 3600))
+
+
+def token_expired(token, now=None):
+    """
+    Return True if the token was last renewed longer than the TTL ago.
+
+    Only uses `token.created`, the time of the last renewal (see
+    ExpiringToken), which is loaded with the token anyway.
+    """
+
+    now = now or timezone.now()
+    return token.created <= now - token_ttl()
+
+
+def renewal_due(token, now=None):
+    """
+    Return True if the token's last renewal is older than the renew interval.
+    """
+
+    now = now or timezone.now()
+    return token.created <= now - token_renew_interval()
+
+
+def _renewal(token):
+    # Conditional on the loaded value, so concurrent requests renew once.
+    return ExpiringToken.objects.filter(key=token.key, created=token.created)
+
+
+def renew_token(token, now=None):
+    """
+    Slide the token's expiry forward if its renewal is due.
+
+    At most one UPDATE per token and renew interval. Renewal is best
+    effort: if the database is busy the request goes on with the old
+    expiry and a later request renews the token.
+    """
+
+    now = now or timezone.now()
+    if not renewal_due(token, now):
+        return
+    try:
+        _renewal(token).update(created=now)
+        token.created = now
+    except DatabaseError as e:
+        logger.info('Token renewal skipped: %s', e)
+
+
+def rotate_token(user):
+    """
+    Replace the user's token with a new one.
+
+    Returns:
+        ExpiringToken: The new token.
+    """
+
+    with transaction.atomic():
+        ExpiringToken.objects.filter(user=user).delete()
+        return ExpiringToken.objects.create(user=user)
+
+
+def issue_token(user):
+    """
+    Return a valid token for a user who just logged in or registered.
+
+    An existing valid token is kept (and renewed if due), so other
+    sessions of the user stay logged in; an expired one is replaced.
+
+    Returns:
+        ExpiringToken: The user's token.
+    """
+
+    token = ExpiringToken.objects.filter(user=user).first()
+    if token is None or token_expired(token):
+        return rotate_token(user)
+    renew_token(token)
+    return token
+
+
+class ExpiringTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication whose tokens expire AUTH_TOKEN_TTL seconds after
+    their last renewal.
+
+    The expiry is checked against `created`, which holds the time of the
+    last renewal (see ExpiringToken) and is part of the token row loaded
+    anyway, so valid requests need no extra query. Using
+    a token renews it (sliding expiry), but at most once per
+    AUTH_TOKEN_RENEW_INTERVAL, so most requests do not write.
+
+    Only the user columns in AUTH_USER_FIELDS are loaded (see
+    `token_queryset`). The boards the user may access are loaded lazily
+    by `CustomUser.accessible_board_ids`, once per request.
+    """
+
+    model = ExpiringToken
+
+    def authenticate_credentials(self, key):
+        try:
+            token = token_queryset().get(key=key)
+        except ExpiringToken.DoesNotExist:
+            raise AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+
+        now = timezone.now()
+        if token_expired(token, now):
+            raise AuthenticationFailed('Token has expired.')
+        renew_token(token, now)
+        return token.user, token
@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password, verify_password
+
+from auth_app.hashing import run_hashing
+
+
+UserModel = get_user_model()
+
+
+class HashingPoolBackend(ModelBackend):
+    """
+    ModelBackend whose password hashing runs in the bounded hashing pool
+    (auth_app.hashing).
+
+    Only the hash computations are handed to the pool; the user lookup and
+    the rare hash upgrade stay on the calling thread and its database
+    connection, so a pool thread never holds a connection or waits for
+    the database.
+
+    Raises:
+        HashingBusy: If the pool is saturated.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway, so an unknown email takes as long as a known one.
+            run_hashing(make_password, password)
+            return None
+
+        is_correct, must_update = run_hashing(verify_password, password, user.password)
+        if not is_correct:
+            return None
+        if must_update:
+            # Re-hash with the current hasher/iterations (as check_password does).
+            user.password = run_hashing(make_password, password)
+            user.save(update_fields=['password'])
+        return user if self.user_can_authenticate(user) else None
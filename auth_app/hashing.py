@@ -0,0 +1,128 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingBusy(APIException):
+    """
+    Raised when too many password hashes are already running or queued.
+
+    Answered with 503 and a `Retry-After` header (DRF's exception handler
+    sends `wait` as Retry-After).
+    """
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many logins at the moment. Please try again shortly."
+    default_code = 'hashing_busy'
+
+    def __init__(self, wait=None):
+        super().__init__()
+        self.wait = wait
+
+
+class HashingPool:
+    """
+    Bounded thread pool for password hashing.
+
+    PBKDF2 with hundreds of thousands of iterations takes a large share of
+    a CPU core per login. Running every hash on its request thread lets a
+    login storm occupy all cores and all server threads, so ordinary reads
+    queue behind it. Here at most `workers` hashes run at the same time,
+    at most `max_queue` more wait for a worker, and any further login or
+    registration is rejected right away with HashingBusy (503) instead of
+    piling up.
+
+    Only pure hash computations belong in the pool (`make_password`,
+    `verify_password`, `set_password`); database work stays on the request
+    thread, so the pool threads never open database connections.
+
+    Args:
+        workers (int): Hashes running concurrently; 0 runs them inline.
+        max_queue (int): Hashes allowed to wait for a worker.
+        retry_after (int): Seconds sent as Retry-After when rejecting.
+    """
+
+    def __init__(self, workers=2, max_queue=8, retry_after=1):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+            if workers else None
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self):
+        """
+        Number of hashes running or waiting for a worker.
+        """
+
+        return self._pending
+
+    def run(self, fn, *args, **kwargs):
+        """
+        Run `fn` in the pool and wait for its result.
+
+        Returns:
+            The return value of `fn`.
+
+        Raises:
+            HashingBusy: If all workers are busy and the queue is full.
+        """
+
+        if self._executor is None:
+            return fn(*args, **kwargs)
+
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                raise HashingBusy(wait=self.retry_after)
+            self._pending += 1
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future.result()
+
+    def _release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """
+    Return the process-wide hashing pool, configured by the
+    PASSWORD_HASHING_* settings.
+    """
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HashingPool(
+                workers=getattr(settings, 'PASSWORD_HASHING_WORKERS', 2),
+                max_queue=getattr(settings, 'PASSWORD_HASHING_QUEUE', 8),
+                retry_after=getattr(settings, 'PASSWORD_HASHING_RETRY_AFTER', 1),
+            )
+        return _pool
+
+
+def run_hashing(fn, *args, **kwargs):
+    """
+    Run a password hashing call (e.g. `verify_password` or `set_password`)
+    through the hashing pool. `fn` must not touch the database.
+
+    Raises:
+        HashingBusy: If the pool is saturated.
+    """
+
+    return get_hashing_pool().run(fn, *args, **kwargs)
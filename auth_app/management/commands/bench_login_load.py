@@ -0,0 +1,91 @@
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from auth_app.hashing import HashingBusy, HashingPool
+
+
+PASSWORD = 'bench-password'
+
+
+class Command(BaseCommand):
+    """
+    Benchmark read latency during a login storm.
+
+    Reader threads repeatedly render a task list (the CPU part of a read
+    request) while login threads check passwords with the configured
+    hasher, as CustomLoginView does. Three runs are compared: readers
+    alone, logins hashing on their own threads, and logins going through
+    the bounded hashing pool (auth_app.hashing). Rejected logins (503)
+    wait for Retry-After before trying again, like a well-behaved client.
+    """
+
+    help = 'Measure read latency under login load with and without the hashing pool.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=16, help='Concurrent login threads.')
+        parser.add_argument('--readers', type=int, default=2, help='Concurrent reader threads.')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per run.')
+        parser.add_argument('--workers', type=int, default=settings.PASSWORD_HASHING_WORKERS, help='Pool workers.')
+        parser.add_argument('--queue', type=int, default=settings.PASSWORD_HASHING_QUEUE, help='Pool queue length.')
+
+    def handle(self, *args, **options):
+        encoded = make_password(PASSWORD)
+        rows = [
+            {
+                'id': i, 'board': 1, 'title': f'Task {i}', 'description': 'Benchmark task',
+                'status': 'to-do', 'priority': 'medium',
+                'assignee': {'id': 1, 'email': 'bench@kanmind.invalid', 'fullname': 'Bench User'},
+                'reviewer': None, 'due_date': '2025-01-01', 'comments_count': 0,
+            }
+            for i in range(200)
+        ]
+
+        self._run('reads only', None, 0, encoded, rows, options)
+        self._run('inline hashing', HashingPool(workers=0), options['logins'], encoded, rows, options)
+        pool = HashingPool(workers=options['workers'], max_queue=options['queue'])
+        self._run(f'pool ({options["workers"]}+{options["queue"]})', pool, options['logins'], encoded, rows, options)
+
+    def _run(self, label, pool, login_threads, encoded, rows, options):
+        stop = threading.Event()
+        latencies = []
+        logins = []
+        rejected = []
+        renderer = JSONRenderer()
+
+        def reader():
+            while not stop.is_set():
+                started = time.perf_counter()
+                renderer.render(rows)
+                latencies.append(time.perf_counter() - started)
+
+        def login():
+            while not stop.is_set():
+                try:
+                    pool.run(check_password, PASSWORD, encoded)
+                    logins.append(1)
+                except HashingBusy as e:
+                    rejected.append(1)
+                    stop.wait(e.wait)
+
+        threads = [threading.Thread(target=reader) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=login) for _ in range(login_threads)]
+        for thread in threads:
+            thread.start()
+        time.sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        quantiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f'{label:<18} read p50 {quantiles[49] * 1000:7.2f} ms   p95 {quantiles[94] * 1000:7.2f} ms   '
+            f'p99 {quantiles[98] * 1000:7.2f} ms   '
+            f'{len(latencies) / options["duration"]:7.0f} reads/s   '
+            f'{len(logins) / options["duration"]:5.1f} logins/s   {len(rejected):5d} rejected'
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from auth_app.authentication import token_ttl
+from auth_app.models import ExpiringToken
+from core.db import run_with_retry
+
+
+class Command(BaseCommand):
+    """
+    Delete expired auth tokens (see auth_app.authentication).
+
+    Tokens are deleted in chunks, each in its own short transaction, so
+    the database is never locked for long and an interrupted run simply
+    continues where it stopped on the next invocation.
+    """
+
+    help = 'Delete auth tokens that have expired.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Tokens deleted per transaction.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - token_ttl()
+        expired = ExpiringToken.objects.filter(created__lte=cutoff)
+        deleted = 0
+        while True:
+            keys = list(expired.values_list('key', flat=True)[:options['chunk_size']])
+            if not keys:
+                break
+            count, _ = run_with_retry(ExpiringToken.objects.filter(key__in=keys, created__lte=cutoff).delete)
+            deleted += count
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired tokens.'))
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.3 on 2026-10-19 10:09
+
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# A frozen copy of auth_app.search.user_search_tokens as of this migration,
+# so later changes to that module do not change what this migration does.
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def user_search_tokens(email, fullname):
+    tokens = set()
+    email = (email or '').strip().lower()
+    if email:
+        tokens.add(email)
+        tokens.update(WORD_RE.findall(email.split('@')[0]))
+    tokens.update(WORD_RE.findall((fullname or '').strip().lower()))
+    return {token[:254] for token in tokens}
+
+
+def backfill_search_tokens(apps, schema_editor):
+    """
+    Create the search tokens of existing users in chunks.
+    """
+    CustomUser = apps.get_model('auth_app', 'CustomUser')
+    UserSearchToken = apps.get_model('auth_app', 'UserSearchToken')
+
+    last_id = 0
+    while True:
+        users = list(
+            CustomUser.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', 'email', 'fullname')[:1000]
+        )
+        if not users:
+            break
+        UserSearchToken.objects.bulk_create([
+            UserSearchToken(token=token, user_id=user_id)
+            for user_id, email, fullname in users
+            for token in user_search_tokens(email, fullname)
+        ])
+        last_id = users[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0003_alter_customuser_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=254)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User search token',
+                'verbose_name_plural': 'User search tokens',
+                'constraints': [models.UniqueConstraint(fields=('token', 'user'), name='unique_user_search_token')],
+            },
+        ),
+        migrations.RunPython(backfill_search_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_email_keys(apps, schema_editor):
+    """
+    Fill the normalized email key of existing users in chunks.
+
+    Fails if two users only differ in the case of their email, since they
+    cannot share a unique key; those accounts must be merged first.
+    """
+    CustomUser = apps.get_model('auth_app', 'CustomUser')
+
+    last_id = 0
+    while True:
+        users = list(CustomUser.objects.filter(id__gt=last_id).order_by('id').only('id', 'email')[:1000])
+        if not users:
+            break
+        for user in users:
+            user.email_key = (user.email or '').strip().lower()
+        CustomUser.objects.bulk_update(users, ['email_key'])
+        last_id = users[-1].id
+
+    duplicates = list(
+        CustomUser.objects.values('email_key').annotate(count=Count('id'))
+        .filter(count__gt=1).values_list('email_key', flat=True)
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Users with case-insensitively equal emails must be merged before migrating: '
+            + ', '.join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0004_user_search_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='email_key',
+            field=models.CharField(editable=False, max_length=254, null=True),
+        ),
+        migrations.RunPython(backfill_email_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='customuser',
+            name='email_key',
+            field=models.CharField(editable=False, max_length=254, unique=True),
+        ),
+    ]
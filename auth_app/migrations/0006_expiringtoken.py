@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-19 11:43
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0005_customuser_email_key'),
+        ('authtoken', '0004_alter_tokenproxy_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpiringToken',
+            fields=[
+            ],
+            options={
+                'verbose_name': 'Expiring token',
+                'verbose_name_plural': 'Expiring tokens',
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('authtoken.token',),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils.functional import cached_property
 from django.contrib.auth.models import BaseUserManager
+from rest_framework.authtoken.models import Token
 
 class CustomUserManager(BaseUserManager):
     """
@@ -8,8 +10,39 @@ class CustomUserManager(BaseUserManager):
 
     Overrides the default user manager to use email instead of username
     as the unique identifier for authentication.
+
+    Email lookups are case-insensitive: they go through the normalized
+    `email_key` column, which has a unique index.
     """
 
+    @staticmethod
+    def normalize_email_key(email):
+        """
+        Return the lookup key for an email address (trimmed and lowercased).
+
+        Args:
+            email (str): The email address as entered.
+
+        Returns:
+            str: The normalized email key.
+        """
+
+        return (email or '').strip().lower()
+
+    def filter_by_email(self, email):
+        """
+        Return the users with the given email address, ignoring case.
+        """
+
+        return self.filter(email_key=self.normalize_email_key(email))
+
+    def get_by_natural_key(self, username):
+        """
+        Look up a user by email (used by `authenticate`), ignoring case.
+        """
+
+        return self.get(email_key=self.normalize_email_key(username))
+
     def create_user(self, email, password=None, **extra_fields):
         """
         Create and return a regular user with the given email and password.
@@ -29,7 +62,7 @@ class CustomUserManager(BaseUserManager):
         if not email:
             raise ValueError('The e-mail address must be entered.')
         email = self.normalize_email(email)
-        user = self.model(email=email, **extra_fields)
+        user = self.model(email=email, email_key=self.normalize_email_key(email), **extra_fields)
         user.set_password(password)
         user.save(using=self._db)
         return user
@@ -69,12 +102,14 @@ class CustomUser(AbstractUser):
 
     Fields:
         - email (unique): Used as the primary identifier.
+        - email_key (unique): Lowercased email, used for all email lookups.
         - fullname: The user's full name.
     Removes the default 'username' field provided by AbstractUser.
     """
 
     username = None
     email = models.EmailField('email address', unique=True)
+    email_key = models.CharField(max_length=254, unique=True, editable=False)
     fullname = models.CharField(max_length=150)
 
     USERNAME_FIELD = 'email'
@@ -91,8 +126,99 @@ class CustomUser(AbstractUser):
         """
         
         return self.email
+
+    def save(self, *args, **kwargs):
+        """
+        Keep the normalized email key in sync with the email address.
+        """
+
+        self.email_key = CustomUserManager.normalize_email_key(self.email)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'email' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'email_key'}
+        super().save(*args, **kwargs)
+
+    def _accessible_board_ids_queryset(self):
+        owned = self.boards.order_by().values_list('id', flat=True)
+        joined = self.board_members.order_by().values_list('id', flat=True)
+        return owned.union(joined)
+
+    @cached_property
+    def accessible_board_ids(self):
+        """
+        IDs of the boards the user owns or is a member of.
+
+        Loaded with one query on first access and cached on this instance,
+        which lives for one request, so further permission checks in the
+        same request need no query. Membership changes made later in the
+        same request are not reflected.
+
+        Returns:
+            frozenset: The board IDs.
+        """
+
+        return frozenset(self._accessible_board_ids_queryset())
+
+    async def aaccessible_board_ids(self):
+        """
+        Async variant of `accessible_board_ids`, sharing its cache.
+        """
+
+        if 'accessible_board_ids' not in self.__dict__:
+            self.__dict__['accessible_board_ids'] = frozenset(
+                [board_id async for board_id in self._accessible_board_ids_queryset()]
+            )
+        return self.accessible_board_ids
+
+    def can_access_board(self, board_id):
+        """
+        Return True if the user owns or is a member of the board.
+        """
+
+        return board_id in self.accessible_board_ids
     
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
-        ordering = ["email"]  
\ No newline at end of file
+        ordering = ["email"]
+
+
+class UserSearchToken(models.Model):
+    """
+    Lowercase search token of a user, used for the member autocomplete.
+
+    Each user has one token per word of the full name, one per part of the
+    email's local part and one for the whole email address. Prefix lookups
+    are range scans on the (token, user) index.
+    Maintained by the signal handlers in auth_app.signals.
+    """
+
+    token = models.CharField(max_length=254)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='search_tokens')
+
+    def __str__(self):
+        return self.token
+
+    class Meta:
+        verbose_name = "User search token"
+        verbose_name_plural = "User search tokens"
+        constraints = [
+            models.UniqueConstraint(fields=['token', 'user'], name='unique_user_search_token'),
+        ]
+
+
+class ExpiringToken(Token):
+    """
+    DRF's auth token with a sliding expiry (auth_app.authentication).
+
+    `created` does not keep the creation time: every renewal moves it
+    forward, so it holds the time of the last renewal, and the token
+    expires AUTH_TOKEN_TTL seconds after it. Reusing the column keeps
+    DRF's token table and lets the expiry check use the row that is
+    loaded for authentication anyway.
+    """
+
+    class Meta:
+        proxy = True
+        verbose_name = "Expiring token"
+        verbose_name_plural = "Expiring tokens"
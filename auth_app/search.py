@@ -0,0 +1,42 @@
+import re
+
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_search_text(text):
+    """
+    Normalize user input or user data for token lookups.
+    """
+    return text.strip().lower()
+
+
+def user_search_tokens(email, fullname):
+    """
+    Return the search tokens for a user.
+
+    Args:
+        email (str): The user's email address.
+        fullname (str): The user's full name.
+
+    Returns:
+        set: Lowercase tokens (whole email, parts of the local part,
+        words of the full name).
+    """
+    tokens = set()
+    email = normalize_search_text(email or '')
+    if email:
+        tokens.add(email)
+        tokens.update(WORD_RE.findall(email.split('@')[0]))
+    tokens.update(WORD_RE.findall(normalize_search_text(fullname or '')))
+    return {token[:254] for token in tokens}
+
+
+def prefix_range(prefix):
+    """
+    Return the (lower, upper) bounds matching all strings starting with prefix.
+
+    Used as `token__gte=lower, token__lt=upper`, which unlike LIKE can always
+    use the index.
+    """
+    return prefix, prefix + '\U0010ffff'
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from auth_app.models import CustomUser, UserSearchToken
+from auth_app.search import user_search_tokens
+
+
+def sync_search_tokens(user):
+    """
+    Replace the search tokens of a user with tokens from the current data.
+    """
+    UserSearchToken.objects.filter(user=user).delete()
+    UserSearchToken.objects.bulk_create([
+        UserSearchToken(token=token, user=user)
+        for token in user_search_tokens(user.email, user.fullname)
+    ])
+
+
+@receiver(post_save, sender=CustomUser)
+def update_search_tokens(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """
+    Keep the autocomplete tokens in sync when email or full name change.
+
+    Saves that only touch other columns (e.g. last_login on login) are skipped.
+    """
+    if raw:
+        return
+    if update_fields is not None and not {'email', 'fullname'} & set(update_fields):
+        return
+    sync_search_tokens(instance)
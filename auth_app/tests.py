@@ -1,3 +1,320 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from django.core.management import call_command
+from django.db import connection
+from django.db.backends.utils import CursorWrapper
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from auth_app import backends
+from auth_app.models import CustomUser, ExpiringToken
+from core.throttling import LocalThrottleBackend
+
+
+MD5 = 'django.contrib.auth.hashers.MD5PasswordHasher'
+PBKDF2 = 'django.contrib.auth.hashers.PBKDF2PasswordHasher'
+
+
+@override_settings(PASSWORD_HASHERS=[MD5])
+class LoginTests(TestCase):
+    """
+    POST /api/login/ with the hashing pool backend.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email='User@example.com', password='secret-pw', fullname='User')
+
+    def login(self, email, password):
+        return APIClient().post('/api/login/', {'email': email, 'password': password}, format='json')
+
+    def hashing_calls(self, email, password):
+        # Record which functions are handed to the pool.
+        calls = []
+
+        def run_hashing(fn, *args, **kwargs):
+            calls.append(fn)
+            return fn(*args, **kwargs)
+
+        with mock.patch.object(backends, 'run_hashing', run_hashing):
+            response = self.login(email, password)
+        return response, calls
+
+    def test_valid_credentials(self):
+        response, calls = self.hashing_calls('user@EXAMPLE.com', 'secret-pw')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['user_id'], self.user.pk)
+        self.assertEqual(calls, [verify_password])
+
+    def test_wrong_password_and_unknown_email(self):
+        response, calls = self.hashing_calls('user@example.com', 'wrong')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(calls, [verify_password])
+        response, calls = self.hashing_calls('nobody@example.com', 'secret-pw')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(calls, [make_password])
+
+    def test_pool_threads_do_not_query_the_database(self):
+        request_thread = threading.current_thread()
+        queries = []
+
+        execute = CursorWrapper._execute_with_wrappers
+
+        def record(cursor, *args, **kwargs):
+            # Patched on the class, so queries of every thread are seen.
+            queries.append(threading.current_thread())
+            return execute(cursor, *args, **kwargs)
+
+        with mock.patch.object(CursorWrapper, '_execute_with_wrappers', record):
+            response = self.login('user@example.com', 'secret-pw')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(queries)
+        self.assertTrue(all(thread is request_thread for thread in queries))
+
+    def test_outdated_hash_is_upgraded(self):
+        with override_settings(PASSWORD_HASHERS=[PBKDF2, MD5]):
+            response, calls = self.hashing_calls('user@example.com', 'secret-pw')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(calls, [verify_password, make_password])
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+
+
+@override_settings(
+    PASSWORD_HASHERS=[MD5],
+    REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'login-ip': '3/min', 'login-email': '2/min'},
+    },
+)
+class LoginThrottleTests(TestCase):
+    """
+    POST /api/login/ is throttled per IP and per email (core.throttling).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email='user@example.com', password='secret-pw', fullname='User')
+
+    def setUp(self):
+        # Counters of earlier tests must not count here.
+        patcher = mock.patch('core.throttling._backend', LocalThrottleBackend())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def login(self, email, ip='10.0.0.1'):
+        return APIClient().post(
+            '/api/login/', {'email': email, 'password': 'wrong'}, format='json', REMOTE_ADDR=ip,
+        )
+
+    def assertThrottled(self, email, ip='10.0.0.1'):
+        with self.assertLogs('core.throttling', 'WARNING'):
+            response = self.login(email, ip)
+        self.assertEqual(response.status_code, 429)
+        return response
+
+    def test_email_limit_ignores_case_and_other_ips(self):
+        self.assertEqual(self.login('user@example.com', '10.0.0.1').status_code, 400)
+        self.assertEqual(self.login(' USER@example.com', '10.0.0.2').status_code, 400)
+        response = self.assertThrottled('User@Example.com', '10.0.0.3')
+        self.assertTrue(1 <= int(response['Retry-After']) <= 60)
+        # Other accounts are not affected.
+        self.assertEqual(self.login('other@example.com', '10.0.0.3').status_code, 400)
+
+    def test_ip_limit_counts_every_email(self):
+        for email in ('a@example.com', 'b@example.com', 'c@example.com'):
+            self.assertEqual(self.login(email).status_code, 400)
+        response = self.assertThrottled('d@example.com')
+        self.assertTrue(1 <= int(response['Retry-After']) <= 60)
+        self.assertEqual(self.login('d@example.com', '10.0.0.2').status_code, 400)
+
+    def test_throttled_request_does_no_hashing(self):
+        self.login('user@example.com')
+        self.login('user@example.com')
+        with mock.patch.object(backends, 'run_hashing') as run_hashing:
+            self.assertThrottled('user@example.com')
+        run_hashing.assert_not_called()
+
+    def test_retry_after_follows_the_sliding_window(self):
+        with mock.patch('core.throttling.time.time', return_value=1000):
+            self.login('user@example.com')
+        with mock.patch('core.throttling.time.time', return_value=1020):
+            self.login('user@example.com')
+        with mock.patch('core.throttling.time.time', return_value=1030.5):
+            response = self.assertThrottled('user@example.com')
+        # The first attempt leaves the window at 1060.
+        self.assertEqual(response['Retry-After'], '30')
+        with mock.patch('core.throttling.time.time', return_value=1060):
+            self.assertEqual(self.login('user@example.com').status_code, 400)
+
+
+@override_settings(AUTH_TOKEN_TTL=24 * 3600, AUTH_TOKEN_RENEW_INTERVAL=3600, PASSWORD_HASHERS=[MD5])
+class ExpiringTokenTests(TestCase):
+    """
+    Sliding token expiry (auth_app.authentication), logout, rotation and
+    the purge_expired_tokens command.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email='user@example.com', password='secret-pw', fullname='User')
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.token = self.token_at(self.user, self.now)
+
+    def token_at(self, user, renewed_at):
+        token = ExpiringToken.objects.create(user=user)
+        ExpiringToken.objects.filter(pk=token.pk).update(created=renewed_at)
+        return token
+
+    def renewed_at(self, token):
+        return ExpiringToken.objects.get(pk=token.pk).created
+
+    def request(self, key, hours=0, method='get', url='/api/boards/'):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        with mock.patch('auth_app.authentication.timezone.now', return_value=self.now + timedelta(hours=hours)):
+            return getattr(client, method)(url)
+
+    def test_expired_token_is_rejected(self):
+        self.assertEqual(self.request(self.token.key, hours=23.9).status_code, 200)
+        ExpiringToken.objects.filter(pk=self.token.pk).update(created=self.now)
+        response = self.request(self.token.key, hours=24)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['detail'], 'Token has expired.')
+
+    def test_token_is_renewed_at_most_once_per_interval(self):
+        def token_updates(hours):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.request(self.token.key, hours=hours).status_code, 200)
+            return [q['sql'] for q in queries if q['sql'].startswith(f'UPDATE "{ExpiringToken._meta.db_table}"')]
+
+        self.assertEqual(token_updates(0.5), [])
+        self.assertEqual(self.renewed_at(self.token), self.now)
+        self.assertEqual(len(token_updates(1)), 1)
+        self.assertEqual(self.renewed_at(self.token), self.now + timedelta(hours=1))
+        self.assertEqual(token_updates(1.5), [])
+        # Renewed, the token outlives its first expiry.
+        self.assertEqual(self.request(self.token.key, hours=24.5).status_code, 200)
+        self.assertEqual(self.request(self.token.key, hours=48.6).status_code, 401)
+
+    def test_logout_deletes_the_token(self):
+        self.assertEqual(self.request(self.token.key, method='post', url='/api/logout/').status_code, 204)
+        self.assertFalse(ExpiringToken.objects.filter(user=self.user).exists())
+        self.assertEqual(self.request(self.token.key).status_code, 401)
+
+    def test_rotate_replaces_the_token(self):
+        response = self.request(self.token.key, method='post', url='/api/token/rotate/')
+        self.assertEqual(response.status_code, 200)
+        new_key = response.data['token']
+        self.assertNotEqual(new_key, self.token.key)
+        self.assertEqual(self.request(self.token.key).status_code, 401)
+        self.assertEqual(self.request(new_key).status_code, 200)
+
+    def test_login_keeps_a_valid_token_and_replaces_an_expired_one(self):
+        def login():
+            response = APIClient().post('/api/login/', {'email': 'user@example.com', 'password': 'secret-pw'}, format='json')
+            self.assertEqual(response.status_code, 200)
+            return response.data['token']
+
+        self.assertEqual(login(), self.token.key)
+        ExpiringToken.objects.filter(pk=self.token.pk).update(created=self.now - timedelta(hours=25))
+        new_key = login()
+        self.assertNotEqual(new_key, self.token.key)
+        self.assertEqual(list(ExpiringToken.objects.filter(user=self.user).values_list('key', flat=True)), [new_key])
+
+    def test_purge_deletes_only_expired_tokens(self):
+        ExpiringToken.objects.filter(pk=self.token.pk).update(created=self.now - timedelta(hours=25))
+        others = [
+            CustomUser.objects.create_user(email=f'user{i}@example.com', password=None, fullname=f'User {i}')
+            for i in range(3)
+        ]
+        self.token_at(others[0], self.now - timedelta(hours=24, seconds=1))
+        self.token_at(others[1], self.now - timedelta(days=30))
+        fresh = self.token_at(others[2], self.now - timedelta(hours=23))
+        out = StringIO()
+        call_command('purge_expired_tokens', chunk_size=2, stdout=out)
+        self.assertIn('Deleted 3 expired tokens.', out.getvalue())
+        self.assertEqual(list(ExpiringToken.objects.values_list('key', flat=True)), [fresh.key])
+
+
+@override_settings(PASSWORD_HASHERS=[MD5])
+class EmailCaseTests(TestCase):
+    """
+    Emails are unique and matched regardless of case (CustomUser.email_key).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email='Mixed.Case@Example.com', password='secret-pw', fullname='User')
+
+    def test_login_ignores_case(self):
+        for email in ('mixed.case@example.com', 'MIXED.CASE@EXAMPLE.COM', ' Mixed.Case@Example.com '):
+            with self.subTest(email):
+                response = APIClient().post('/api/login/', {'email': email, 'password': 'secret-pw'}, format='json')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['user_id'], self.user.pk)
+
+    def test_registration_rejects_case_only_duplicate(self):
+        response = APIClient().post('/api/registration/', {
+            'fullname': 'Other', 'email': 'MIXED.case@example.COM',
+            'password': 'secret-pw', 'repeated_password': 'secret-pw',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(CustomUser.objects.count(), 1)
+
+    def test_email_check_ignores_case(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        # validate_email would look up the domain's DNS records.
+        with mock.patch('boards_app.api.views.validate_email'), mock.patch('boards_app.api.async_views.validate_email'):
+            response = client.get('/api/email-check/', {'email': 'mixed.CASE@example.com'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], self.user.pk)
+
+
+class EmailKeyMigrationTests(TransactionTestCase):
+    """
+    Migration auth_app 0005 backfills email_key and refuses case duplicates.
+    """
+
+    before = [('auth_app', '0004_user_search_token')]
+    after = [('auth_app', '0005_customuser_email_key')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        # Back to the latest schema for the following tests.
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def create_users(self, apps, *emails):
+        CustomUser = apps.get_model('auth_app', 'CustomUser')
+        for i, email in enumerate(emails):
+            CustomUser.objects.create(email=email, fullname=f'User {i}', password='!')
+
+    def test_backfill_normalizes_keys(self):
+        self.create_users(self.migrate(self.before), ' First@Example.com', 'second@example.com')
+        apps = self.migrate(self.after)
+        keys = apps.get_model('auth_app', 'CustomUser').objects.order_by('id').values_list('email_key', flat=True)
+        self.assertEqual(list(keys), ['first@example.com', 'second@example.com'])
+
+    def test_backfill_aborts_on_case_duplicates(self):
+        self.create_users(self.migrate(self.before), 'dup@example.com', 'DUP@example.com')
+        with self.assertRaisesMessage(RuntimeError, 'dup@example.com'):
+            self.migrate(self.after)
+        apps = self.migrate(self.before)
+        apps.get_model('auth_app', 'CustomUser').objects.filter(email='DUP@example.com').delete()
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Board
+from core.write_pipeline import run_write
+from .deletion import request_board_deletion
+from .models import Board, BoardDeletion
 # Register your models here.
 
 @admin.register(Board)
@@ -73,7 +75,7 @@ class BoardAdmin(admin.ModelAdmin):
 
     def delete_model(self, request, obj):
         if request.user.is_authenticated and (request.user.is_staff or request.user == obj.owner):
-            obj.delete()
+            run_write(request_board_deletion, obj, request.user)
         else:
             raise PermissionError("You do not have permission to delete this board.")
 
@@ -93,3 +95,16 @@ class BoardAdmin(admin.ModelAdmin):
         if obj is None and 'members' in form.base_fields:
             form.base_fields['members'].required = False
         return form
+
+
+@admin.register(BoardDeletion)
+class BoardDeletionAdmin(admin.ModelAdmin):
+    list_display = ('board_id', 'title', 'status', 'tasks_deleted', 'tasks_total', 'comments_deleted', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    search_fields = ('title',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,155 @@
+from asgiref.sync import sync_to_async
+from django.db.models import Prefetch
+from django.shortcuts import aget_object_or_404
+from email_validator import validate_email, EmailNotValidError
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+
+from auth_app.api.serializers import UserSerializer
+from auth_app.models import CustomUser
+from boards_app.models import Board
+from core.async_views import AsyncReadView, JSONResponse, as_json_response
+from core.fieldsets import requested_fields, restrict_queryset
+from tasks_app.api.projections import fast_read_path_enabled, task_projection_for
+from tasks_app.api.serializers import TasksBoardDetailsSerializer, aside_loaded_users, wants_side_loaded_users
+from tasks_app.api.views import join_task_users
+from tasks_app.models import Task
+from .permissions import IsAuthenticatedWithCustomMessage
+from .serializers import BoardSerializer, BoardDetailSerializer
+from .utils import boards_of_user
+from .views import BoardDetailView, internal_error_response_500
+
+
+class AsyncBoardView(AsyncReadView):
+    """
+    Async variant of BoardView (GET). Creating boards is handled by BoardView.
+
+    The list is sent as one body, not streamed like BoardView's.
+    """
+
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+
+    async def get(self, request):
+        try:
+            context = {'request': request, 'fields': requested_fields(request)}
+            queryset = restrict_queryset(
+                boards_of_user(request.user), BoardSerializer(context=context), context['fields']
+            )
+            boards = [board async for board in queryset]
+            return JSONResponse(BoardSerializer(boards, many=True, context=context).data)
+        except Exception as e:
+            return as_json_response(internal_error_response_500(e))
+
+
+class PrefetchedBoardDetailSerializer(BoardDetailSerializer):
+    """
+    BoardDetailSerializer for a board whose data was loaded with the async ORM.
+
+    Fast-path task rows are taken from context['task_rows']; side-loaded
+    users are filled in by the view afterwards.
+    """
+
+    def get_task_rows(self, instance):
+        return self.context['task_rows']
+
+    def get_users(self, task_rows):
+        return {}
+
+
+class AsyncBoardDetailView(AsyncReadView):
+    """
+    Async variant of BoardDetailView (GET). Updates and deletion are
+    handled by BoardDetailView.
+
+    Concurrent identical requests share one serialization of the board,
+    also with requests served by BoardDetailView.
+    """
+
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+    single_flight = BoardDetailView.single_flight
+
+    async def get(self, request, pk):
+        arrived = self.single_flight.arrival()
+        board = await self.get_board(request, pk)
+        key = ('BoardDetailView', board.pk, board.version, request.query_params.urlencode())
+        data = await self.single_flight.ado(key, lambda: self.serialize(request, board.pk), arrived)
+        return JSONResponse(data)
+
+    async def get_board(self, request, pk):
+        """
+        Load the board's owner and version and check the user's access.
+
+        Raises:
+            Http404: If the board does not exist.
+            PermissionDenied: If the user has no access to this board.
+        """
+
+        board = await aget_object_or_404(Board.objects.only('id', 'owner_id', 'version'), pk=pk)
+        user = request.user
+        if board.owner_id != user.id and board.id not in await user.aaccessible_board_ids():
+            raise PermissionDenied("You do not have access to this board.")
+        return board
+
+    async def serialize(self, request, pk):
+        """
+        Load the board with its owner, members and tasks and serialize it.
+        """
+
+        context = {
+            'request': request,
+            'side_load_users': wants_side_loaded_users(request),
+            'fields': requested_fields(request),
+            'fast_read_path': fast_read_path_enabled('board-detail'),
+        }
+        queryset = Board.objects.select_related('owner').prefetch_related('members')
+        if context['fast_read_path']:
+            projection = task_projection_for(context, include_board=False)
+            context['task_rows'] = await projection.arows(Task.objects.filter(board_id=pk))
+        else:
+            tasks = restrict_queryset(
+                join_task_users(Task.objects.all(), context),
+                TasksBoardDetailsSerializer(context=context),
+                context['fields'],
+                extra_columns=('board',),
+            )
+            queryset = queryset.prefetch_related(Prefetch('tasks', queryset=tasks))
+
+        board = await queryset.aget(pk=pk)
+        data = PrefetchedBoardDetailSerializer(board, context=context).data
+        if context['side_load_users']:
+            data['users'] = await aside_loaded_users(data['tasks'])
+        return data
+
+
+class AsyncEmailCheckView(AsyncReadView):
+    """
+    Async variant of EmailCheckView (GET).
+
+    The email validation runs in a worker thread, since the deliverability
+    check of `email_validator` does blocking DNS lookups.
+    """
+
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+
+    async def get(self, request):
+        try:
+            email = request.query_params.get("email", "").strip()
+            if not email:
+                raise ValidationError({"email": "E-mail parameter is missing."})
+
+            try:
+                await sync_to_async(validate_email, thread_sensitive=False)(email)
+            except EmailNotValidError:
+                raise ValidationError({"email": "Unvalid email address."})
+
+            try:
+                user = await CustomUser.objects.filter_by_email(email).aget()
+            except CustomUser.DoesNotExist:
+                raise NotFound("No user found with this email address.")
+
+            return JSONResponse(UserSerializer(user).data)
+
+        except (ValidationError, NotFound) as e:
+            raise e
+
+        except Exception as e:
+            return as_json_response(internal_error_response_500(e))
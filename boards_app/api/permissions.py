@@ -18,9 +18,7 @@ class IsOwnerOrMemberOfBoard(BasePermission):
     If the user is not the owner or a member, it raises a PermissionDenied error.
     """
     def has_object_permission(self, request, view, obj):
-        user = request.user
-
-        if user == obj.owner or user in obj.members.all():
+        if request.user.can_access_board(obj.id):
             return True
         
         raise PermissionDenied()
@@ -2,11 +2,15 @@ from rest_framework import serializers
 
 from auth_app.api.serializers import UserSerializer
 from auth_app.models import CustomUser
-from boards_app.models import Board
-from tasks_app.api.serializers import TasksBoardDetailsSerializer
+from boards_app.models import Board, BoardDeletion
+from core.fieldsets import SparseFieldsetMixin
+from core.updates import MinimalUpdateMixin
+from tasks_app.api.serializers import TasksBoardDetailsSerializer, side_loaded_users
+from tasks_app.api.projections import task_projection_for
+from tasks_app.models import Task
 
 
-class BoardSerializer (serializers.ModelSerializer):
+class BoardSerializer (SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for creating and updating a board.
 
@@ -16,10 +20,12 @@ class BoardSerializer (serializers.ModelSerializer):
         - owner_id: The user who owns the board (read-only).
         - member_count, ticket_count, tasks_to_do_count, tasks_hight_prio_count:
           Counters related to board content (all read-only).
+        - version: The board's version, to be sent back as `If-Match` (read-only).
 
     Notes:
         The 'members' field accepts a list of user IDs.
         The owner is automatically assigned (usually the current user).
+        Supports sparse fieldsets via context['fields'].
     """
    
     members = serializers.PrimaryKeyRelatedField(
@@ -27,14 +33,14 @@ class BoardSerializer (serializers.ModelSerializer):
         queryset=CustomUser.objects.all(),
         write_only=True
     )
-    owner_id = serializers.PrimaryKeyRelatedField(source='owner.id',read_only=True)
+    owner_id = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Board
         fields = ['id', 'title', 'members','member_count', 'ticket_count', 'tasks_to_do_count', 
-                  'tasks_hight_prio_count', 'owner_id']
+                  'tasks_hight_prio_count', 'owner_id', 'version']
         read_only_fields = ['id', 'member_count', 'ticket_count', 'tasks_to_do_count', 
-                            'tasks_hight_prio_count', 'owner_id']
+                            'tasks_hight_prio_count', 'owner_id', 'version']
 
     def validate_title(self, value):
         if not isinstance(value, str):
@@ -63,6 +69,12 @@ class BoardDetailSerializer (serializers.ModelSerializer):
         - owner_id: The owner's user ID (read-only).
         - members: A list of user details (read-only).
         - tasks: A list of tasks assigned to the board (read-only).
+        - version: The board's version, to be sent back as `If-Match` (read-only).
+        - users: The users referenced by the tasks, keyed by ID
+          (only with side-loaded users, see `side_loaded_users`).
+
+    With context['fast_read_path'] the tasks are built by a TaskProjection
+    instead of TasksBoardDetailsSerializer, with identical output.
     """
 
     members = UserSerializer(many=True)
@@ -71,8 +83,35 @@ class BoardDetailSerializer (serializers.ModelSerializer):
 
     class Meta:
         model = Board
-        fields = ['id', 'title', 'owner_id', 'members', 'tasks']
-        read_only_fields = ['id', 'title', 'owner_id', 'members', 'tasks']
+        fields = ['id', 'title', 'owner_id', 'version', 'members', 'tasks']
+        read_only_fields = ['id', 'title', 'owner_id', 'version', 'members', 'tasks']
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get('fast_read_path'):
+            fields.pop('tasks')
+        return fields
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if self.context.get('fast_read_path'):
+            data['tasks'] = self.get_task_rows(instance)
+        if self.context.get('side_load_users'):
+            data['users'] = self.get_users(data['tasks'])
+        return data
+
+    def get_task_rows(self, instance):
+        """
+        Return the board's tasks built by the TaskProjection (fast read path).
+        """
+        projection = task_projection_for(self.context, include_board=False)
+        return projection.rows(Task.objects.filter(board=instance))
+
+    def get_users(self, task_rows):
+        """
+        Return the side-loaded users referenced by the serialized tasks.
+        """
+        return side_loaded_users(task_rows)
 
     def validate_title(self, value):
         if not isinstance(value, str):
@@ -84,7 +123,7 @@ class BoardDetailSerializer (serializers.ModelSerializer):
         return value
 
 
-class BoardUpdateSerializer(serializers.ModelSerializer):
+class BoardUpdateSerializer(MinimalUpdateMixin, serializers.ModelSerializer):
     """
     Serializer for updating board data.
 
@@ -99,9 +138,11 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
     Read-only:
         - owner_data: The owner's user details.
         - members_data: A list of member user details.
+        - version: The board's new version (also sent as ETag).
 
     Notes:
         This serializer is typically used in PATCH requests.
+        Only changed columns are written (see MinimalUpdateMixin).
     """
     
     members = serializers.PrimaryKeyRelatedField(
@@ -114,8 +155,8 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
    
     class Meta:
         model = Board
-        fields = ['id', 'title', 'owner_data', 'members', 'members_data']
-        read_only_fields = ['id', 'owner_data', 'members_data']
+        fields = ['id', 'title', 'owner_data', 'members', 'members_data', 'version']
+        read_only_fields = ['id', 'owner_data', 'members_data', 'version']
         extra_kwargs = {
             'title': {'required': True, 'allow_blank': False},
             'members': {'required': True}
@@ -123,4 +164,39 @@ class BoardUpdateSerializer(serializers.ModelSerializer):
     
     def get_members_data(self, obj):
         members = obj.members.all().order_by('id')  # 👈 Sortierung nach ID
-        return UserSerializer(members, many=True).data
\ No newline at end of file
+        return UserSerializer(members, many=True).data
+
+class BoardMembersDeltaSerializer(serializers.Serializer):
+    """
+    Input of the add/remove member endpoints.
+
+    Writeable:
+        - members: IDs of the users to add or remove (only the delta,
+          not the whole membership).
+    """
+
+    members = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+    )
+
+
+class BoardDeletionSerializer(serializers.ModelSerializer):
+    """
+    Progress of a board's background purge.
+
+    Read-only:
+        - board_id, title: The deleted board and its title before deletion.
+        - status: pending, running, done or failed.
+        - tasks_total, tasks_deleted, comments_deleted: Progress counters.
+        - created_at, finished_at: Deletion request and purge completion.
+    """
+
+    class Meta:
+        model = BoardDeletion
+        fields = [
+            'board_id', 'title', 'status', 'tasks_total', 'tasks_deleted',
+            'comments_deleted', 'created_at', 'finished_at',
+        ]
+        read_only_fields = fields
@@ -1,19 +1,36 @@
 from django.urls import path
 
-from boards_app.api.views import BoardView, BoardDetailView
+from boards_app.api.views import BoardView, BoardDetailView, BoardMembersView, BoardDeletionView, BoardExportView, BoardImportView
+from boards_app.api.async_views import AsyncBoardView, AsyncBoardDetailView
+from core.async_views import hybrid_view
+from tasks_app.api.views import BoardTaskListView
 
 # URL configuration for board-related API endpoints.
 #
 # Available endpoints:
 # - GET /         → List all boards
 # - POST /        → Create a new board
+# - POST /import/ → Create a board from an NDJSON export
 # - GET /<int:pk>/ → Retrieve details of a specific board
 # - PATCH /<int:pk>/ → Update a specific board (partial update)
-# - DELETE /<int:pk>/ → Delete a specific board
+# - DELETE /<int:pk>/ → Delete a specific board (purged in the background)
+# - GET /<int:pk>/deletion/ → Progress of the board's purge
+# - GET /<int:pk>/export/ → Export the board as NDJSON (streamed)
+# - GET /<int:pk>/tasks/ → Filtered, sorted and paginated tasks of a board
+# - POST /<int:pk>/members/ → Add members (only the new ones)
+# - DELETE /<int:pk>/members/ → Remove members
+#
+# With ASYNC_READ_VIEWS the GET requests of / and /<int:pk>/ are served
+# by the async views in async_views.py.
 
 urlpatterns = [
-    path('', BoardView.as_view(), name='boards'),
-    path('<int:pk>/', BoardDetailView.as_view(), name='board-detail'), 
+    path('', hybrid_view(BoardView, AsyncBoardView), name='boards'),
+    path('import/', BoardImportView.as_view(), name='board-import'),
+    path('<int:pk>/', hybrid_view(BoardDetailView, AsyncBoardDetailView), name='board-detail'),
+    path('<int:pk>/tasks/', BoardTaskListView.as_view(), name='board-tasks'),
+    path('<int:pk>/members/', BoardMembersView.as_view(), name='board-members'),
+    path('<int:pk>/deletion/', BoardDeletionView.as_view(), name='board-deletion'),
+    path('<int:pk>/export/', BoardExportView.as_view(), name='board-export'),
 ]
 
  
\ No newline at end of file
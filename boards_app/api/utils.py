@@ -0,0 +1,179 @@
+from django.conf import settings
+from django.db import connection, models, transaction
+
+from auth_app.models import CustomUser, UserSearchToken
+from auth_app.search import normalize_search_text, prefix_range
+from boards_app.models import Board
+
+
+def boards_of_user(user):
+    """
+    Return the boards the user owns or is a member of, ordered by ID.
+    """
+
+    return Board.objects.filter(
+        models.Q(owner=user) | models.Q(members=user)
+    ).distinct().order_by('id')
+
+
+# Users on the caller's boards (as member or owner) with a token in the
+# typed range, ranked by the number of boards they share with the caller.
+# Starts from the caller's boards, and the UNION counts each (user, board)
+# pair once.
+SHARED_USERS_SQL = """
+    WITH caller_boards(id) AS (
+        SELECT id FROM boards_app_board
+        WHERE deleted_at IS NULL AND (
+            owner_id = %(user_id)s
+            OR id IN (SELECT board_id FROM boards_app_board_members WHERE customuser_id = %(user_id)s)
+        )
+    ),
+    co_users(user_id, board_id) AS (
+        SELECT customuser_id, board_id FROM boards_app_board_members
+        WHERE board_id IN (SELECT id FROM caller_boards)
+        UNION
+        SELECT owner_id, id FROM boards_app_board WHERE id IN (SELECT id FROM caller_boards)
+    )
+    SELECT user_id FROM co_users
+    WHERE user_id <> %(user_id)s AND EXISTS (
+        SELECT 1 FROM auth_app_usersearchtoken t
+        WHERE t.user_id = co_users.user_id AND t.token >= %(lower)s AND t.token < %(upper)s
+    )
+    GROUP BY user_id
+    ORDER BY COUNT(*) DESC, user_id
+    LIMIT %(limit)s
+"""
+
+
+def autocomplete_min_prefix():
+    """
+    Return the prefix length from which users without a shared board are
+    suggested too (setting USER_AUTOCOMPLETE_MIN_PREFIX).
+    """
+
+    return getattr(settings, 'USER_AUTOCOMPLETE_MIN_PREFIX', 4)
+
+
+def autocomplete_users(user, text, limit):
+    """
+    Find users whose email or name starts with the given text.
+
+    Users who own or are members of one of the caller's boards come first,
+    most shared boards first. Other users follow, ordered by name, but only
+    once the typed text is at least `autocomplete_min_prefix()` characters
+    long (a whole email address always is), so short prefixes cannot be
+    used to list the users. The caller is not included. Both lookups stop
+    in the database after `limit` users.
+
+    Args:
+        user (CustomUser): The user asking for suggestions.
+        text (str): The typed prefix.
+        limit (int): Maximum number of users.
+
+    Returns:
+        list: The matching users in ranked order.
+    """
+
+    prefix = normalize_search_text(text)
+    if not prefix:
+        return []
+    lower, upper = prefix_range(prefix)
+
+    with connection.cursor() as cursor:
+        cursor.execute(SHARED_USERS_SQL, {'user_id': user.id, 'lower': lower, 'upper': upper, 'limit': limit})
+        shared = [row[0] for row in cursor.fetchall()]
+
+    others = []
+    if len(shared) < limit and len(prefix) >= autocomplete_min_prefix():
+        others = list(
+            UserSearchToken.objects.filter(token__gte=lower, token__lt=upper)
+            .exclude(user_id__in=[user.id, *shared])
+            .values_list('user_id', flat=True)
+            .distinct()[:limit - len(shared)]
+        )
+
+    users = CustomUser.objects.filter(id__in=shared + others).only('id', 'email', 'fullname')
+    users_by_id = {candidate.id: candidate for candidate in users}
+    ranked_others = sorted(
+        (users_by_id[user_id] for user_id in others if user_id in users_by_id),
+        key=lambda candidate: (candidate.fullname.lower(), candidate.id),
+    )
+    return [users_by_id[user_id] for user_id in shared if user_id in users_by_id] + ranked_others
+
+
+def _membership_table():
+    through = Board.members.through._meta
+    return (
+        connection.ops.quote_name(through.db_table),
+        connection.ops.quote_name(through.get_field('board').column),
+        connection.ops.quote_name(through.get_field('customuser').column),
+    )
+
+
+def _adjust_member_count(board_id, delta):
+    """
+    Atomically shift the stored member count and bump the board version.
+    """
+
+    if delta:
+        Board.objects.filter(pk=board_id).update(
+            member_count=models.F('member_count') + delta,
+            version=models.F('version') + 1,
+        )
+
+
+def add_board_members(board_id, user_ids):
+    """
+    Add users to a board without touching the existing memberships.
+
+    Runs one `INSERT ... SELECT ... ON CONFLICT DO NOTHING`: user IDs that do
+    not exist or are already members are skipped by the database, and the
+    affected row count is exactly the number of new members.
+
+    Args:
+        board_id (int): The board.
+        user_ids (list): IDs of the users to add.
+
+    Returns:
+        int: Number of users actually added.
+    """
+
+    table, board_column, user_column = _membership_table()
+    placeholders = ', '.join(['%s'] * len(user_ids))
+    sql = (
+        f"INSERT INTO {table} ({board_column}, {user_column}) "
+        f"SELECT %s, id FROM {connection.ops.quote_name(CustomUser._meta.db_table)} "
+        f"WHERE id IN ({placeholders}) "
+        f"ON CONFLICT ({board_column}, {user_column}) DO NOTHING"
+    )
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [board_id, *user_ids])
+            added = max(cursor.rowcount, 0)
+        _adjust_member_count(board_id, added)
+    return added
+
+
+def remove_board_members(board_id, user_ids, keep=()):
+    """
+    Remove users from a board with a single DELETE.
+
+    The membership rows have no dependents or signal receivers, so Django
+    deletes them with one statement instead of collecting them first.
+
+    Args:
+        board_id (int): The board.
+        user_ids (list): IDs of the users to remove; non-members are skipped.
+        keep (iterable): User IDs that must stay members (e.g. the owner).
+
+    Returns:
+        int: Number of users actually removed.
+    """
+
+    memberships = Board.members.through.objects.filter(
+        board_id=board_id, customuser_id__in=user_ids
+    ).exclude(customuser_id__in=list(keep))
+    with transaction.atomic():
+        removed, _ = memberships.delete()
+        _adjust_member_count(board_id, -removed)
+    return removed
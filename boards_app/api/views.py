@@ -3,21 +3,33 @@ from django.http import Http404
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Prefetch
 from email_validator import validate_email, EmailNotValidError
 
 from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import generics, status
 from rest_framework.generics import ListCreateAPIView
-from rest_framework.exceptions import PermissionDenied, NotFound, ParseError
+from rest_framework.exceptions import PermissionDenied, NotFound, ParseError, UnsupportedMediaType
 from rest_framework.views import APIView
 from rest_framework.exceptions import ValidationError, NotFound
 
 from auth_app.models import CustomUser
+from core.coalescing import CoalescedRetrieveMixin, SingleFlight
+from core.concurrency import PreconditionFailed, if_match_version, with_etag
+from core.fieldsets import requested_fields, restrict_queryset
+from core.streaming import StreamingJSONResponse, iter_json_array, iter_ndjson, iter_serialized, stream_chunk_size, wants_streaming
+from core.write_pipeline import run_write
+from tasks_app.models import Task
 from auth_app.api.serializers import UserSerializer  
-from boards_app.models import Board
-from .serializers import BoardSerializer, BoardDetailSerializer, BoardUpdateSerializer
+from boards_app.models import Board, BoardDeletion
+from boards_app.deletion import request_board_deletion
+from boards_app.transfer import BoardImportError, import_board, iter_board_export
+from tasks_app.api.serializers import TasksBoardDetailsSerializer, wants_side_loaded_users
+from tasks_app.api.projections import fast_read_path_enabled
+from .serializers import BoardSerializer, BoardDetailSerializer, BoardUpdateSerializer, BoardMembersDeltaSerializer, BoardDeletionSerializer
 from .permissions import IsAuthenticatedWithCustomMessage
+from .utils import autocomplete_users, add_board_members, remove_board_members, boards_of_user
 
 
 def internal_error_response_500(exception):
@@ -42,6 +54,7 @@ class BoardView(ListCreateAPIView):
 
     GET:
         Returns a list of all boards where the authenticated user is the owner or a member.
+        Supports sparse fieldsets via `?fields=id,title,...`.
 
     POST:
         Creates a new board. The authenticated user becomes the owner and is
@@ -55,23 +68,36 @@ class BoardView(ListCreateAPIView):
     serializer_class = BoardSerializer
     permission_classes = [IsAuthenticatedWithCustomMessage] 
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method == 'GET':
+            context['fields'] = requested_fields(self.request)
+        return context
+
     def get_queryset(self):
         """
         Return boards where the authenticated user is the owner or a member.
+
+        Only the columns of the requested fields are loaded.
         """
 
-        user = self.request.user
-        return Board.objects.filter(
-            models.Q(owner=user) | models.Q(members=user)
-        ).distinct().order_by('id')
+        queryset = boards_of_user(self.request.user)
+        context = self.get_serializer_context()
+        return restrict_queryset(queryset, self.get_serializer(), context.get('fields'))
 
     def list(self, request, *args, **kwargs):
         """
         List all boards for the authenticated user.
+
+        JSON clients get the list streamed in chunks, so memory use does not
+        grow with the number of boards.
         """
 
         try:
             queryset = self.get_queryset()
+            if wants_streaming(request):
+                chunks = iter_serialized(queryset, self.get_serializer_class(), self.get_serializer_context())
+                return StreamingJSONResponse(iter_json_array(chunks))
             serializer = self.get_serializer(queryset, many=True)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Exception as e:
@@ -91,10 +117,11 @@ class BoardView(ListCreateAPIView):
             serializer = self.get_serializer(data=request.data)
             serializer.is_valid(raise_exception=True)
 
-            board = serializer.save(owner=request.user)
+            # Counted up front, so the board is written once (at version 1).
+            member_ids = {member.pk for member in serializer.validated_data.get('members', [])}
+            member_ids.add(request.user.pk)
+            board = serializer.save(owner=request.user, member_count=len(member_ids))
             board.members.add(request.user)
-            board.member_count = board.members.count()
-            board.save()
 
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         
@@ -111,24 +138,38 @@ class BoardView(ListCreateAPIView):
             return internal_error_response_500(e)
         
 
-class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
+class BoardDetailView(CoalescedRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     API view for retrieving, updating, or deleting a specific board.
 
     GET:
         Retrieve board details including title, owner, members, and tasks.
+        With `?include=users` the tasks reference users by ID and the users
+        are returned once in a separate 'users' map.
+        With `?fields=id,title,...` only the given task fields are returned.
+        Concurrent identical requests share one serialization of the board,
+        if it started after they arrived (see CoalescedRetrieveMixin).
 
     PATCH:
         Update title or members of the board (only for owner or members).
+        Responses carry the board's version as ETag; with `If-Match` the
+        update fails with 412 if the board was changed in the meantime.
+        GET sets no ETag, since its body also contains the tasks, which the
+        board's version does not cover; the version is returned as the
+        'version' field instead. An empty PATCH returns the current version
+        without writing anything.
 
     DELETE:
-        Delete the board (only allowed for the owner).
+        Delete the board (only allowed for the owner). The board is hidden
+        right away; its tasks, comments and memberships are purged in the
+        background (progress: GET /api/boards/<pk>/deletion/).
 
     Permissions:
         Only accessible to board owners and members.
     """
 
     permission_classes = [IsAuthenticatedWithCustomMessage] 
+    single_flight = SingleFlight()
 
     def get_serializer_class(self):
         """
@@ -138,6 +179,35 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
         if self.request.method == 'GET':
             return BoardDetailSerializer
         return BoardUpdateSerializer
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['side_load_users'] = wants_side_loaded_users(self.request)
+        if self.request.method == 'GET':
+            context['fields'] = requested_fields(self.request)
+            context['fast_read_path'] = fast_read_path_enabled('board-detail')
+        if self.request.method in ('PUT', 'PATCH'):
+            context['expected_version'] = if_match_version(self.request)
+        return context
+
+    def get_board_queryset(self):
+        """
+        Return the board queryset, loading only the requested task fields on GET.
+        """
+
+        queryset = Board.objects.all()
+        context = self.get_serializer_context()
+        fields = context.get('fields')
+        if fields is None or context.get('fast_read_path'):
+            return queryset
+
+        tasks = restrict_queryset(
+            Task.objects.all(),
+            TasksBoardDetailsSerializer(context=context),
+            fields,
+            extra_columns=('board',),
+        )
+        return queryset.prefetch_related(Prefetch('tasks', queryset=tasks))
     
     def get_object(self):
         """
@@ -147,10 +217,9 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
             PermissionDenied: If the user has no access to this board.
         """
 
-        board = get_object_or_404(Board, pk=self.kwargs.get('pk'))
+        board = get_object_or_404(self.get_board_queryset(), pk=self.kwargs.get('pk'))
         user = self.request.user
-    
-        if board.owner != user and not board.members.filter(id=user.id).exists():
+        if board.owner_id != user.id and not user.can_access_board(board.id):
             raise PermissionDenied("You do not have access to this board.")
     
         return board
@@ -168,7 +237,7 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
                 raise ValidationError({"detail": "Invalid JSON format."})
             
             partial = kwargs.pop('partial', False)
-            instance = self.get_object()
+            self.get_object()
 
             request_members = self.request.data.get('members', [])
             valid_users = CustomUser.objects.filter(id__in=request_members)
@@ -176,31 +245,41 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
             if valid_users.count() != len(request_members):
                 raise ValidationError({"members": "One or more user IDs are invalid."})
 
-            serializer = self.get_serializer(instance, data=request.data, partial=partial)
-            serializer.is_valid(raise_exception=True)
+            serializer = run_write(self.save_update, request.data, partial)
+            return with_etag(Response(serializer.data, status=status.HTTP_200_OK), serializer.instance)
 
-            self.perform_update(serializer)
-            return Response(serializer.data, status=status.HTTP_200_OK)
-
-        except (PermissionDenied, NotFound, ValidationError, Http404) as e:
+        except (PermissionDenied, NotFound, ValidationError, Http404, PreconditionFailed) as e:
             raise e
 
         except Exception as e:
             return internal_error_response_500(e)
 
-    def perform_update(self, serializer):
+    def save_update(self, data, partial):
         """
         Save updated board data and update members list and count.
+
+        The requesting user always stays a member. Title, members and
+        member count are written together in one versioned update that
+        only touches what changed (see MinimalUpdateMixin).
+
+        This is the unit `run_write` retries after a lock error, so each
+        attempt loads the board and validates the data again instead of
+        reusing an instance a failed attempt has already changed.
+
+        Returns:
+            BoardUpdateSerializer: The saved serializer.
         """
-           
-        board = serializer.save()
 
-        members = self.request.data.get('members', None)
-        if members is not None:
-            board.members.set(members + [self.request.user.id])
+        serializer = self.get_serializer(self.get_object(), data=data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        members = serializer.validated_data.get('members')
+        if members is None:
+            serializer.save()
+            return serializer
 
-        board.member_count = board.members.count()
-        board.save()
+        members = list({user.pk: user for user in [*members, self.request.user]}.values())
+        serializer.save(members=members, member_count=len(members))
+        return serializer
 
     # Deletes the board object if the user is the owner.
     def destroy(self, request, *args, **kwargs):
@@ -225,9 +304,200 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def perform_destroy(self, instance):
         """
-        Delete the board instance from the database.
+        Hide the board and queue the purge of its content.
+
+        Deleting the board with `instance.delete()` would load every task,
+        comment and membership of the board into memory and delete them in
+        one long transaction.
+        """
+
+        run_write(request_board_deletion, instance, self.request.user)
+
+
+class BoardDeletionView(APIView):
+    """
+    Progress of the purge of a deleted board.
+
+    GET:
+        Returns the board's BoardDeletion (status and counters); 404 if the
+        board was not deleted or the user did not delete it.
+
+    Permissions:
+        Only the user who deleted the board.
+    """
+
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+
+    def get(self, request, pk):
+        try:
+            deletion = BoardDeletion.objects.get(board_id=pk, requested_by=request.user)
+        except BoardDeletion.DoesNotExist:
+            raise NotFound("No deletion found for this board.")
+        return Response(BoardDeletionSerializer(deletion).data)
+
+
+class BoardExportView(APIView):
+    """
+    Export a board as newline-delimited JSON.
+
+    GET:
+        Streams the board, its users and memberships, and each task followed
+        by its comments, one JSON object per line (see boards_app.transfer).
+        Rows are read in chunks while the response is sent, so memory use
+        does not grow with the board.
+
+    Permissions:
+        Only accessible to board owners and members.
+    """
+
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+
+    def get(self, request, pk):
+        board = get_object_or_404(Board, pk=pk)
+        user = request.user
+        if board.owner_id != user.id and not user.can_access_board(board.pk):
+            raise PermissionDenied("You do not have access to this board.")
+
+        try:
+            # The first batch of lines is read here (see StreamingJSONResponse).
+            lines = iter_ndjson(iter_board_export(board), batch_size=stream_chunk_size())
+            response = StreamingJSONResponse(lines, content_type='application/x-ndjson')
+        except Exception as e:
+            return internal_error_response_500(e)
+        response['Content-Disposition'] = f'attachment; filename="board-{board.pk}.ndjson"'
+        return response
+
+
+class BoardImportView(APIView):
+    """
+    Create a board from an NDJSON export.
+
+    POST:
+        Body: an export of GET /api/boards/<pk>/export/ with the content
+        type application/x-ndjson. Query param ?title=<title> overrides the
+        exported title. The body is read line by line and written in
+        chunks in one transaction. The requesting user owns the new board.
+        Other users are matched by email, but only users who already share
+        a board with the requesting user; everyone else is left out (their
+        comments are attributed to the requesting user).
+
+    Permissions:
+        Requires authentication.
+    """
+
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+
+    def post(self, request):
+        """
+        Import the board and return its ID and the imported counts.
+
+        Raises:
+            UnsupportedMediaType: If the body is not NDJSON.
+            ValidationError: If the export is invalid or the title is taken.
+        """
+
+        if request.content_type.split(';')[0].strip() != 'application/x-ndjson':
+            raise UnsupportedMediaType(request.content_type)
+
+        try:
+            board, counts = import_board(
+                request.stream or [], request.user,
+                title=request.query_params.get('title'),
+                shared_users_only=True,
+            )
+            return Response({'id': board.pk, 'title': board.title, **counts}, status=status.HTTP_201_CREATED)
+
+        except BoardImportError as e:
+            raise ValidationError({'import': str(e)})
+
+        except Exception as e:
+            return internal_error_response_500(e)
+
+
+class BoardMembersView(APIView):
+    """
+    Add or remove board members without sending the whole membership.
+
+    POST:
+        Body: {"members": [<user IDs>]}. Adds the users; unknown IDs and
+        existing members are skipped.
+    DELETE:
+        Body: {"members": [<user IDs>]}. Removes the users; the owner and
+        the requesting user always stay members.
+
+    Both return {"changed": <number of added/removed users>, "member_count": <new count>}
+    with the board's new version as ETag. Each request runs one INSERT or
+    DELETE plus an atomic member_count adjustment.
+
+    Permissions:
+        Only accessible to board owners and members.
+    """
+
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+
+    def get_board(self, pk):
+        """
+        Return the board's owner ID after checking the user's access.
+
+        Raises:
+            NotFound: If the board does not exist.
+            PermissionDenied: If the user has no access to this board.
+        """
+
+        owner_id = Board.objects.filter(pk=pk).values_list('owner_id', flat=True).first()
+        if owner_id is None:
+            raise NotFound("Board not found.")
+        user = self.request.user
+        if owner_id != user.id and not user.can_access_board(pk):
+            raise PermissionDenied("You do not have access to this board.")
+        return owner_id
+
+    def get_member_ids(self, request):
+        serializer = BoardMembersDeltaSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return list(dict.fromkeys(serializer.validated_data['members']))
+
+    def apply_delta(self, change, pk, *args, **kwargs):
+        """
+        Run `change` and read the resulting count and version in the same
+        transaction, so the ETag is the version this change produced.
+
+        Returns:
+            tuple: The number of changed memberships and the board.
+        """
+
+        changed = change(pk, *args, **kwargs)
+        return changed, Board.objects.only('member_count', 'version').get(pk=pk)
+
+    def delta_response(self, changed, board):
+        response = Response({"changed": changed, "member_count": board.member_count}, status=status.HTTP_200_OK)
+        return with_etag(response, board)
+
+    def post(self, request, pk):
+        """
+        Add the given users to the board.
         """
-        instance.delete()  
+
+        self.get_board(pk)
+        member_ids = self.get_member_ids(request)
+        try:
+            return self.delta_response(*run_write(self.apply_delta, add_board_members, pk, member_ids))
+        except Exception as e:
+            return internal_error_response_500(e)
+
+    def delete(self, request, pk):
+        """
+        Remove the given users from the board.
+        """
+
+        owner_id = self.get_board(pk)
+        member_ids = self.get_member_ids(request)
+        try:
+            return self.delta_response(*run_write(
+                self.apply_delta, remove_board_members, pk, member_ids, keep=(owner_id, request.user.id),
+            ))
+        except Exception as e:
+            return internal_error_response_500(e)
 
 
 class EmailCheckView(APIView):
@@ -268,7 +538,7 @@ class EmailCheckView(APIView):
 
 
             try:
-                user = CustomUser.objects.get(email=email)
+                user = CustomUser.objects.filter_by_email(email).get()
             except CustomUser.DoesNotExist:
                     raise NotFound("No user found with this email address.")
 
@@ -280,3 +550,48 @@ class EmailCheckView(APIView):
         
         except Exception as e:
             return internal_error_response_500(e)
+
+
+class UserAutocompleteView(APIView):
+    """
+    API view suggesting users for member pickers.
+
+    GET:
+        Query params:
+            ?q=<text>     Start of an email address or of a word of the full name.
+            ?limit=<n>    Maximum number of users (default 10, max 25).
+        - Returns matching users; users sharing boards with the caller come
+          first (most shared boards first), other users only from
+          USER_AUTOCOMPLETE_MIN_PREFIX typed characters on.
+        - Returns 400 if the query is missing.
+
+    Permissions:
+        Requires authentication.
+    """
+
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+    max_limit = 25
+
+    def get(self, request):
+        """
+        Return the ranked user suggestions for the typed prefix.
+
+        Raises:
+            ValidationError: If the query is missing or the limit is invalid.
+        """
+
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            raise ValidationError({"q": "Search parameter is missing."})
+
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            raise ValidationError({"limit": "Limit must be an integer."})
+        limit = max(1, min(limit, self.max_limit))
+
+        try:
+            users = autocomplete_users(request.user, text, limit)
+            return Response(UserSerializer(users, many=True).data)
+        except Exception as e:
+            return internal_error_response_500(e)
@@ -0,0 +1,169 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import models
+from django.http import Http404
+from django.utils import timezone
+
+from boards_app.models import Board, BoardDeletion
+from core.db import run_with_retry
+from jobs_app.queue import LeaseLost, enqueue
+from tasks_app.models import Task, TaskComment
+
+
+logger = logging.getLogger(__name__)
+
+
+def deleted_title(board):
+    """
+    Return the title a deleted board is renamed to, freeing its (unique)
+    title for new boards while the purge runs.
+    """
+
+    return f'[deleted {board.pk}] {board.title}'[:255]
+
+
+def request_board_deletion(board, user=None):
+    """
+    Hide the board, record its deletion and queue the 'boards.purge' job
+    that purges its content (see boards_app.jobs). Must run inside a
+    transaction.
+
+    Only three small writes, independent of the board's size: the board
+    is marked deleted (so the default manager no longer returns it and
+    every membership check fails), a BoardDeletion is created and the job
+    is queued.
+
+    Returns:
+        BoardDeletion: The progress record.
+
+    Raises:
+        Http404: If the board was deleted in the meantime.
+    """
+
+    hidden = Board.objects.filter(pk=board.pk).update(
+        deleted_at=timezone.now(),
+        title=deleted_title(board),
+        version=models.F('version') + 1,
+    )
+    if not hidden:
+        raise Http404("Board not found.")
+    deletion = BoardDeletion.objects.create(
+        board_id=board.pk,
+        title=board.title,
+        requested_by=user,
+        tasks_total=Task.objects.filter(board_id=board.pk).count(),
+    )
+    enqueue('boards.purge', {'deletion_id': deletion.pk})
+    return deletion
+
+
+def purge_chunk_size():
+    return getattr(settings, 'BOARD_PURGE_CHUNK_SIZE', 500)
+
+
+def _purge_steps(board_id):
+    """
+    Return the purge steps in order: (queryset, progress counter or None).
+
+    Children come before their parents, so each step only deletes rows
+    nothing else points to anymore and every chunk is one small DELETE.
+    """
+
+    return [
+        (TaskComment.objects.filter(task__board_id=board_id), 'comments_deleted'),
+        (Task.objects.filter(board_id=board_id), 'tasks_deleted'),
+        (Board.members.through.objects.filter(board_id=board_id), None),
+        (Board.rewiewers.through.objects.filter(board_id=board_id), None),
+    ]
+
+
+def _delete_chunk(deletion_id, queryset, counter, chunk_size):
+    model = queryset.model
+    # Unordered, so the database stops after `chunk_size` rows.
+    ids = list(queryset.order_by().values_list('pk', flat=True)[:chunk_size])
+    if not ids:
+        return 0
+    _, deleted = model._base_manager.filter(pk__in=ids).delete()
+    count = deleted.get(model._meta.label, 0)
+    changes = {'updated_at': timezone.now()}
+    if counter:
+        changes[counter] = models.F(counter) + count
+    BoardDeletion.objects.filter(pk=deletion_id).update(**changes)
+    return len(ids)
+
+
+def _finish(deletion):
+    Board.all_objects.filter(pk=deletion.board_id).delete()
+    now = timezone.now()
+    BoardDeletion.objects.filter(pk=deletion.pk).update(
+        status=BoardDeletion.STATUS_DONE, error='', updated_at=now, finished_at=now
+    )
+
+
+def purge_board(deletion, chunk_size=None, pause=None, heartbeat=None):
+    """
+    Delete the content of a deleted board in chunks, then the board itself.
+
+    Every chunk is its own short transaction (retried if the database is
+    locked), which also adds the chunk to the deletion's progress
+    counters, and the purge sleeps `pause` seconds between chunks so
+    other writers get the write lock. Since each step just deletes
+    whatever is left, a purge interrupted by a crash is resumed by running
+    it again: the 'boards.purge' job is retried, or run
+    `manage.py purge_deleted_boards`.
+
+    Args:
+        deletion (BoardDeletion): The deletion to carry out.
+        chunk_size (int): Rows per transaction, defaults to the
+            BOARD_PURGE_CHUNK_SIZE setting.
+        pause (float): Seconds between chunks, defaults to the
+            BOARD_PURGE_CHUNK_PAUSE setting.
+        heartbeat (callable): Called after every chunk (e.g. Job.heartbeat).
+
+    Returns:
+        BoardDeletion: The deletion, reloaded.
+
+    Raises:
+        LeaseLost: If the heartbeat lost the job's lease; the deletion's
+            status is left to the worker that took over.
+    """
+
+    chunk_size = chunk_size or purge_chunk_size()
+    pause = pause if pause is not None else getattr(settings, 'BOARD_PURGE_CHUNK_PAUSE', 0.05)
+    if deletion.status == BoardDeletion.STATUS_DONE:
+        return deletion
+
+    BoardDeletion.objects.filter(pk=deletion.pk).update(
+        status=BoardDeletion.STATUS_RUNNING, updated_at=timezone.now()
+    )
+    try:
+        for queryset, counter in _purge_steps(deletion.board_id):
+            while run_with_retry(_delete_chunk, deletion.pk, queryset, counter, chunk_size):
+                if heartbeat:
+                    heartbeat()
+                if pause:
+                    time.sleep(pause)
+        run_with_retry(_finish, deletion)
+    except LeaseLost:
+        # Another worker has taken over the job and runs the purge now;
+        # its progress is not ours to mark failed.
+        raise
+    except Exception as e:
+        logger.exception('Purge of board %s failed', deletion.board_id)
+        BoardDeletion.objects.filter(pk=deletion.pk).update(
+            status=BoardDeletion.STATUS_FAILED, error=str(e), updated_at=timezone.now()
+        )
+        raise
+    deletion.refresh_from_db()
+    logger.info('Purged board %s (%s tasks, %s comments)', deletion.board_id, deletion.tasks_deleted, deletion.comments_deleted)
+    return deletion
+
+
+def unfinished_deletions():
+    """
+    Return the deletions whose purge has not completed, oldest first.
+    """
+
+    return BoardDeletion.objects.exclude(status=BoardDeletion.STATUS_DONE).order_by('created_at')
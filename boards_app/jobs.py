@@ -0,0 +1,17 @@
+from jobs_app.registry import register_job
+from .deletion import purge_board
+from .models import BoardDeletion
+
+
+@register_job('boards.purge', concurrency=1, max_attempts=10)
+def purge_deleted_board(job):
+    """
+    Purge the content of a deleted board (queued by `request_board_deletion`).
+
+    One purge runs at a time, so purges do not compete for the write
+    lock. A failed or interrupted purge is retried with backoff and
+    continues with the rows that are left.
+    """
+
+    deletion = BoardDeletion.objects.get(pk=job.payload['deletion_id'])
+    purge_board(deletion, heartbeat=job.heartbeat)
@@ -0,0 +1,41 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from boards_app.models import Board
+from boards_app.transfer import iter_board_export
+from core.streaming import iter_ndjson
+
+
+class Command(BaseCommand):
+    """
+    Export a board with its members, tasks and comments as NDJSON
+    (see boards_app.transfer). Rows are read in chunks and written as
+    they are read, so memory use does not grow with the board.
+    """
+
+    help = 'Export a board as newline-delimited JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('board_id', type=int)
+        parser.add_argument('--output', '-o', default='-', help='File to write to (default: stdout).')
+        parser.add_argument('--chunk-size', type=int, default=None, help='Tasks per query (default: BOARD_TRANSFER_CHUNK_SIZE).')
+
+    def handle(self, *args, **options):
+        try:
+            board = Board.objects.get(pk=options['board_id'])
+        except Board.DoesNotExist:
+            raise CommandError(f'Board {options["board_id"]} does not exist.')
+
+        lines = iter_ndjson(iter_board_export(board, chunk_size=options['chunk_size']))
+        if options['output'] == '-':
+            for line in lines:
+                sys.stdout.buffer.write(line)
+            sys.stdout.buffer.flush()
+            return
+        count = 0
+        with open(options['output'], 'wb') as output:
+            for line in lines:
+                output.write(line)
+                count += 1
+        self.stderr.write(self.style.SUCCESS(f'Exported board {board.pk} ({count} records) to {options["output"]}.'))
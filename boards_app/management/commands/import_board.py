@@ -0,0 +1,52 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.models import CustomUser
+from boards_app.transfer import BoardImportError, import_board
+
+
+class Command(BaseCommand):
+    """
+    Import a board from an NDJSON export (see boards_app.transfer).
+
+    The file is read line by line and written in chunks with bulk_create,
+    all in one transaction. Every user is matched by email, unlike uploads
+    through the API (see BoardImporter).
+    """
+
+    help = 'Import a board from newline-delimited JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Export file, or - for stdin.')
+        parser.add_argument('--owner', required=True, help='Email of the user who will own the board.')
+        parser.add_argument('--title', default=None, help='Title of the new board (default: the exported title).')
+        parser.add_argument('--create-users', action='store_true', help='Create users that do not exist here (with unusable passwords).')
+        parser.add_argument('--chunk-size', type=int, default=None, help='Rows per bulk_create (default: BOARD_TRANSFER_CHUNK_SIZE).')
+
+    def handle(self, *args, **options):
+        try:
+            owner = CustomUser.objects.filter_by_email(options['owner']).get()
+        except CustomUser.DoesNotExist:
+            raise CommandError(f'No user with the email {options["owner"]}.')
+
+        source = sys.stdin.buffer if options['path'] == '-' else open(options['path'], 'rb')
+        try:
+            board, counts = import_board(
+                source, owner,
+                title=options['title'],
+                create_users=options['create_users'],
+                chunk_size=options['chunk_size'],
+            )
+        except BoardImportError as e:
+            raise CommandError(str(e))
+        finally:
+            if source is not sys.stdin.buffer:
+                source.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported board {board.pk} "{board.title}": {counts["members"]} members, '
+            f'{counts["tasks"]} tasks, {counts["comments"]} comments'
+            + (f', {counts["unknown_users"]} unknown users left out' if counts['unknown_users'] else '')
+            + '.'
+        ))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from boards_app.deletion import purge_board, unfinished_deletions
+
+
+class Command(BaseCommand):
+    """
+    Purge deleted boards whose purge has not completed (see boards_app.deletion).
+
+    Purges normally run as 'boards.purge' jobs (`manage.py run_worker`).
+    This command runs them right away, e.g. for purges whose job has used
+    up its attempts; each continues with the rows that are left. Progress
+    is printed per board.
+    """
+
+    help = 'Purge the content of deleted boards that has not been purged yet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=None, help='Rows deleted per transaction (default: BOARD_PURGE_CHUNK_SIZE).')
+        parser.add_argument('--pause', type=float, default=None, help='Seconds between chunks (default: BOARD_PURGE_CHUNK_PAUSE).')
+
+    def handle(self, *args, **options):
+        purged = 0
+        for deletion in unfinished_deletions():
+            self.stdout.write(
+                f'Purging board {deletion.board_id} "{deletion.title}" ({deletion.status}, '
+                f'{deletion.tasks_deleted}/{deletion.tasks_total} tasks deleted)'
+            )
+            deletion = purge_board(deletion, chunk_size=options['chunk_size'], pause=options['pause'])
+            self.stdout.write(f'  {deletion.tasks_deleted} tasks, {deletion.comments_deleted} comments deleted')
+            purged += 1
+        self.stdout.write(self.style.SUCCESS(f'Purged {purged} boards.'))
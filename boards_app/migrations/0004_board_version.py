@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0003_rename_owner_id_board_owner'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incremented on every update, used for optimistic locking'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-19 10:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('boards_app', '0004_board_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Set when the board was deleted; its content is then purged in the background', null=True),
+        ),
+        migrations.CreateModel(
+            name='BoardDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board_id', models.PositiveIntegerField(help_text='ID of the deleted board', unique=True)),
+                ('title', models.CharField(help_text='Title of the board before deletion', max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('tasks_total', models.PositiveIntegerField(default=0, help_text='Number of tasks when the board was deleted')),
+                ('tasks_deleted', models.PositiveIntegerField(default=0)),
+                ('comments_deleted', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='board_deletions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Board deletion',
+                'verbose_name_plural': 'Board deletions',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
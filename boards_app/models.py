@@ -2,6 +2,17 @@ from django.db import models
 from auth_app.models import CustomUser 
 
 
+class BoardManager(models.Manager):
+    """
+    Default manager for boards, hiding boards that are being deleted.
+
+    Use `Board.all_objects` to include them (e.g. in the purge).
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Board(models.Model):
     """
     Represents a board in the application.
@@ -18,6 +29,11 @@ class Board(models.Model):
     owner = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='boards')
     rewiewers = models.ManyToManyField(CustomUser, verbose_name=("reviewers"), related_name='board_reviewers', blank=True, help_text="Users who can review tasks in the board")
     due_date = models.DateField(null=True, blank=True, help_text="Due date for the board tasks")
+    version = models.PositiveIntegerField(default=1, editable=False, help_text="Incremented on every update, used for optimistic locking")
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False, help_text="Set when the board was deleted; its content is then purged in the background")
+
+    objects = BoardManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         """
@@ -33,3 +49,47 @@ class Board(models.Model):
         verbose_name = "Board"
         verbose_name_plural = "Boards"
         ordering = ['title']
+
+
+class BoardDeletion(models.Model):
+    """
+    Progress of the background purge of a deleted board.
+
+    Created when the board is deleted (and hidden); the purge in
+    boards_app.deletion removes the board's comments, tasks and
+    memberships in chunks, adds each chunk to the counters in the same
+    transaction and finally deletes the board row. The record is kept
+    afterwards as history.
+    """
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    board_id = models.PositiveIntegerField(unique=True, help_text="ID of the deleted board")
+    title = models.CharField(max_length=255, help_text="Title of the board before deletion")
+    requested_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='board_deletions')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    tasks_total = models.PositiveIntegerField(default=0, help_text="Number of tasks when the board was deleted")
+    tasks_deleted = models.PositiveIntegerField(default=0)
+    comments_deleted = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.title} ({self.status})'
+
+    class Meta:
+        verbose_name = "Board deletion"
+        verbose_name_plural = "Board deletions"
+        ordering = ['-created_at']
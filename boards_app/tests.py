@@ -1,3 +1,487 @@
-from django.test import TestCase
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from auth_app.models import CustomUser
+from boards_app.deletion import purge_board, request_board_deletion
+from boards_app.models import Board, BoardDeletion
+from boards_app.transfer import BoardImportError, import_board, iter_board_export
+from core.streaming import iter_ndjson
+from jobs_app.queue import LeaseLost
+from tasks_app.models import Task, TaskComment
+
+
+class PurgeBoardTests(TestCase):
+    """
+    Chunked purge of a deleted board (boards_app.deletion).
+    """
+
+    def setUp(self):
+        user = CustomUser.objects.create_user(email='owner@example.com', password=None, fullname='Owner')
+        board = Board.objects.create(title='Board', owner=user)
+        board.members.add(user)
+        Task.objects.bulk_create([Task(board=board, title=f'Task {i}') for i in range(5)])
+        self.deletion = request_board_deletion(board, user)
+
+    def test_purge_deletes_in_chunks(self):
+        deletion = purge_board(self.deletion, chunk_size=2, pause=0)
+        self.assertEqual((deletion.status, deletion.tasks_deleted), (BoardDeletion.STATUS_DONE, 5))
+        self.assertFalse(Board.all_objects.filter(pk=deletion.board_id).exists())
+        self.assertFalse(Task.objects.filter(board_id=deletion.board_id).exists())
+
+    def test_error_marks_deletion_failed(self):
+        def heartbeat():
+            raise RuntimeError('disk full')
+
+        with self.assertRaises(RuntimeError), self.assertLogs('boards_app.deletion', 'ERROR'):
+            purge_board(self.deletion, chunk_size=2, pause=0, heartbeat=heartbeat)
+        self.deletion.refresh_from_db()
+        self.assertEqual((self.deletion.status, self.deletion.error), (BoardDeletion.STATUS_FAILED, 'disk full'))
+
+    def test_lost_lease_leaves_status_to_the_new_worker(self):
+        def heartbeat():
+            raise LeaseLost('Lost the lease on job 1.')
+
+        with self.assertRaises(LeaseLost), self.assertNoLogs('boards_app.deletion', 'ERROR'):
+            purge_board(self.deletion, chunk_size=2, pause=0, heartbeat=heartbeat)
+        self.deletion.refresh_from_db()
+        self.assertEqual((self.deletion.status, self.deletion.error), (BoardDeletion.STATUS_RUNNING, ''))
+        # The chunk before the heartbeat stays deleted.
+        self.assertEqual(self.deletion.tasks_deleted, 2)
+
+
+class BoardWriteTests(TestCase):
+    """
+    POST /api/boards/ and PATCH /api/boards/<pk>/ write the board row once
+    at most, and not at all if nothing changed.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email='owner@example.com', password=None, fullname='Owner')
+        cls.other = CustomUser.objects.create_user(email='other@example.com', password=None, fullname='Other')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    def board_updates(self, queries):
+        table = Board._meta.db_table
+        return [q['sql'] for q in queries if q['sql'].startswith(f'UPDATE "{table}"')]
+
+    def test_new_board_is_written_once_at_version_1(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/boards/', {
+                'title': 'New', 'members': [self.user.pk, self.other.pk, self.other.pk],
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['member_count'], 2)
+        self.assertEqual(self.board_updates(queries), [])
+        board = Board.objects.get(pk=response.data['id'])
+        self.assertEqual((board.version, board.member_count, board.members.count()), (1, 2, 2))
+
+    def test_creator_is_counted_as_member(self):
+        response = self.client.post('/api/boards/', {'title': 'New', 'members': [self.other.pk]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        board = Board.objects.get(pk=response.data['id'])
+        self.assertEqual((board.version, board.member_count, board.members.count()), (1, 2, 2))
+
+    def test_no_op_patch_issues_no_update(self):
+        board = Board.objects.create(title='Board', owner=self.user, member_count=2)
+        board.members.add(self.user, self.other)
+        for data in ({}, {'title': 'Board'}, {'title': 'Board', 'members': [self.other.pk]}):
+            with self.subTest(data), CaptureQueriesContext(connection) as queries:
+                response = self.client.patch(f'/api/boards/{board.pk}/', data, format='json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(self.board_updates(queries), [])
+            self.assertEqual(response['ETag'], '"1"')
+        board.refresh_from_db()
+        self.assertEqual((board.title, board.version, board.member_count), ('Board', 1, 2))
+
+    def test_patch_writes_only_changed_columns(self):
+        board = Board.objects.create(title='Board', owner=self.user, member_count=1)
+        board.members.add(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(f'/api/boards/{board.pk}/', {'title': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        updates = self.board_updates(queries)
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"title"', updates[0])
+        self.assertNotIn('"member_count"', updates[0])
+        self.assertEqual(Board.objects.get(pk=board.pk).version, 2)
+
+
+class BoardOptimisticLockingTests(TestCase):
+    """
+    PATCH /api/boards/<pk>/ with `If-Match` (core.concurrency).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email='owner@example.com', password=None, fullname='Owner')
+        cls.board = Board.objects.create(title='Board', owner=cls.user, member_count=1)
+        cls.board.members.add(cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    def patch(self, data, if_match=None):
+        headers = {'If-Match': if_match} if if_match is not None else {}
+        return self.client.patch(f'/api/boards/{self.board.pk}/', data, format='json', headers=headers)
+
+    def test_version_is_in_the_board_serializations(self):
+        detail = self.client.get(f'/api/boards/{self.board.pk}/')
+        self.assertEqual(detail.json()['version'], 1)
+        self.assertNotIn('ETag', detail)
+        boards = json.loads(self.client.get('/api/boards/').getvalue())
+        self.assertEqual(boards[0]['version'], 1)
+
+    def test_matching_if_match_updates_and_bumps_the_etag(self):
+        response = self.patch({'title': 'First'}, if_match='"1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response['ETag'], response.data['version']), ('"2"', 2))
+        # Weak and listed tags name the version just the same.
+        response = self.patch({'title': 'Second'}, if_match='W/"2", "7"')
+        self.assertEqual((response.status_code, response['ETag']), (200, '"3"'))
+        self.assertEqual(self.client.get(f'/api/boards/{self.board.pk}/').json()['version'], 3)
+
+    def test_stale_if_match_fails_without_writing(self):
+        self.patch({'title': 'First'}, if_match='"1"')
+        response = self.patch({'title': 'Lost update'}, if_match='"1"')
+        self.assertEqual(response.status_code, 412)
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.title, self.board.version), ('First', 2))
+
+    def test_malformed_if_match_never_matches(self):
+        for if_match in ('"abc"', 'W/', '""'):
+            with self.subTest(if_match):
+                self.assertEqual(self.patch({'title': 'Changed'}, if_match=if_match).status_code, 412)
+        self.board.refresh_from_db()
+        self.assertEqual((self.board.title, self.board.version), ('Board', 1))
+
+    def test_missing_or_any_if_match_is_unconditional(self):
+        self.assertEqual(self.patch({'title': 'First'})['ETag'], '"2"')
+        self.assertEqual(self.patch({'title': 'Second'}, if_match='*')['ETag'], '"3"')
+
+
+class BoardMembersTests(TestCase):
+    """
+    POST and DELETE /api/boards/<pk>/members/ change only the given users.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        def user(email):
+            return CustomUser.objects.create_user(email=email, password=None, fullname=email.split('@')[0])
+
+        cls.owner = user('owner@example.com')
+        cls.member = user('member@example.com')
+        cls.newcomer = user('newcomer@example.com')
+        cls.stranger = user('stranger@example.com')
+        cls.board = Board.objects.create(title='Board', owner=cls.owner, member_count=2)
+        cls.board.members.add(cls.owner, cls.member)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.member).key}')
+        self.url = f'/api/boards/{self.board.pk}/members/'
+
+    def change(self, method, member_ids, client=None):
+        return getattr(client or self.client, method)(self.url, {'members': member_ids}, format='json')
+
+    def assertBoard(self, member_ids, version):
+        board = Board.objects.get(pk=self.board.pk)
+        self.assertEqual(set(board.members.values_list('id', flat=True)), set(member_ids))
+        self.assertEqual((board.member_count, board.version), (len(member_ids), version))
+
+    def test_add_skips_existing_and_unknown_users(self):
+        response = self.change('post', [self.newcomer.pk, self.member.pk, self.newcomer.pk, 999999])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'changed': 1, 'member_count': 3})
+        self.assertBoard([self.owner.pk, self.member.pk, self.newcomer.pk], version=2)
+        self.assertEqual(response['ETag'], '"2"')
+
+    def test_readding_members_changes_nothing(self):
+        response = self.change('post', [self.owner.pk, self.member.pk])
+        self.assertEqual(response.data, {'changed': 0, 'member_count': 2})
+        self.assertEqual(response['ETag'], '"1"')
+        self.assertBoard([self.owner.pk, self.member.pk], version=1)
+
+    def test_remove_skips_non_members_and_keeps_owner_and_caller(self):
+        self.change('post', [self.newcomer.pk])
+        response = self.change('delete', [self.stranger.pk, self.owner.pk, self.member.pk])
+        self.assertEqual(response.data, {'changed': 0, 'member_count': 3})
+        self.assertEqual(response['ETag'], '"2"')
+
+        response = self.change('delete', [self.newcomer.pk, self.stranger.pk])
+        self.assertEqual(response.data, {'changed': 1, 'member_count': 2})
+        self.assertEqual(response['ETag'], '"3"')
+        self.assertBoard([self.owner.pk, self.member.pk], version=3)
+
+    def test_etag_is_usable_for_a_following_patch(self):
+        etag = self.change('post', [self.newcomer.pk])['ETag']
+        response = self.client.patch(f'/api/boards/{self.board.pk}/', {'title': 'Renamed'}, format='json', headers={'If-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_stranger_is_forbidden(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.stranger).key}')
+        for method in ('post', 'delete'):
+            with self.subTest(method):
+                self.assertEqual(self.change(method, [self.stranger.pk], client).status_code, 403)
+        self.assertBoard([self.owner.pk, self.member.pk], version=1)
+
+    def test_invalid_body_and_unknown_board(self):
+        for members in ([], ['x'], [0], 'not a list'):
+            with self.subTest(members):
+                self.assertEqual(self.change('post', members).status_code, 400)
+        self.assertEqual(self.client.post('/api/boards/999999/members/', {'members': [1]}, format='json').status_code, 404)
+
+
+class UserAutocompleteTests(TestCase):
+    """
+    GET /api/users/autocomplete/: users sharing a board first, others
+    only for longer prefixes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        def user(email, fullname):
+            return CustomUser.objects.create_user(email=email, password=None, fullname=fullname)
+
+        cls.caller = user('caller@example.com', 'Caller')
+        cls.member = user('anna.member@example.com', 'Anna Member')
+        cls.owner = user('anna.owner@example.com', 'Anna Owner')
+        cls.both = user('anna.both@example.com', 'Anna Both')
+        cls.stranger = user('anna.stranger@example.com', 'Anna Stranger')
+
+        first = Board.objects.create(title='First', owner=cls.owner)
+        first.members.add(cls.caller, cls.both)
+        second = Board.objects.create(title='Second', owner=cls.both)
+        second.members.add(cls.caller, cls.member)
+        third = Board.objects.create(title='Third', owner=cls.caller)
+        third.members.add(cls.both)
+        other = Board.objects.create(title='Other', owner=cls.stranger)
+        other.members.add(cls.member)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.caller).key}')
+
+    def suggest(self, q):
+        response = self.client.get('/api/users/autocomplete/', {'q': q})
+        self.assertEqual(response.status_code, 200)
+        return [user['id'] for user in response.data]
+
+    def test_users_sharing_boards_ranked_by_shared_boards(self):
+        # 'both' shares all three boards (owner of one), 'owner' only owns
+        # one shared board, 'member' is a member of one.
+        self.assertEqual(self.suggest('an'), [self.both.pk, self.member.pk, self.owner.pk])
+
+    def test_strangers_need_a_long_prefix_and_come_last(self):
+        self.assertEqual(self.suggest('an'), [self.both.pk, self.member.pk, self.owner.pk])
+        self.assertEqual(self.suggest('anna'), [self.both.pk, self.member.pk, self.owner.pk, self.stranger.pk])
+        self.assertEqual(self.suggest('str'), [])
+        self.assertEqual(self.suggest('stra'), [self.stranger.pk])
+        self.assertEqual(self.suggest('Anna.Stranger@example.com'), [self.stranger.pk])
+
+    def test_shared_users_fill_the_limit_first(self):
+        response = self.client.get('/api/users/autocomplete/', {'q': 'anna', 'limit': 2})
+        self.assertEqual([user['id'] for user in response.data], [self.both.pk, self.member.pk])
+
+    def test_deleted_boards_are_not_shared(self):
+        Board.objects.filter(title__in=['First', 'Second']).update(deleted_at='2025-01-01T00:00:00Z')
+        # 'both' still shares the caller's own board, the others share none.
+        self.assertEqual(self.suggest('an'), [self.both.pk])
+
+    def test_caller_is_not_suggested(self):
+        self.assertEqual(self.suggest('caller'), [])
+
+
+class BoardExportTests(TestCase):
+    """
+    GET /api/boards/<pk>/export/ streams NDJSON in batches of lines.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email='owner@example.com', password=None, fullname='Owner')
+        cls.board = Board.objects.create(title='Board', owner=cls.user)
+        cls.board.members.add(cls.user)
+        Task.objects.bulk_create([Task(board=cls.board, title=f'Task {i}') for i in range(7)])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    def export(self):
+        return self.client.get(f'/api/boards/{self.board.pk}/export/')
+
+    @override_settings(STREAMING_CHUNK_SIZE=3)
+    def test_batches_match_one_line_per_record(self):
+        response = self.export()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(
+            b''.join(response.streaming_content),
+            b''.join(iter_ndjson(iter_board_export(self.board))),
+        )
+
+    def test_error_in_first_lines_is_answered_with_500(self):
+        def failing_export(board):
+            yield {'type': 'board'}
+            raise RuntimeError('database went away')
+
+        with mock.patch('boards_app.api.views.iter_board_export', failing_export), self.assertLogs(level='ERROR'):
+            response = self.export()
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(response.streaming)
+
+
+class BoardImportTests(TestCase):
+    """
+    Import of NDJSON board exports (boards_app.transfer.import_board).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        def user(email):
+            return CustomUser.objects.create_user(email=email, password=None, fullname=email.split('@')[0])
+
+        cls.owner = user('owner@example.com')
+        cls.friend = user('friend@example.com')
+        cls.stranger = user('stranger@example.com')
+        shared = Board.objects.create(title='Shared', owner=cls.owner, member_count=2)
+        shared.members.add(cls.owner, cls.friend)
+
+    def records(self, tasks=(), title='Imported'):
+        """
+        Return an export with the owner (1), the friend (2), the stranger
+        (3) and an unknown user (4) as members, followed by `tasks`.
+        """
+
+        return [
+            {'type': 'board', 'format': 1, 'title': title, 'owner': 1, 'ticket_count': 99},
+            {'type': 'user', 'id': 1, 'email': 'OWNER@example.com', 'fullname': 'Owner'},
+            {'type': 'user', 'id': 2, 'email': 'friend@example.com', 'fullname': 'Friend'},
+            {'type': 'user', 'id': 3, 'email': 'stranger@example.com', 'fullname': 'Stranger'},
+            {'type': 'user', 'id': 4, 'email': 'unknown@example.com', 'fullname': 'Unknown'},
+            *({'type': 'member', 'user': user_id} for user_id in (1, 2, 3, 4)),
+            *tasks,
+        ]
+
+    def task(self, task_id, status='to-do', priority='low', assignee=None, comments=()):
+        return [
+            {
+                'type': 'task', 'id': task_id, 'title': f'Task {task_id}', 'status': status,
+                'priority': priority, 'assignee': assignee, 'reviewer': None, 'comments_count': 42,
+            },
+            *(
+                {'type': 'comment', 'task': task_id, 'author': author, 'content': f'Comment {i}',
+                 'created_at': f'2025-01-0{i + 1}T10:00:00Z'}
+                for i, author in enumerate(comments)
+            ),
+        ]
+
+    def import_records(self, records, **kwargs):
+        lines = [json.dumps(record) + '\n' for record in records]
+        return import_board(lines, self.owner, **kwargs)
+
+    def test_round_trip(self):
+        board, counts = self.import_records(self.records([
+            *self.task(10, assignee=2, comments=[2, 1]),
+            *self.task(11, status='done', priority='high'),
+        ]))
+        exported = list(iter_board_export(board))
+        copy, _ = import_board([json.dumps(record, default=str) for record in exported], self.owner, title='Copy')
+        self.assertEqual(
+            list(Task.objects.filter(board=copy).order_by('id').values_list('title', 'status', 'assignee', 'comments_count')),
+            [('Task 10', 'to-do', self.friend.pk, 2), ('Task 11', 'done', None, 0)],
+        )
+        self.assertEqual(
+            list(TaskComment.objects.filter(task__board=copy).order_by('created_at').values_list('author', 'content')),
+            [(self.friend.pk, 'Comment 0'), (self.owner.pk, 'Comment 1')],
+        )
+
+    def test_comment_must_follow_its_task(self):
+        for chunk_size in (1, 2, 500):
+            records = self.records([*self.task(10), *self.task(11), *self.task(10, comments=[1])[1:]])
+            with self.subTest(chunk_size=chunk_size):
+                with self.assertRaisesMessage(BoardImportError, 'Line 12: Comment for task 10'):
+                    self.import_records(records, chunk_size=chunk_size)
+        # The whole import was rolled back.
+        self.assertFalse(Board.objects.filter(title='Imported').exists())
+
+    def test_comment_before_any_task_is_rejected(self):
+        with self.assertRaisesMessage(BoardImportError, 'does not directly precede it'):
+            self.import_records(self.records(self.task(10, comments=[1])[1:]))
+
+    def test_unknown_and_non_shared_users(self):
+        tasks = [*self.task(10, assignee=3, comments=[3, 4]), *self.task(11, assignee=4)]
+        board, counts = self.import_records(self.records(tasks), shared_users_only=True)
+        # Only the friend shares a board with the owner.
+        self.assertEqual(set(board.members.values_list('id', flat=True)), {self.owner.pk, self.friend.pk})
+        self.assertEqual((counts['members'], counts['unknown_users']), (1, 2))
+        self.assertEqual(list(Task.objects.filter(board=board).values_list('assignee', flat=True)), [None, None])
+        self.assertEqual(
+            set(TaskComment.objects.filter(task__board=board).values_list('author', flat=True)), {self.owner.pk},
+        )
+        self.assertFalse(CustomUser.objects.filter(email='unknown@example.com').exists())
+
+        # Without the restriction existing users are matched.
+        board, counts = self.import_records(self.records(tasks, title='Unrestricted'))
+        self.assertEqual(board.member_count, 3)
+        self.assertEqual(counts['unknown_users'], 1)
+
+    def test_user_reference_missing_from_the_file(self):
+        with self.assertRaisesMessage(BoardImportError, 'refers to user 9, which is not in the file'):
+            self.import_records(self.records(self.task(10, assignee=9)))
+
+    def test_duplicate_title_is_rejected(self):
+        with self.assertRaisesMessage(BoardImportError, 'Line 1: A board titled "Shared" already exists.'):
+            self.import_records(self.records(title='Shared'))
+        # The title override is checked as well.
+        with self.assertRaisesMessage(BoardImportError, 'already exists'):
+            self.import_records(self.records(), title='Shared')
+
+    @override_settings(BOARD_TRANSFER_CHUNK_SIZE=2)
+    def test_counters_are_recomputed_over_chunks(self):
+        tasks = [
+            *self.task(10, comments=[1, 2, 1]),
+            *self.task(11, status='done', priority='high', comments=[2]),
+            *self.task(12, priority='high'),
+            *self.task(13, comments=[1, 1, 1, 1, 1]),
+            *self.task(14, status='review'),
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            board, counts = self.import_records(self.records(tasks))
+        self.assertGreater(sum('INSERT INTO "tasks_app_task"' in q['sql'] for q in queries), 1)
+        self.assertEqual((counts['tasks'], counts['comments']), (5, 9))
+        self.assertEqual(
+            (board.ticket_count, board.tasks_to_do_count, board.tasks_hight_prio_count, board.member_count),
+            (5, 3, 2, 3),
+        )
+        self.assertEqual(
+            list(Task.objects.filter(board=board).order_by('id').values_list('comments_count', flat=True)),
+            [3, 1, 0, 5, 0],
+        )
+
+    def test_endpoint(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.owner).key}')
+        body = ''.join(json.dumps(record) + '\n' for record in self.records(self.task(10, comments=[2])))
+        response = client.post('/api/boards/import/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['title'], response.data['tasks'], response.data['unknown_users']), ('Imported', 1, 2))
+
+        response = client.post('/api/boards/import/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('already exists', response.data['import'])
+        response = client.post('/api/boards/import/', body, content_type='application/json')
+        self.assertEqual(response.status_code, 415)
@@ -0,0 +1,431 @@
+import json
+
+from django.conf import settings
+from django.db import connections, models, router, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from auth_app.models import CustomUser
+from boards_app.models import Board
+from tasks_app.models import Task, TaskComment
+
+
+# Version of the NDJSON format, stored in the board record.
+EXPORT_FORMAT = 1
+
+TASK_FIELDS = ['id', 'title', 'description', 'status', 'priority', 'assignee_id', 'reviewer_id', 'due_date', 'comments_count']
+COMMENT_FIELDS = ['id', 'task_id', 'author_id', 'content', 'created_at']
+
+
+class BoardImportError(ValueError):
+    """
+    Raised when an import file is invalid; the message names the line.
+    """
+
+
+def transfer_chunk_size():
+    """
+    Return the number of tasks exported or created per step (setting
+    BOARD_TRANSFER_CHUNK_SIZE).
+    """
+
+    return getattr(settings, 'BOARD_TRANSFER_CHUNK_SIZE', 500)
+
+
+def iter_board_export(board, chunk_size=None):
+    """
+    Yield the records of a board export, one dict per NDJSON line.
+
+    Order: the board, every user it references (owner, members, assignees,
+    reviewers and comment authors), the memberships, then each task
+    directly followed by its comments. Tasks are read with keyset
+    pagination in chunks of `chunk_size`, so memory use does not depend on
+    the size of the board. User IDs are only references within the file;
+    on import users are matched by email.
+
+    Args:
+        board (Board): The board to export.
+        chunk_size (int): Tasks per query, defaults to BOARD_TRANSFER_CHUNK_SIZE.
+    """
+
+    chunk_size = chunk_size or transfer_chunk_size()
+    yield {
+        'type': 'board',
+        'format': EXPORT_FORMAT,
+        'title': board.title,
+        'owner': board.owner_id,
+        'due_date': board.due_date,
+        'ticket_count': board.ticket_count,
+        'tasks_to_do_count': board.tasks_to_do_count,
+        'tasks_hight_prio_count': board.tasks_hight_prio_count,
+    }
+
+    tasks = Task.objects.filter(board_id=board.pk)
+    members = Board.members.through.objects.filter(board_id=board.pk)
+    users = CustomUser.objects.filter(
+        models.Q(pk=board.owner_id)
+        | models.Q(pk__in=members.values('customuser_id'))
+        | models.Q(pk__in=tasks.values('assignee_id'))
+        | models.Q(pk__in=tasks.values('reviewer_id'))
+        | models.Q(pk__in=TaskComment.objects.filter(task__board_id=board.pk).values('author_id'))
+    )
+    for user in users.order_by('id').values('id', 'email', 'fullname').iterator(chunk_size=chunk_size):
+        yield {'type': 'user', **user}
+
+    for user_id in members.order_by('customuser_id').values_list('customuser_id', flat=True).iterator(chunk_size=chunk_size):
+        yield {'type': 'member', 'user': user_id}
+
+    last_id = 0
+    while True:
+        chunk = list(tasks.filter(id__gt=last_id).order_by('id').values(*TASK_FIELDS)[:chunk_size])
+        if not chunk:
+            return
+        last_id = chunk[-1]['id']
+        comments = (
+            TaskComment.objects.filter(task_id__in=[task['id'] for task in chunk])
+            .order_by('task_id', 'created_at', 'id')
+            .values(*COMMENT_FIELDS)
+            .iterator(chunk_size=chunk_size)
+        )
+        comment = next(comments, None)
+        for task in chunk:
+            yield {
+                'type': 'task',
+                'id': task['id'],
+                'title': task['title'],
+                'description': task['description'],
+                'status': task['status'],
+                'priority': task['priority'],
+                'assignee': task['assignee_id'],
+                'reviewer': task['reviewer_id'],
+                'due_date': task['due_date'],
+                'comments_count': task['comments_count'],
+            }
+            while comment is not None and comment['task_id'] == task['id']:
+                yield {
+                    'type': 'comment',
+                    'id': comment['id'],
+                    'task': comment['task_id'],
+                    'author': comment['author_id'],
+                    'content': comment['content'],
+                    'created_at': comment['created_at'],
+                }
+                comment = next(comments, None)
+
+
+def insert_comments(rows):
+    """
+    Insert comments with their exported creation times.
+
+    `bulk_create` would overwrite `created_at` (auto_now_add), and fixing
+    it with `bulk_update` afterwards costs more than the insert itself,
+    so the rows are inserted with one `executemany`. Comment IDs are not
+    needed by the import.
+
+    Args:
+        rows (list): (task_id, author_id, content, created_at) tuples.
+    """
+
+    meta = TaskComment._meta
+    fields = [meta.get_field(name) for name in ('task', 'author', 'content', 'created_at')]
+    connection = connections[router.db_for_write(TaskComment)]
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(meta.db_table),
+        ', '.join(quote(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)),
+    )
+    params = [
+        [field.get_db_prep_save(value, connection) for field, value in zip(fields, row)]
+        for row in rows
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+class BoardImporter:
+    """
+    Builds a board from export records, fed one at a time by `import_board`.
+
+    Tasks and comments are buffered and written in bulk (`bulk_create`,
+    `insert_comments`) once `chunk_size` of them are pending. Since comments directly follow their
+    task, only the old-to-new ID mapping of the tasks of the last chunk is
+    kept, so memory stays bounded by the chunk size (plus one entry per
+    referenced user).
+
+    Users are matched by email. Unknown users are created with an unusable
+    password if `create_users` is set; otherwise they are left out of the
+    members, removed as assignee or reviewer, and their comments are
+    attributed to the owner. With `shared_users_only` a matched user who
+    shares no board with the owner is treated like an unknown one, so an
+    uploaded file cannot add arbitrary accounts to the board or write
+    comments in their name.
+
+    Comment counts and board counters in the file are ignored; they are
+    recomputed from the imported rows by `finish`.
+
+    Args:
+        owner (CustomUser): Owner of the new board; also made a member.
+        title (str): Title of the new board, defaults to the exported one.
+        create_users (bool): Create users missing in this database.
+        chunk_size (int): Rows per bulk_create, defaults to BOARD_TRANSFER_CHUNK_SIZE.
+        shared_users_only (bool): Only match users who share a board with the owner.
+    """
+
+    def __init__(self, owner, title=None, create_users=False, chunk_size=None, shared_users_only=False):
+        self.owner = owner
+        self.title = title
+        self.create_users = create_users
+        self.chunk_size = chunk_size or transfer_chunk_size()
+        self.shared_users_only = shared_users_only
+        self.board = None
+        self.users = {}
+        self.task_ids = {}
+        self.last_task_id = None
+        self.pending_tasks = []
+        self.pending_comments = []
+        self.counts = {'members': 0, 'tasks': 0, 'comments': 0, 'unknown_users': 0}
+        self.line = 0
+
+    def error(self, message):
+        return BoardImportError(f'Line {self.line}: {message}')
+
+    def field(self, record, name, types=None, required=True):
+        value = record.get(name)
+        if value is None:
+            if required:
+                raise self.error(f'"{name}" is missing.')
+            return None
+        if types and not isinstance(value, types):
+            raise self.error(f'"{name}" has an invalid value.')
+        return value
+
+    def add(self, record, line):
+        """
+        Process one record.
+
+        Raises:
+            BoardImportError: If the record is invalid or out of order.
+        """
+
+        self.line = line
+        if not isinstance(record, dict):
+            raise self.error('Expected a JSON object.')
+        kind = record.get('type')
+        if kind == 'board':
+            return self.add_board(record)
+        if self.board is None:
+            raise self.error('The file must start with the board.')
+        handler = {
+            'user': self.add_user,
+            'member': self.add_member,
+            'task': self.add_task,
+            'comment': self.add_comment,
+        }.get(kind)
+        if handler is None:
+            raise self.error(f'Unknown record type "{kind}".')
+        handler(record)
+
+    def add_board(self, record):
+        if self.board is not None:
+            raise self.error('Only one board per file.')
+        if record.get('format') != EXPORT_FORMAT:
+            raise self.error(f'Unsupported format {record.get("format")!r}.')
+        title = (self.title or self.field(record, 'title', str)).strip()
+        if not title or len(title) > 255:
+            raise self.error('Invalid board title.')
+        if Board.all_objects.filter(title=title).exists():
+            raise self.error(f'A board titled "{title}" already exists.')
+        due_date = self.date(record, 'due_date', parse_date)
+        self.board = Board.objects.create(title=title, owner=self.owner, due_date=due_date)
+        self.board.members.add(self.owner)
+
+    def add_user(self, record):
+        old_id = self.field(record, 'id', int)
+        email = self.field(record, 'email', str)
+        user_id = CustomUser.objects.filter_by_email(email).values_list('id', flat=True).first()
+        if user_id is not None and self.shared_users_only and not self.shares_board(user_id):
+            user_id = None
+        elif user_id is None and self.create_users:
+            user_id = CustomUser.objects.create_user(
+                email=email,
+                password=None,
+                fullname=self.field(record, 'fullname', str, required=False) or '',
+            ).pk
+        if user_id is None:
+            self.counts['unknown_users'] += 1
+        self.users[old_id] = user_id
+
+    def shares_board(self, user_id):
+        """
+        Return True if the user is the owner or owns or is a member of one
+        of the owner's other boards.
+        """
+
+        if user_id == self.owner.pk:
+            return True
+        owner_boards = Board.objects.filter(
+            models.Q(owner=self.owner) | models.Q(members=self.owner)
+        ).exclude(pk=self.board.pk).values('id')
+        return Board.objects.filter(
+            models.Q(owner_id=user_id) | models.Q(members=user_id), pk__in=owner_boards
+        ).exists()
+
+    def user(self, record, name, required=False):
+        old_id = self.field(record, name, int, required=required)
+        if old_id is None:
+            return None
+        if old_id not in self.users:
+            raise self.error(f'"{name}" refers to user {old_id}, which is not in the file.')
+        return self.users[old_id]
+
+    def date(self, record, name, parse):
+        value = self.field(record, name, str, required=False)
+        if value is None:
+            return None
+        parsed = parse(value)
+        if parsed is None:
+            raise self.error(f'"{name}" is not a valid date.')
+        return parsed
+
+    def add_member(self, record):
+        user_id = self.user(record, 'user', required=True)
+        if user_id is not None and user_id != self.owner.pk:
+            _, created = self.board.members.through.objects.get_or_create(board_id=self.board.pk, customuser_id=user_id)
+            self.counts['members'] += created
+
+    def add_task(self, record):
+        if len(self.pending_tasks) >= self.chunk_size:
+            self.flush()
+        title = self.field(record, 'title', str)
+        status = self.field(record, 'status', str)
+        priority = self.field(record, 'priority', str)
+        if not title or len(title) > 255:
+            raise self.error('Invalid task title.')
+        if status not in dict(Task.STATUS_CHOICES):
+            raise self.error(f'Invalid status "{status}".')
+        if priority not in dict(Task.PRIORITY_CHOICES):
+            raise self.error(f'Invalid priority "{priority}".')
+        task = Task(
+            board_id=self.board.pk,
+            title=title,
+            description=self.field(record, 'description', str, required=False),
+            status=status,
+            priority=priority,
+            assignee_id=self.user(record, 'assignee'),
+            reviewer_id=self.user(record, 'reviewer'),
+            due_date=self.date(record, 'due_date', parse_date),
+        )
+        self.last_task_id = self.field(record, 'id', int)
+        self.pending_tasks.append((self.last_task_id, task))
+
+    def add_comment(self, record):
+        old_task_id = self.field(record, 'task', int)
+        # Checked against the last task, not the ID mapping: after a flush
+        # the mapping also holds the earlier tasks of the chunk.
+        if old_task_id != self.last_task_id:
+            raise self.error(f'Comment for task {old_task_id}, which does not directly precede it.')
+        author_id = self.user(record, 'author', required=True) or self.owner.pk
+        content = self.field(record, 'content', str)
+        created_at = self.date(record, 'created_at', parse_datetime)
+        self.pending_comments.append((old_task_id, author_id, content, created_at))
+        if len(self.pending_comments) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the pending tasks and comments.
+        """
+
+        task_ids = self.task_ids
+        if self.pending_tasks:
+            created = Task.objects.bulk_create([task for _, task in self.pending_tasks])
+            # Comments only follow their own task, so the mappings of older
+            # chunks are not needed anymore.
+            self.task_ids = {old_id: task.pk for (old_id, _), task in zip(self.pending_tasks, created)}
+            task_ids = {**task_ids, **self.task_ids}
+            self.counts['tasks'] += len(created)
+            self.pending_tasks = []
+
+        if self.pending_comments:
+            now = timezone.now()
+            insert_comments([
+                (task_ids[old_task_id], author_id, content, created_at or now)
+                for old_task_id, author_id, content, created_at in self.pending_comments
+            ])
+            self.counts['comments'] += len(self.pending_comments)
+            self.pending_comments = []
+
+    def finish(self):
+        """
+        Write what is still pending, then count the members, tasks and
+        comments that were actually imported into the board's counters and
+        the tasks' `comments_count`.
+
+        Returns:
+            Board: The imported board.
+
+        Raises:
+            BoardImportError: If the file contained no board.
+        """
+
+        if self.board is None:
+            raise BoardImportError('The file contains no board.')
+        self.flush()
+        tasks = Task.objects.filter(board_id=self.board.pk)
+        comments = (
+            TaskComment.objects.filter(task_id=models.OuterRef('pk'))
+            .order_by()
+            .values('task_id')
+            .annotate(count=models.Count('id'))
+            .values('count')
+        )
+        tasks.update(comments_count=Coalesce(models.Subquery(comments), 0))
+        counts = tasks.aggregate(
+            ticket_count=models.Count('id'),
+            tasks_to_do_count=models.Count('id', filter=models.Q(status=Task.STATUS_TODO)),
+            tasks_hight_prio_count=models.Count('id', filter=models.Q(priority=Task.PRIORITY_HIGH)),
+        )
+        Board.objects.filter(pk=self.board.pk).update(member_count=self.board.members.count(), **counts)
+        self.board.refresh_from_db()
+        return self.board
+
+
+def import_board(lines, owner, title=None, create_users=False, chunk_size=None, shared_users_only=False):
+    """
+    Create a board from an NDJSON export, reading it line by line.
+
+    Everything runs in one transaction: an invalid line rolls back the
+    whole import.
+
+    Args:
+        lines (iterable): The lines of the export (str or bytes).
+        owner (CustomUser): Owner of the new board.
+        title (str): Title of the new board, defaults to the exported one.
+        create_users (bool): Create users missing in this database.
+        chunk_size (int): Rows per bulk_create.
+        shared_users_only (bool): Only match users who share a board with
+            the owner (for uploads by users, see BoardImporter).
+
+    Returns:
+        tuple: (Board, counts of imported members, tasks, comments and
+        unknown users).
+
+    Raises:
+        BoardImportError: If the export is invalid or the title is taken.
+    """
+
+    importer = BoardImporter(owner, title, create_users, chunk_size, shared_users_only)
+    with transaction.atomic():
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            importer.line = number
+            try:
+                record = json.loads(line)
+            except ValueError:
+                raise importer.error('Invalid JSON.')
+            importer.add(record, number)
+        board = importer.finish()
+    return board, importer.counts
@@ -0,0 +1,188 @@
+import importlib
+import types
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.urls import URLResolver, clear_url_caches
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from core.exception_handler import custom_exception_handler
+
+
+def async_read_views_enabled():
+    """
+    Return True if read endpoints are served by their async views
+    (setting ASYNC_READ_VIEWS).
+    """
+
+    return getattr(settings, 'ASYNC_READ_VIEWS', False)
+
+
+def hybrid_view(drf_view_class, async_view_class):
+    """
+    Return the view function to route for an endpoint with an async variant.
+
+    With ASYNC_READ_VIEWS the async view serves JSON GET requests and hands
+    every other request to the DRF view; otherwise the DRF view is routed
+    directly, since under WSGI each async view needs its own event loop.
+
+    Args:
+        drf_view_class (APIView): The regular DRF view.
+        async_view_class (AsyncReadView): Its async read variant.
+    """
+
+    sync_view = drf_view_class.as_view()
+    if not async_read_views_enabled():
+        return sync_view
+    return async_view_class.as_view(sync_view=sync_view)
+
+
+def _included_urlconfs(patterns):
+    """
+    Yield the URLconf modules included by the patterns, innermost first.
+    """
+
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver) and isinstance(pattern.urlconf_name, types.ModuleType):
+            yield from _included_urlconfs(pattern.url_patterns)
+            yield pattern.urlconf_name
+
+
+@receiver(setting_changed)
+def reroute_hybrid_views(*, setting, **kwargs):
+    """
+    Route the hybrid endpoints again when ASYNC_READ_VIEWS changes (e.g.
+    with override_settings in tests), since `hybrid_view` picks the view
+    when the URLconf is imported.
+    """
+
+    if setting != 'ASYNC_READ_VIEWS':
+        return
+    root = importlib.import_module(settings.ROOT_URLCONF)
+    for module in _included_urlconfs(root.urlpatterns):
+        importlib.reload(module)
+    importlib.reload(root)
+    clear_url_caches()
+
+
+class JSONResponse(HttpResponse):
+    """
+    Response rendered with DRF's JSONRenderer, byte-identical to the
+    JSON output of a DRF Response.
+    """
+
+    def __init__(self, data, status=200, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(JSONRenderer().render(data), status=status, **kwargs)
+
+
+def as_json_response(response):
+    """
+    Convert an unrendered DRF Response (e.g. from an error helper) into a JSONResponse.
+    """
+
+    headers = {key: value for key, value in response.headers.items() if key.lower() != 'content-type'}
+    return JSONResponse(response.data, status=response.status_code, headers=headers)
+
+
+def accepts_json(request):
+    """
+    Return True if DRF's content negotiation would pick the JSON renderer,
+    i.e. the client is not asking for the browsable API.
+    """
+
+    requested_format = request.GET.get(api_settings.URL_FORMAT_OVERRIDE)
+    if requested_format:
+        return requested_format == 'json'
+    return 'text/html' not in request.headers.get('Accept', '')
+
+
+async def authenticate(request):
+    """
+    Authenticate a DRF Request with the configured authentication classes.
+
+    The classes are synchronous (token lookup, expiry and renewal, session
+    lookup), so they run in one `sync_to_async` call. The async views thus
+    authenticate exactly like the DRF views, and a change to the
+    authentication classes applies to both.
+
+    Returns:
+        CustomUser or AnonymousUser: The authenticated user.
+
+    Raises:
+        AuthenticationFailed: If the credentials sent are invalid.
+    """
+
+    return await sync_to_async(lambda: request.user)()
+
+
+class AsyncReadView(View):
+    """
+    Base class for natively async read endpoints.
+
+    GET requests accepting JSON are authenticated, permission-checked and
+    answered with the async ORM, so under ASGI a waiting request holds no
+    thread. Other methods and browsable-API requests are passed on to
+    `sync_view` (the regular DRF view), which keeps handling writes.
+
+    Subclasses implement `async def get(self, request, ...)`, where
+    `request` is a DRF Request (for `query_params` and the serializer
+    context) whose user is already set, and return an HttpResponse such as
+    JSONResponse. DRF exceptions raised there are turned into the same
+    error responses the DRF views produce.
+    """
+
+    sync_view = None
+    permission_classes = ()
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # CSRF is enforced by DRF's SessionAuthentication in the sync view;
+        # the async path only serves safe methods.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or not accepts_json(request):
+            return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+
+        drf_request = Request(request, authenticators=self.get_authenticators())
+        try:
+            await authenticate(drf_request)
+            self.check_permissions(drf_request)
+            return await self.get(drf_request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(exc, drf_request)
+
+    def get_authenticators(self):
+        return [authenticator() for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+
+    def check_permissions(self, request):
+        """
+        Run the permission classes; they must not query the database.
+        """
+
+        for permission_class in self.permission_classes:
+            if not permission_class().has_permission(request, self):
+                raise exceptions.PermissionDenied()
+
+    def handle_exception(self, exc, request):
+        """
+        Build the error response through the project's exception handler.
+        """
+
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            # Token authentication comes first, so 401 with its challenge.
+            exc.auth_header = 'Token'
+        response = custom_exception_handler(exc, {'view': self, 'request': request})
+        if response is None:
+            raise exc
+        return as_json_response(response)
@@ -0,0 +1,239 @@
+import asyncio
+import threading
+
+from django.conf import settings
+from rest_framework.response import Response
+
+
+# Result of a leader that was cancelled or interrupted (CancelledError,
+# KeyboardInterrupt, ...): its followers compute the result on their own.
+_ABANDONED = object()
+
+
+class _Call:
+    """
+    Book-keeping for one in-flight computation.
+
+    Holds the leader's result (or exception) and wakes up every follower,
+    both threads waiting on the event and coroutines waiting on a future.
+    """
+
+    def __init__(self, sequence):
+        self.sequence = sequence
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = []
+
+    def resolve(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.done.set()
+        for loop, future in self.waiters:
+            loop.call_soon_threadsafe(_settle_future, future, result, error)
+
+
+def _settle_future(future, result, error):
+    """
+    Complete an asyncio future unless the waiting coroutine already gave up.
+    """
+
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical computations into one.
+
+    The first caller for a key becomes the leader and runs the computation.
+    Callers arriving while the leader is still busy wait for its result
+    instead of repeating the work. Nothing is cached: once the leader is
+    done the key is released and the next caller starts a fresh computation.
+
+    Followers wait at most `timeout` seconds. If the leader has not finished
+    by then, they compute the result on their own so that a stuck leader
+    never blocks other requests. A leader that is cancelled (e.g. an async
+    request whose client disconnected) releases the key right away and its
+    followers compute the result themselves.
+
+    A caller that passes `arrived` (from `arrival()`, taken when its
+    request came in) only joins computations that started after that
+    point. An older computation may have read data from before a write the
+    caller already saw committed; such a caller starts a new computation,
+    which later callers join instead.
+
+    Works for threads (WSGI) via `do()` and for coroutines (ASGI) via `ado()`,
+    and both kinds of callers can share the same in-flight computation.
+    """
+
+    def __init__(self, timeout=None):
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._started = 0
+
+    @property
+    def timeout(self):
+        if self._timeout is not None:
+            return self._timeout
+        return getattr(settings, 'SINGLE_FLIGHT_TIMEOUT', 5.0)
+
+    def arrival(self):
+        """
+        Return a marker for the current point in time, to be passed as
+        `arrived` to `do()` / `ado()`.
+        """
+
+        with self._lock:
+            return self._started
+
+    def _join(self, key, arrived=None):
+        """
+        Return (call, is_leader) for the given key.
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and (arrived is None or call.sequence > arrived):
+                return call, False
+            # No computation, or one that started before the caller arrived:
+            # start a new one (the older one's release leaves it in place).
+            self._started += 1
+            call = _Call(self._started)
+            self._calls[key] = call
+            return call, True
+
+    def _release(self, key, call):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def do(self, key, fn, arrived=None):
+        """
+        Run `fn()` once for all concurrent callers using the same key.
+
+        Args:
+            key (hashable): Identifies the resource and its version.
+            fn (callable): Computes the shared result.
+            arrived (int): From `arrival()`; only join computations started
+                after it. None joins any running computation.
+
+        Returns:
+            The result of `fn()`, computed by this caller or by the leader.
+
+        Raises:
+            Exception: Whatever the leader's computation raised.
+        """
+
+        call, is_leader = self._join(key, arrived)
+        if is_leader:
+            return self._lead(key, call, fn)
+
+        if not call.done.wait(self.timeout) or call.result is _ABANDONED:
+            return fn()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def ado(self, key, fn, arrived=None):
+        """
+        Async variant of `do()`.
+
+        Args:
+            key (hashable): Identifies the resource and its version.
+            fn (callable): Coroutine function computing the shared result.
+            arrived (int): See `do()`.
+
+        Returns:
+            The result of `await fn()`, computed by this caller or by the leader.
+        """
+
+        call, is_leader = self._join(key, arrived)
+        if is_leader:
+            try:
+                result = await fn()
+            except Exception as e:
+                self._finish(key, call, error=e)
+                raise
+            except BaseException:
+                self._finish(key, call, result=_ABANDONED)
+                raise
+            self._finish(key, call, result=result)
+            return result
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if call.done.is_set():
+                _settle_future(future, call.result, call.error)
+            else:
+                call.waiters.append((loop, future))
+        try:
+            result = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            return await fn()
+        if result is _ABANDONED:
+            return await fn()
+        return result
+
+    def _lead(self, key, call, fn):
+        try:
+            result = fn()
+        except Exception as e:
+            self._finish(key, call, error=e)
+            raise
+        except BaseException:
+            self._finish(key, call, result=_ABANDONED)
+            raise
+        self._finish(key, call, result=result)
+        return result
+
+    def _finish(self, key, call, result=None, error=None):
+        self._release(key, call)
+        with self._lock:
+            call.resolve(result=result, error=error)
+
+
+class CoalescedRetrieveMixin:
+    """
+    Mixin for retrieve views whose response is the same for every caller.
+
+    Permission checks still run per request in `get_object()`. Only the
+    serialization of the instance is shared between concurrent identical
+    requests, keyed by `get_coalescing_key()`.
+
+    The key contains the instance's version, but the response may contain
+    related rows (e.g. a board's tasks) that the version does not cover.
+    So a request only joins a serialization that started after it arrived,
+    which cannot miss a write committed before that.
+    """
+
+    single_flight = None
+
+    def get_coalescing_key(self, instance):
+        """
+        Return the key identifying identical requests for this instance.
+
+        Defaults to the view, the primary key, the version (for versioned
+        models) and the query string, since query parameters may change the
+        shape of the response.
+        """
+
+        return (
+            type(self).__name__,
+            instance.pk,
+            getattr(instance, 'version', None),
+            self.request.query_params.urlencode(),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        arrived = self.single_flight.arrival()
+        instance = self.get_object()
+        key = self.get_coalescing_key(instance)
+        data = self.single_flight.do(key, lambda: self.get_serializer(instance).data, arrived)
+        return Response(data)
@@ -0,0 +1,57 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PreconditionFailed(APIException):
+    """
+    Raised when an `If-Match` version does not match the current version.
+    """
+
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The resource has been modified in the meantime. Reload it and try again."
+    default_code = 'precondition_failed'
+
+
+def etag_for(instance):
+    """
+    Return the ETag of a versioned instance, e.g. '"3"'.
+    """
+
+    return f'"{instance.version}"'
+
+
+def with_etag(response, instance):
+    """
+    Set the ETag header of the response to the instance's version.
+
+    Instances without a version column are left alone.
+    """
+
+    if hasattr(instance, 'version'):
+        response['ETag'] = etag_for(instance)
+    return response
+
+
+def if_match_version(request):
+    """
+    Return the version the client expects, taken from the `If-Match` header.
+
+    Returns:
+        int or None: The expected version, or None if the header is missing
+        or '*' (the update is then applied unconditionally).
+
+    Raises:
+        PreconditionFailed: If the header does not name a version; such a
+            tag can never match.
+    """
+
+    header = request.headers.get('If-Match', '').strip()
+    if not header or header == '*':
+        return None
+    tag = header.split(',')[0].strip()
+    if tag.startswith('W/'):
+        tag = tag[2:]
+    try:
+        return int(tag.strip('"'))
+    except ValueError:
+        raise PreconditionFailed()
@@ -0,0 +1,91 @@
+import functools
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+
+logger = logging.getLogger(__name__)
+
+LOCK_ERROR_MESSAGES = ('database is locked', 'database table is locked', 'database schema is locked')
+
+
+def is_lock_error(exc):
+    """
+    Return True if the exception is SQLite's "database is locked" error.
+    """
+
+    return isinstance(exc, OperationalError) and any(
+        message in str(exc).lower() for message in LOCK_ERROR_MESSAGES
+    )
+
+
+def backoff_delays(attempts=None, base_delay=None, max_delay=None):
+    """
+    Yield the sleep time before each retry: exponential backoff with full
+    jitter, so retrying writers do not wake up in lockstep.
+    """
+
+    attempts = attempts or getattr(settings, 'DB_LOCK_RETRY_ATTEMPTS', 5)
+    base_delay = base_delay if base_delay is not None else getattr(settings, 'DB_LOCK_RETRY_BASE_DELAY', 0.05)
+    max_delay = max_delay if max_delay is not None else getattr(settings, 'DB_LOCK_RETRY_MAX_DELAY', 1.0)
+    for attempt in range(attempts - 1):
+        yield random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def run_with_retry(fn, *args, using=DEFAULT_DB_ALIAS, attempts=None, **kwargs):
+    """
+    Run `fn` in a transaction and retry it if the database is locked.
+
+    Each attempt is its own `transaction.atomic()` block, so a failed
+    attempt is rolled back completely before the next one starts. Inside
+    an outer transaction a retry is impossible (the outer block is already
+    broken), so the error is raised right away.
+
+    Args:
+        fn (callable): The unit of work; called with *args and **kwargs.
+        using (str): The database alias.
+        attempts (int): Maximum number of attempts, defaults to the
+            DB_LOCK_RETRY_ATTEMPTS setting.
+
+    Returns:
+        The return value of `fn`.
+
+    Raises:
+        OperationalError: If the database is still locked after the last attempt.
+    """
+
+    nested = connections[using].in_atomic_block
+    delays = backoff_delays(attempts)
+    while True:
+        try:
+            with transaction.atomic(using=using):
+                return fn(*args, **kwargs)
+        except OperationalError as exc:
+            if nested or not is_lock_error(exc):
+                raise
+            delay = next(delays, None)
+            if delay is None:
+                raise
+            logger.info('Database locked, retrying %s in %.3fs', getattr(fn, '__name__', fn), delay)
+            time.sleep(delay)
+
+
+def retry_on_lock(fn=None, *, using=DEFAULT_DB_ALIAS, attempts=None):
+    """
+    Decorator form of `run_with_retry`.
+
+    Usage:
+        @retry_on_lock
+        def add_comment(...): ...
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return run_with_retry(func, *args, using=using, attempts=attempts, **kwargs)
+        return wrapper
+
+    return decorator(fn) if fn is not None else decorator
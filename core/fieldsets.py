@@ -0,0 +1,89 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def requested_fields(request):
+    """
+    Return the field names requested via `?fields=`.
+
+    Args:
+        request: The DRF request.
+
+    Returns:
+        set or None: The requested field names, or None if the parameter
+        is missing or empty (meaning: all fields).
+    """
+
+    if request is None:
+        return None
+    raw = request.query_params.get('fields', '')
+    fields = {name.strip() for name in raw.split(',') if name.strip()}
+    return fields or None
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that only emits the fields listed in context['fields'].
+
+    Write-only fields are kept so the serializer can still be used for input.
+    Unknown field names are ignored.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        if requested is None:
+            return fields
+        for name in list(fields):
+            if name not in requested and not fields[name].write_only:
+                fields.pop(name)
+        return fields
+
+
+def restrict_queryset(queryset, serializer, fields, extra_columns=()):
+    """
+    Push a sparse fieldset down into the query.
+
+    Loads only the columns backing the requested fields via `.only()` and
+    joins nested serializers (e.g. users) only if they were requested.
+    If a requested field cannot be mapped to a model column, the queryset
+    is returned unchanged.
+
+    Args:
+        queryset (QuerySet): The queryset to restrict.
+        serializer (Serializer): An unbound instance of the serializer used
+            for the response, created with the request's context.
+        fields (set or None): The requested field names.
+        extra_columns (iterable): Columns that must always be loaded,
+            e.g. foreign keys needed for prefetching.
+
+    Returns:
+        QuerySet: The restricted queryset.
+    """
+
+    if fields is None:
+        return queryset
+
+    opts = queryset.model._meta
+    columns = {opts.pk.name, *extra_columns}
+    related = []
+
+    for name, field in serializer.fields.items():
+        if name not in fields or field.write_only:
+            continue
+        source = field.source.split('.')[0]
+        try:
+            model_field = opts.get_field(source)
+        except FieldDoesNotExist:
+            return queryset
+        columns.add(model_field.name)
+
+        if isinstance(field, serializers.BaseSerializer):
+            related.append(model_field.name)
+            columns.update(
+                f'{model_field.name}__{child.source}' for child in field.fields.values()
+            )
+
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
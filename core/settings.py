@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
     'auth_app',
     'boards_app',
     'tasks_app',
+    'jobs_app',
 ]
 
 MIDDLEWARE = [
@@ -84,6 +86,60 @@ DATABASES = {
     }
 }
 
+# SQLite production profile, enabled with the environment variable
+# KANMIND_DB_PROFILE=production:
+# - WAL lets readers run while one connection writes; synchronous=NORMAL
+#   is durable across application crashes in WAL mode and avoids an fsync
+#   per commit.
+# - mmap_size / cache_size (negative = KiB) keep hot pages in memory.
+# - busy_timeout and 'timeout' make writers wait for the lock instead of
+#   failing with "database is locked"; IMMEDIATE transactions take the
+#   write lock up front, so a read-then-write transaction cannot fail
+#   halfway when upgrading its lock.
+# - Connections are reused across requests and health-checked before reuse.
+SQLITE_PRODUCTION_OPTIONS = {
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=268435456;'
+        'PRAGMA cache_size=-65536;'
+        'PRAGMA busy_timeout=5000;'
+    ),
+    'transaction_mode': 'IMMEDIATE',
+    'timeout': 5,
+}
+SQLITE_PRODUCTION_CONN_MAX_AGE = 600
+
+if os.environ.get('KANMIND_DB_PROFILE') == 'production':
+    DATABASES['default'].update({
+        'OPTIONS': SQLITE_PRODUCTION_OPTIONS,
+        'CONN_MAX_AGE': SQLITE_PRODUCTION_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+    })
+
+# Retry policy for transactions failing with "database is locked"
+# (see core.db.retry_on_lock): attempts and exponential backoff in seconds.
+DB_LOCK_RETRY_ATTEMPTS = 5
+DB_LOCK_RETRY_BASE_DELAY = 0.05
+DB_LOCK_RETRY_MAX_DELAY = 1.0
+
+# Optional write pipeline (core.write_pipeline): task, comment and
+# membership mutations are executed by one writer thread per process,
+# batched into shared transactions. Batch size, the seconds the writer
+# waits to fill a batch, and the seconds a request waits for its commit.
+WRITE_PIPELINE_ENABLED = os.environ.get('KANMIND_WRITE_PIPELINE') == '1'
+WRITE_PIPELINE_MAX_BATCH = 64
+WRITE_PIPELINE_MAX_WAIT = 0.002
+WRITE_PIPELINE_TIMEOUT = 10.0
+
+# Password hashing pool (auth_app.hashing): hashes running at the same time
+# during login and registration (0 = hash on the request thread), hashes
+# allowed to wait for a worker, and the Retry-After seconds of the 503 sent
+# when both are exhausted.
+PASSWORD_HASHING_WORKERS = 2
+PASSWORD_HASHING_QUEUE = 8
+PASSWORD_HASHING_RETRY_AFTER = 1
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -128,16 +184,78 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'auth_app.authentication.ExpiringTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'EXCEPTION_HANDLER': 'core.exception_handler.custom_exception_handler'
-  
+    'EXCEPTION_HANDLER': 'core.exception_handler.custom_exception_handler',
+    # Sliding-window limits of core.throttling, per view scope and key.
+    'DEFAULT_THROTTLE_RATES': {
+        'login-ip': '30/min',
+        'login-email': '10/min',
+        'registration-ip': '10/hour',
+        'registration-email': '5/hour',
+    },
 }
 
+# Auth tokens expire AUTH_TOKEN_TTL seconds after their last renewal; a
+# used token is renewed at most once per AUTH_TOKEN_RENEW_INTERVAL seconds.
+# Expired tokens are deleted by `manage.py purge_expired_tokens`.
+AUTH_TOKEN_TTL = 7 * 24 * 3600
+AUTH_TOKEN_RENEW_INTERVAL = 3600
+
+# Throttle counters: LocalThrottleBackend keeps them per process,
+# CacheThrottleBackend shares them between processes through the cache
+# THROTTLE_CACHE_ALIAS (use memcached or Redis for that).
+THROTTLE_BACKEND = 'core.throttling.LocalThrottleBackend'
+THROTTLE_CACHE_ALIAS = 'default'
+
+
+# Seconds a coalesced read waits for the in-flight computation of an
+# identical request before computing the result on its own.
+SINGLE_FLIGHT_TIMEOUT = 5.0
+
+# Read endpoints (by URL name) served by the serializer-free fast path
+# in tasks_app.api.projections. Remove a name to fall back to the serializers.
+FAST_READ_ENDPOINTS = ['assigned-to-me', 'task-reviewing', 'board-detail', 'board-tasks']
+
+# Rows fetched and encoded per step by the streaming JSON list responses.
+# Only the DRF views stream; the async read views (ASYNC_READ_VIEWS) load
+# the whole list and send it as one body.
+STREAMING_CHUNK_SIZE = 500
+
+# User autocomplete suggests users without a shared board only from this
+# many typed characters on, so short prefixes cannot list all users.
+USER_AUTOCOMPLETE_MIN_PREFIX = 4
+
+# Serve the board list, board detail, assigned-to-me, reviewing and e-mail
+# check reads with async views (core.async_views). Only useful under ASGI
+# (core.asgi); under WSGI every async request needs its own event loop.
+ASYNC_READ_VIEWS = os.environ.get('KANMIND_ASYNC_VIEWS') == '1'
+
+# Deleted boards are hidden at once and purged by a background job in
+# chunks of BOARD_PURGE_CHUNK_SIZE rows, pausing BOARD_PURGE_CHUNK_PAUSE
+# seconds between chunks.
+BOARD_PURGE_CHUNK_SIZE = 500
+BOARD_PURGE_CHUNK_PAUSE = 0.05
+
+# Tasks read per query by the NDJSON board export and rows written per
+# bulk_create by the import (boards_app.transfer).
+BOARD_TRANSFER_CHUNK_SIZE = 500
+
+# Background jobs (jobs_app), run by `manage.py run_worker`: threads per
+# worker, seconds an idle thread waits before polling again, seconds a
+# claim stays valid without a heartbeat, and the exponential retry
+# backoff (base and maximum, in seconds).
+JOB_WORKER_THREADS = 2
+JOB_POLL_INTERVAL = 1.0
+JOB_LEASE_SECONDS = 300
+JOB_RETRY_BASE_DELAY = 10
+JOB_RETRY_MAX_DELAY = 3600
+
 
 AUTH_USER_MODEL = 'auth_app.CustomUser'
-AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend']
\ No newline at end of file
+# Password checks hash in the bounded pool of auth_app.hashing.
+AUTHENTICATION_BACKENDS = ['auth_app.backends.HashingPoolBackend']
\ No newline at end of file
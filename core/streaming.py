@@ -0,0 +1,136 @@
+import logging
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+
+logger = logging.getLogger(__name__)
+
+def stream_chunk_size():
+    """
+    Return the number of rows fetched and serialized per streaming step.
+    """
+
+    return getattr(settings, 'STREAMING_CHUNK_SIZE', 500)
+
+
+def wants_streaming(request):
+    """
+    Return True if the response may be streamed as plain JSON.
+
+    Streaming bypasses DRF's rendering, so it is only used when DRF picked
+    the JSON renderer anyway (not for the browsable API).
+    """
+
+    renderer = getattr(request, 'accepted_renderer', None)
+    return renderer is not None and renderer.format == 'json'
+
+
+def chunked(iterable, size):
+    """
+    Yield lists of at most `size` items from the iterable.
+    """
+
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_json_array(chunks):
+    """
+    Encode chunks of items as one JSON array, chunk by chunk.
+
+    The output is byte-identical to rendering the whole list at once with
+    DRF's JSONRenderer, but only one chunk is held in memory at a time.
+    The opening bracket is sent with the first chunk, so the first part
+    is only produced once the first chunk was fetched (see
+    StreamingJSONResponse).
+
+    Args:
+        chunks (iterable): Lists of JSON-serializable items.
+
+    Yields:
+        bytes: Parts of the JSON array.
+    """
+
+    renderer = JSONRenderer()
+    separator = b'['
+    for chunk in chunks:
+        if not chunk:
+            continue
+        yield separator + b','.join(renderer.render(item) for item in chunk)
+        separator = b','
+    yield b'[]' if separator == b'[' else b']'
+
+
+def iter_ndjson(records, batch_size=1):
+    """
+    Encode records as newline-delimited JSON, one line per record.
+
+    Args:
+        records (iterable): JSON-serializable records.
+        batch_size (int): Records encoded into each yielded part.
+
+    Yields:
+        bytes: The lines of `batch_size` records (one JSON document
+        followed by a newline each).
+    """
+
+    renderer = JSONRenderer()
+    for batch in chunked(records, batch_size):
+        yield b''.join(renderer.render(record) + b'\n' for record in batch)
+
+
+def iter_serialized(queryset, serializer_class, context=None, chunk_size=None):
+    """
+    Iterate a queryset in chunks and serialize each chunk.
+
+    Uses `.iterator(chunk_size=...)`, so rows are fetched from the database
+    in batches instead of being cached on the queryset.
+
+    Yields:
+        list: Serialized items of one chunk.
+    """
+
+    chunk_size = chunk_size or stream_chunk_size()
+    for chunk in chunked(queryset.iterator(chunk_size=chunk_size), chunk_size):
+        yield serializer_class(chunk, many=True, context=context or {}).data
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """
+    Streaming response for JSON produced incrementally, e.g. by
+    `iter_json_array` or `iter_ndjson`.
+
+    The first part of the content is produced when the response is
+    created, inside the view. A query or serialization error in the first
+    chunk therefore still raises in the view and is answered with a proper
+    error status instead of a 200 with a broken body.
+
+    Once the status is sent, an error can no longer change it: it is
+    logged and re-raised, so the server aborts the connection and the
+    client sees an incomplete transfer rather than a cleanly ended, but
+    truncated, document.
+    """
+
+    def __init__(self, streaming_content, status=200, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        parts = iter(streaming_content)
+        first = next(parts, None)
+        super().__init__(self._stream(first, parts), status=status, **kwargs)
+
+    @staticmethod
+    def _stream(first, parts):
+        if first is None:
+            return
+        yield first
+        try:
+            yield from parts
+        except Exception:
+            logger.exception('Streaming response failed after its first part; aborting it')
+            raise
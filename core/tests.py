@@ -0,0 +1,564 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.db import OperationalError, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from auth_app.models import CustomUser
+from boards_app.models import Board
+from core.async_views import AsyncReadView
+from core.coalescing import SingleFlight
+from core.throttling import CacheThrottleBackend, LocalThrottleBackend, parse_rate
+from core.db import retry_on_lock, run_with_retry
+from core.write_pipeline import WritePipeline, run_write
+from tasks_app.models import Task
+
+
+class SingleFlightTests(SimpleTestCase):
+    """
+    Coalescing of concurrent identical computations (core.coalescing).
+    """
+
+    def setUp(self):
+        self.flight = SingleFlight(timeout=5)
+        self.pool = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(self.pool.shutdown)
+
+    def start_leader(self, result=None, error=None, key='key'):
+        """
+        Start a leader in a thread that blocks until `release` is set.
+        """
+
+        started, release = threading.Event(), threading.Event()
+
+        def compute():
+            started.set()
+            release.wait(5)
+            if error is not None:
+                raise error
+            return result
+
+        future = self.pool.submit(self.flight.do, key, compute)
+        self.assertTrue(started.wait(5))
+        return future, release
+
+    def start_follower(self, fn, key='key', **kwargs):
+        future = self.pool.submit(self.flight.do, key, fn, **kwargs)
+        # Give the follower time to find and wait on the leader's call.
+        time.sleep(0.05)
+        return future
+
+    def own(self, calls, result='own'):
+        def compute():
+            calls.append(result)
+            return result
+        return compute
+
+    def test_follower_shares_the_leaders_result(self):
+        leader, release = self.start_leader(result='shared')
+        calls = []
+        follower = self.start_follower(self.own(calls))
+        release.set()
+        self.assertEqual((leader.result(5), follower.result(5)), ('shared', 'shared'))
+        self.assertEqual(calls, [])
+        self.assertEqual(self.flight._calls, {})
+
+    def test_leader_exception_reaches_followers(self):
+        leader, release = self.start_leader(error=ValueError('boom'))
+        follower = self.start_follower(self.own([]))
+        release.set()
+        for future in (leader, follower):
+            with self.assertRaisesMessage(ValueError, 'boom'):
+                future.result(5)
+
+    def test_follower_computes_itself_after_timeout(self):
+        self.flight = SingleFlight(timeout=0.05)
+        leader, release = self.start_leader(result='slow')
+        calls = []
+        self.assertEqual(self.flight.do('key', self.own(calls)), 'own')
+        self.assertEqual(calls, ['own'])
+        release.set()
+        self.assertEqual(leader.result(5), 'slow')
+
+    def test_other_keys_do_not_wait(self):
+        leader, release = self.start_leader(result='a', key='a')
+        self.assertEqual(self.flight.do('b', lambda: 'b'), 'b')
+        release.set()
+        leader.result(5)
+
+    def test_late_arrival_does_not_join_an_older_computation(self):
+        arrived_before = self.flight.arrival()
+        leader, release = self.start_leader(result='old')
+        arrived_after = self.flight.arrival()
+
+        # Arrived before the leader started: may share its result.
+        early = self.start_follower(self.own([]), arrived=arrived_before)
+        # Arrived after: starts its own computation, which later callers join.
+        started, finish = threading.Event(), threading.Event()
+
+        def fresh():
+            started.set()
+            finish.wait(5)
+            return 'fresh'
+
+        late = self.pool.submit(self.flight.do, 'key', fresh, arrived_after)
+        self.assertTrue(started.wait(5))
+        later = self.start_follower(self.own([]), arrived=arrived_after)
+
+        release.set()
+        finish.set()
+        self.assertEqual([f.result(5) for f in (leader, early, late, later)], ['old', 'old', 'fresh', 'fresh'])
+        self.assertEqual(self.flight._calls, {})
+
+    def test_cancelled_async_leader_releases_the_key(self):
+        async def scenario():
+            started = asyncio.Event()
+
+            async def hang():
+                started.set()
+                await asyncio.sleep(10)
+
+            leader = asyncio.create_task(self.flight.ado('key', hang))
+            await started.wait()
+
+            async def own():
+                return 'own'
+
+            follower = asyncio.create_task(self.flight.ado('key', own))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            self.assertEqual(self.flight._calls, {})
+            # The waiting follower computes on its own instead of failing.
+            self.assertEqual(await asyncio.wait_for(follower, 1), 'own')
+
+        asyncio.run(scenario())
+
+    def test_thread_follower_of_cancelled_async_leader_computes_itself(self):
+        started, cancel = threading.Event(), threading.Event()
+
+        def run_leader():
+            async def scenario():
+                async def hang():
+                    started.set()
+                    await asyncio.sleep(10)
+
+                task = asyncio.create_task(self.flight.ado('key', hang))
+                await asyncio.get_running_loop().run_in_executor(None, cancel.wait, 5)
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+            asyncio.run(scenario())
+
+        leader = self.pool.submit(run_leader)
+        self.assertTrue(started.wait(5))
+        calls = []
+        follower = self.start_follower(self.own(calls))
+        cancel.set()
+        self.assertEqual(follower.result(5), 'own')
+        leader.result(5)
+        self.assertEqual(calls, ['own'])
+        self.assertEqual(self.flight._calls, {})
+
+
+@override_settings(DB_LOCK_RETRY_ATTEMPTS=5, DB_LOCK_RETRY_BASE_DELAY=0.1, DB_LOCK_RETRY_MAX_DELAY=0.25)
+class LockRetryTests(TransactionTestCase):
+    """
+    run_with_retry and retry_on_lock (core.db). A TransactionTestCase, since
+    a TestCase runs each test in a transaction, where nothing is retried.
+    """
+
+    def setUp(self):
+        # The upper bound of the jitter, so the delays are predictable.
+        patchers = [
+            mock.patch('core.db.random.uniform', lambda low, high: high),
+            mock.patch('core.db.time.sleep'),
+        ]
+        self.sleep = [patcher.start() for patcher in patchers][1]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+        self.owner = CustomUser.objects.create_user(email='owner@example.com', password=None, fullname='Owner')
+
+    def failing(self, errors, result='done'):
+        """
+        Return a unit of work that creates a board, then raises the next
+        error, until the errors run out.
+        """
+
+        calls = []
+
+        def work():
+            calls.append(Board.objects.create(title=f'Attempt {len(calls)}', owner=self.owner))
+            if len(calls) <= len(errors):
+                raise errors[len(calls) - 1]
+            return result
+
+        return work, calls
+
+    def delays(self):
+        return [call.args[0] for call in self.sleep.call_args_list]
+
+    def test_lock_errors_are_retried_with_capped_backoff(self):
+        work, calls = self.failing([OperationalError('database is locked')] * 4)
+        self.assertEqual(run_with_retry(work), 'done')
+        self.assertEqual(len(calls), 5)
+        self.assertEqual(self.delays(), [0.1, 0.2, 0.25, 0.25])
+        # Failed attempts were rolled back.
+        self.assertEqual(list(Board.objects.values_list('title', flat=True)), ['Attempt 4'])
+
+    def test_gives_up_after_the_last_attempt(self):
+        work, calls = self.failing([OperationalError('database table is locked')] * 3)
+        with self.assertRaisesMessage(OperationalError, 'locked'):
+            run_with_retry(work, attempts=3)
+        self.assertEqual((len(calls), len(self.delays())), (3, 2))
+        self.assertFalse(Board.objects.exists())
+
+    def test_other_errors_are_raised_at_once(self):
+        for error in (OperationalError('no such table: boards_app_board'), ValueError('boom')):
+            with self.subTest(error):
+                work, calls = self.failing([error])
+                with self.assertRaises(type(error)):
+                    run_with_retry(work)
+                self.assertEqual(len(calls), 1)
+        self.assertEqual(self.delays(), [])
+
+    def test_no_retry_inside_an_open_transaction(self):
+        work, calls = self.failing([OperationalError('database is locked')])
+        with self.assertRaisesMessage(OperationalError, 'locked'):
+            with transaction.atomic():
+                run_with_retry(work)
+        self.assertEqual((len(calls), self.delays()), (1, []))
+
+    def test_decorator_with_and_without_arguments(self):
+        work, calls = self.failing([OperationalError('database is locked')] * 2)
+
+        @retry_on_lock
+        def plain():
+            return work()
+
+        self.assertEqual(plain(), 'done')
+        self.assertEqual(plain.__name__, 'plain')
+
+        work, calls = self.failing([OperationalError('database is locked')] * 2)
+        with self.assertRaises(OperationalError):
+            retry_on_lock(attempts=2)(work)()
+        self.assertEqual(len(calls), 2)
+
+
+class WritePipelineTests(TransactionTestCase):
+    """
+    Batched mutations of the single writer thread (core.write_pipeline).
+    """
+
+    def setUp(self):
+        self.pipeline = WritePipeline(max_batch=8, max_wait=0.05)
+        self.addCleanup(self.pipeline.stop)
+        patcher = mock.patch('core.db.time.sleep')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.batches = []
+        execute = self.pipeline._execute
+
+        def record(batch):
+            self.batches.append(len(batch))
+            return execute(batch)
+
+        self.pipeline._execute = record
+
+    def hold_writer(self):
+        """
+        Occupy the writer thread until the returned event is set, so the
+        following mutations are queued into one batch.
+        """
+
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        future = self.pipeline.submit(block)
+        self.assertTrue(started.wait(5))
+        self.addCleanup(release.set)
+        return future, release
+
+    def create_user(self, name, error=None):
+        CustomUser.objects.create_user(email=f'{name}@example.com', password=None, fullname=name)
+        if error is not None:
+            raise error
+        return name
+
+    def emails(self):
+        return sorted(CustomUser.objects.values_list('email', flat=True))
+
+    def test_queued_mutations_share_one_transaction(self):
+        blocker, release = self.hold_writer()
+        futures = [self.pipeline.submit(self.create_user, name) for name in ('a', 'b', 'c')]
+        release.set()
+        self.assertEqual([future.result(5) for future in futures], ['a', 'b', 'c'])
+        self.assertEqual(self.batches, [1, 3])
+        self.assertEqual(self.emails(), ['a@example.com', 'b@example.com', 'c@example.com'])
+
+    def test_failed_mutation_is_rolled_back_alone(self):
+        blocker, release = self.hold_writer()
+        futures = [
+            self.pipeline.submit(self.create_user, 'a'),
+            self.pipeline.submit(self.create_user, 'b', ValueError('invalid')),
+            self.pipeline.submit(self.create_user, 'c'),
+        ]
+        release.set()
+        self.assertEqual(futures[0].result(5), 'a')
+        with self.assertRaisesMessage(ValueError, 'invalid'):
+            futures[1].result(5)
+        self.assertEqual(futures[2].result(5), 'c')
+        self.assertEqual(self.batches, [1, 3])
+        self.assertEqual(self.emails(), ['a@example.com', 'c@example.com'])
+
+    def test_locked_batch_is_retried_as_a_whole(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(CustomUser.objects.count())
+            if len(attempts) == 1:
+                raise OperationalError('database is locked')
+            return 'flaky'
+
+        blocker, release = self.hold_writer()
+        futures = [self.pipeline.submit(self.create_user, 'a'), self.pipeline.submit(flaky)]
+        release.set()
+        self.assertEqual([future.result(5) for future in futures], ['a', 'flaky'])
+        self.assertEqual(self.batches, [1, 2, 2])
+        # The second attempt started over: 'a' was rolled back and created again.
+        self.assertEqual(attempts, [1, 1])
+        self.assertEqual(self.emails(), ['a@example.com'])
+
+    def test_timed_out_queued_mutation_never_runs(self):
+        blocker, release = self.hold_writer()
+        with self.assertRaises(TimeoutError):
+            self.pipeline.run(self.create_user, 'late', timeout=0.05)
+        release.set()
+        blocker.result(5)
+        self.assertEqual(self.pipeline.run(self.create_user, 'next', timeout=5), 'next')
+        self.assertEqual(self.emails(), ['next@example.com'])
+
+    def test_timed_out_running_mutation_may_still_commit(self):
+        started, release = threading.Event(), threading.Event()
+        self.addCleanup(release.set)
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return self.create_user('slow')
+
+        with self.assertRaises(TimeoutError), self.assertLogs('core.write_pipeline', 'WARNING'):
+            self.pipeline.run(slow, timeout=1)
+        self.assertTrue(started.is_set())
+        release.set()
+        self.pipeline.stop()
+        self.assertEqual(self.emails(), ['slow@example.com'])
+
+    def test_mutation_submitting_another_runs_it_inline(self):
+        def outer():
+            return self.pipeline.run(self.create_user, 'inner', timeout=0.05)
+
+        self.assertEqual(self.pipeline.run(outer, timeout=5), 'inner')
+        self.assertEqual(self.batches, [1])
+        self.assertEqual(self.emails(), ['inner@example.com'])
+
+    def test_run_write_uses_the_pipeline_only_if_enabled(self):
+        with mock.patch('core.write_pipeline.get_write_pipeline', return_value=self.pipeline):
+            with override_settings(WRITE_PIPELINE_ENABLED=True):
+                self.assertEqual(run_write(self.create_user, 'queued'), 'queued')
+            self.assertEqual(self.batches, [1])
+            with override_settings(WRITE_PIPELINE_ENABLED=False):
+                self.assertEqual(run_write(self.create_user, 'direct'), 'direct')
+            self.assertEqual(self.batches, [1])
+        self.assertEqual(self.emails(), ['direct@example.com', 'queued@example.com'])
+
+
+@override_settings(ASYNC_READ_VIEWS=True)
+class AsyncReadViewTests(TestCase):
+    """
+    With ASYNC_READ_VIEWS the async read views (core.async_views) answer
+    like the DRF views they stand in for.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        def user(email):
+            return CustomUser.objects.create_user(email=email, password=None, fullname=email.split('@')[0])
+
+        cls.user = user('user@example.com')
+        cls.member = user('member@example.com')
+        cls.stranger = user('stranger@example.com')
+        cls.board = Board.objects.create(title='Board', owner=cls.user, member_count=2)
+        cls.board.members.add(cls.user, cls.member)
+        Task.objects.bulk_create([
+            Task(
+                board=cls.board, title=f'Task {i} – "ä"', status='to-do', priority='high',
+                assignee=cls.user if i % 2 else cls.member, reviewer=None if i % 3 else cls.user,
+                due_date=None if i % 4 else '2025-06-01',
+            )
+            for i in range(6)
+        ])
+
+    def setUp(self):
+        self.client = self.client_for(self.user)
+        # validate_email would look up the domain's DNS records.
+        for module in ('boards_app.api.views', 'boards_app.api.async_views'):
+            patcher = mock.patch(f'{module}.validate_email')
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def client_for(self, user=None, token=None):
+        client = APIClient()
+        if user is not None:
+            token = Token.objects.get_or_create(user=user)[0].key
+        if token is not None:
+            client.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+        return client
+
+    def get_both(self, url, client=None, **params):
+        """
+        GET the URL from the async view and from the DRF view.
+        """
+
+        client = client or self.client
+        served = client.get(url, params)
+        # resolver_match is resolved lazily, so while the routing is current.
+        self.assertTrue(issubclass(served.resolver_match.func.view_class, AsyncReadView))
+        with override_settings(ASYNC_READ_VIEWS=False):
+            drf = client.get(url, params)
+            self.assertFalse(issubclass(drf.resolver_match.func.view_class, AsyncReadView))
+        return served, drf
+
+    def assertSameResponse(self, url, client=None, **params):
+        served, drf = self.get_both(url, client, **params)
+        self.assertEqual(served.status_code, drf.status_code)
+        self.assertEqual(served['Content-Type'], drf['Content-Type'])
+        self.assertEqual(served.getvalue(), drf.getvalue())
+        self.assertFalse(served.streaming)
+        return served
+
+    def test_json_matches_the_drf_views(self):
+        board_url = f'/api/boards/{self.board.pk}/'
+        for url, params in [
+            ('/api/boards/', {}),
+            ('/api/boards/', {'fields': 'id,title,version'}),
+            (board_url, {}),
+            (board_url, {'include': 'users'}),
+            (board_url, {'fields': 'id,title,assignee'}),
+            ('/api/tasks/assigned-to-me/', {}),
+            ('/api/tasks/assigned-to-me/', {'include': 'users'}),
+            ('/api/tasks/assigned-to-me/', {'fields': 'id,title,reviewer'}),
+            ('/api/tasks/reviewing/', {}),
+            ('/api/email-check/', {'email': 'MEMBER@example.com'}),
+        ]:
+            with self.subTest(url, **params):
+                self.assertEqual(self.assertSameResponse(url, **params).status_code, 200)
+
+    def test_empty_task_list_detail_matches(self):
+        response = self.assertSameResponse('/api/tasks/reviewing/', self.client_for(self.member))
+        self.assertEqual(response.json(), {'detail': 'No tasks under review.'})
+
+    def test_errors_go_through_the_shared_exception_handler(self):
+        board_url = f'/api/boards/{self.board.pk}/'
+        for url, client, status in [
+            (board_url, APIClient(), 401),
+            (board_url, self.client_for(token='invalid'), 401),
+            ('/api/tasks/assigned-to-me/', APIClient(), 401),
+            (board_url, self.client_for(self.stranger), 403),
+            ('/api/boards/999999/', self.client, 404),
+            ('/api/email-check/', self.client, 400),
+        ]:
+            with self.subTest(url, status=status):
+                served, drf = self.get_both(url, client)
+                self.assertEqual((served.status_code, drf.status_code), (status, status))
+                self.assertEqual(served.json(), drf.json())
+                self.assertEqual(served.get('WWW-Authenticate'), drf.get('WWW-Authenticate'))
+
+    def test_writes_and_browsable_api_are_handed_to_the_drf_view(self):
+        with mock.patch('core.async_views.authenticate', side_effect=AssertionError('async path used')):
+            response = self.client.post('/api/boards/', {'title': 'New', 'members': []}, format='json')
+            self.assertEqual(response.status_code, 201)
+            response = self.client.patch(f'/api/boards/{self.board.pk}/', {'title': 'Renamed'}, format='json')
+            self.assertEqual((response.status_code, response['ETag']), (200, '"2"'))
+            for params, headers in [({}, {'Accept': 'text/html'}), ({'format': 'api'}, {})]:
+                with self.subTest(**params, **headers):
+                    response = self.client.get('/api/tasks/assigned-to-me/', params, headers=headers)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertTrue(response['Content-Type'].startswith('text/html'))
+
+
+class ThrottleBackendTests(SimpleTestCase):
+    """
+    Sliding windows of the throttle backends (core.throttling), with an
+    explicit clock.
+    """
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('5/min'), (5, 60))
+        self.assertEqual(parse_rate('100/hour'), (100, 3600))
+        self.assertEqual(parse_rate('2/s'), (2, 1))
+        self.assertEqual(parse_rate(None), (None, None))
+
+    def test_local_window_slides(self):
+        backend = LocalThrottleBackend()
+        self.assertEqual([backend.hit('key', 3, 10, now=t) for t in (0, 1, 2)], [(True, 0)] * 3)
+        self.assertEqual(backend.hit('key', 3, 10, now=3), (False, 7))
+        # A rejected request is not counted: the first one slides out at 10.
+        self.assertEqual(backend.hit('key', 3, 10, now=10), (True, 0))
+        self.assertEqual(backend.hit('key', 3, 10, now=10.5), (False, 0.5))
+        self.assertEqual(backend.hit('other', 3, 10, now=10.5), (True, 0))
+
+    def test_local_rate_change_keeps_the_newest_requests(self):
+        backend = LocalThrottleBackend()
+        for t in (0, 1, 2):
+            backend.hit('key', 3, 10, now=t)
+        self.assertEqual(backend.hit('key', 2, 10, now=3), (False, 8))
+        self.assertEqual(backend.hit('key', 4, 10, now=3), (True, 0))
+
+    def test_local_idle_keys_are_swept(self):
+        backend = LocalThrottleBackend()
+        backend.sweep_interval = 2
+        backend.hit('idle', 1, 10, now=0)
+        backend.hit('busy', 1, 10, now=9)
+        self.assertEqual(set(backend._logs), {'idle', 'busy'})
+        backend.hit('busy', 1, 10, now=10)
+        backend.hit('busy', 1, 10, now=19)
+        self.assertEqual(set(backend._logs), {'busy'})
+
+    def cache_backend(self):
+        backend = CacheThrottleBackend()
+        backend.cache.clear()
+        self.addCleanup(backend.cache.clear)
+        return backend
+
+    def test_cache_window_weights_the_previous_window(self):
+        backend = self.cache_backend()
+        # Four requests fill the window [100, 110).
+        self.assertEqual([backend.hit('key', 4, 10, now=t)[0] for t in (100, 101, 102, 103)], [True] * 4)
+        self.assertEqual(backend.hit('key', 4, 10, now=104), (False, 6))
+        # At 111 the previous window still counts 90%: 3.6 < 4.
+        self.assertEqual(backend.hit('key', 4, 10, now=111), (True, 0))
+        # At 111.5: 4 * 0.85 + 1 >= 4, admitted again once 75% of it slid out.
+        allowed, wait = backend.hit('key', 4, 10, now=111.5)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 1.0)
+        self.assertTrue(backend.hit('key', 4, 10, now=112.6)[0])
+        self.assertTrue(backend.hit('other', 4, 10, now=112.6)[0])
+
+    def test_cache_counters_are_shared_between_backends(self):
+        first, second = self.cache_backend(), CacheThrottleBackend()
+        self.assertTrue(first.hit('key', 2, 10, now=100)[0])
+        self.assertTrue(second.hit('key', 2, 10, now=101)[0])
+        self.assertEqual(first.hit('key', 2, 10, now=102), (False, 8))
@@ -0,0 +1,245 @@
+import logging
+import math
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """
+    Parse a DRF-style rate such as '5/min' or '100/hour'.
+
+    Returns:
+        tuple: (number of requests, period in seconds), or (None, None)
+        if the rate is None (not throttled).
+    """
+
+    if rate is None:
+        return None, None
+    num, period = rate.split('/')
+    return int(num), PERIODS[period[0]]
+
+
+class LocalThrottleBackend:
+    """
+    In-process sliding-window log without locks.
+
+    Each key keeps the timestamps of its last `limit` admitted requests in
+    a `deque(maxlen=limit)`; appending to it and reading its oldest entry
+    are atomic in CPython, so concurrent checks need no lock. Under a
+    burst of truly simultaneous requests a few more than `limit` may slip
+    through, which is acceptable for throttling. Counters live per process.
+
+    Keys idle for longer than the longest period seen are swept every
+    `sweep_interval` checks.
+    """
+
+    sweep_interval = 1000
+
+    def __init__(self):
+        self._logs = {}
+        self._checks = 0
+        self._max_period = 0
+
+    def hit(self, key, limit, period, now=None):
+        """
+        Count a request for `key` if fewer than `limit` were admitted in
+        the last `period` seconds.
+
+        Returns:
+            tuple: (allowed, seconds until the next request is admitted).
+        """
+
+        now = time.time() if now is None else now
+        self._max_period = max(self._max_period, period)
+        self._checks += 1
+        if self._checks % self.sweep_interval == 0:
+            # Before looking up the log, so a new key's log is not swept
+            # away while still empty.
+            self._sweep(now)
+
+        log = self._logs.get(key)
+        if log is None:
+            log = self._logs.setdefault(key, deque(maxlen=limit))
+        elif log.maxlen != limit:
+            # The rate was changed.
+            log = self._logs[key] = deque(log, maxlen=limit)
+
+        if len(log) >= limit:
+            try:
+                oldest = log[0]
+            except IndexError:
+                oldest = now - period
+            if now - oldest < period:
+                return False, oldest + period - now
+        log.append(now)
+        return True, 0
+
+    def _sweep(self, now):
+        for key in list(self._logs):
+            log = self._logs.get(key)
+            if log is not None and (not log or now - log[-1] >= self._max_period):
+                self._logs.pop(key, None)
+
+
+class CacheThrottleBackend:
+    """
+    Sliding-window counter in a Django cache shared by all processes.
+
+    Uses two fixed-window counters per key (current and previous window)
+    and weights the previous one by the part of it still inside the
+    sliding window, so each check is one `get_many` and, if admitted, one
+    `add` and `incr` (atomic on memcached and Redis).
+
+    Args:
+        alias (str): The cache alias, defaults to the THROTTLE_CACHE_ALIAS
+            setting or 'default'.
+    """
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+
+    def hit(self, key, limit, period, now=None):
+        """
+        Count a request for `key` if the estimated number of requests in
+        the last `period` seconds is below `limit`.
+
+        Returns:
+            tuple: (allowed, seconds until the next request is admitted).
+        """
+
+        now = time.time() if now is None else now
+        window = int(now // period)
+        current_key = f'throttle:{key}:{window}'
+        previous_key = f'throttle:{key}:{window - 1}'
+        counts = self.cache.get_many([current_key, previous_key])
+        current = counts.get(current_key, 0)
+        previous = counts.get(previous_key, 0)
+        elapsed = (now - window * period) / period
+
+        if previous * (1 - elapsed) + current >= limit:
+            if current >= limit or not previous:
+                return False, (window + 1) * period - now
+            # Wait until enough of the previous window has slid out.
+            needed = 1 - (limit - current) / previous
+            return False, max((needed - elapsed) * period, 0)
+
+        self.cache.add(current_key, 0, timeout=2 * period)
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            # Expired between add and incr.
+            self.cache.set(current_key, 1, timeout=2 * period)
+        return True, 0
+
+
+_backend = None
+_backend_lock = threading.Lock()
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def get_throttle_backend():
+    """
+    Return the process-wide throttle backend (setting THROTTLE_BACKEND).
+    """
+
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            path = getattr(settings, 'THROTTLE_BACKEND', 'core.throttling.LocalThrottleBackend')
+            _backend = import_string(path)()
+        return _backend
+
+
+def record_throttle_outcome(scope, outcome):
+    with _metrics_lock:
+        _metrics[(scope, outcome)] += 1
+
+
+def throttle_metrics():
+    """
+    Return the admitted and throttled request counts per scope in this
+    process, e.g. {('login-ip', 'admitted'): 12, ('login-ip', 'throttled'): 3}.
+    """
+
+    with _metrics_lock:
+        return dict(_metrics)
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Throttle with a sliding window, keyed by `get_key()`.
+
+    The scope is the view's `throttle_scope` plus the class's
+    `scope_suffix` (e.g. 'login' + '-ip'); its rate is taken from
+    REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']. DRF checks throttles before
+    the handler runs, so a rejected request costs no password hashing and
+    no database query. Rejections are answered with 429 and Retry-After.
+    """
+
+    scope_suffix = None
+
+    def get_key(self, request, view):
+        """
+        Return the value to count requests by, or None to not throttle.
+        """
+
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        scope = f'{getattr(view, "throttle_scope", None)}{self.scope_suffix}'
+        limit, period = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(scope))
+        if limit is None:
+            return True
+        key = self.get_key(request, view)
+        if key is None:
+            return True
+
+        allowed, wait = get_throttle_backend().hit(f'{scope}:{key}', limit, period)
+        record_throttle_outcome(scope, 'admitted' if allowed else 'throttled')
+        if not allowed:
+            logger.warning('Throttled %s request, retry in %.0fs', scope, wait)
+            self.wait_seconds = math.ceil(wait)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(SlidingWindowThrottle):
+    """
+    Count requests per client IP (honouring NUM_PROXIES like DRF's throttles).
+    """
+
+    scope_suffix = '-ip'
+
+    def get_key(self, request, view):
+        return self.get_ident(request)
+
+
+class EmailThrottle(SlidingWindowThrottle):
+    """
+    Count requests per submitted email address (trimmed and lowercased),
+    so one account cannot be attacked from many IPs.
+    """
+
+    scope_suffix = '-email'
+
+    def get_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return email.strip().lower()
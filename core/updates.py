@@ -0,0 +1,122 @@
+from django.db import transaction
+from django.db.models import F
+from rest_framework.utils import model_meta
+
+from core.concurrency import PreconditionFailed
+
+
+def apply_changes(instance, values):
+    """
+    Set field values on a model instance and report which ones changed.
+
+    Foreign keys are compared by ID, so an unchanged relation does not
+    count as a change (and its related object is not loaded).
+
+    Args:
+        instance (Model): The instance to update.
+        values (dict): New values keyed by field name.
+
+    Returns:
+        list: Names of the fields whose value actually changed.
+    """
+
+    changed = []
+    for name, value in values.items():
+        field = instance._meta.get_field(name)
+        if field.many_to_one or field.one_to_one:
+            current = getattr(instance, field.attname)
+            new = value.pk if value is not None else None
+        else:
+            current = getattr(instance, name)
+            new = value
+        if current != new:
+            setattr(instance, name, value)
+            changed.append(name)
+    return changed
+
+
+def is_versioned(instance):
+    """
+    Return True if the model has a `version` column for optimistic locking.
+    """
+
+    return any(field.name == 'version' for field in instance._meta.concrete_fields)
+
+
+def save_changed(instance, changed_fields, expected_version=None, force=False):
+    """
+    Save only the changed columns, or nothing if no field changed.
+
+    Versioned models (see `is_versioned`) are written with a single
+    `UPDATE ... SET version = version + 1 WHERE id = ? [AND version = ?]`.
+    With `expected_version` the update only succeeds if nobody else has
+    written the row since the client read that version; no row lock is held.
+
+    Args:
+        instance (Model): The instance to save.
+        changed_fields (list): Field names, e.g. from `apply_changes`.
+        expected_version (int): The version the client based its change on
+            (from `If-Match`), or None for an unconditional update.
+        force (bool): Bump the version even without changed columns,
+            e.g. when only many-to-many relations changed.
+
+    Returns:
+        bool: True if a write was issued.
+
+    Raises:
+        PreconditionFailed: If the row's version is not `expected_version`.
+    """
+
+    versioned = is_versioned(instance)
+    if versioned and expected_version is not None and instance.version != expected_version:
+        raise PreconditionFailed()
+    if not changed_fields and not force:
+        return False
+    if not versioned:
+        instance.save(update_fields=changed_fields)
+        return True
+
+    rows = type(instance)._base_manager.filter(pk=instance.pk)
+    if expected_version is not None:
+        rows = rows.filter(version=expected_version)
+    values = {name: getattr(instance, name) for name in changed_fields}
+    if not rows.update(version=F('version') + 1, **values):
+        raise PreconditionFailed()
+    instance.version += 1
+    return True
+
+
+class MinimalUpdateMixin:
+    """
+    ModelSerializer mixin whose `update` writes only the changed columns.
+
+    Works like ModelSerializer.update, but a no-op PATCH issues no UPDATE
+    and other PATCHes only rewrite the changed columns. Many-to-many fields
+    are only assigned if their content changed.
+
+    For versioned models the expected version is read from
+    context['expected_version'] (see `core.concurrency.if_match_version`).
+    """
+
+    def update(self, instance, validated_data):
+        info = model_meta.get_field_info(instance)
+        many_to_many = {
+            name: validated_data.pop(name)
+            for name in list(validated_data)
+            if name in info.relations and info.relations[name].to_many
+        }
+        changed_relations = [
+            name for name, values in many_to_many.items()
+            if {value.pk for value in values} != set(getattr(instance, name).values_list('pk', flat=True))
+        ]
+
+        with transaction.atomic():
+            save_changed(
+                instance,
+                apply_changes(instance, validated_data),
+                self.context.get('expected_version'),
+                force=bool(changed_relations),
+            )
+            for name in changed_relations:
+                getattr(instance, name).set(many_to_many[name])
+        return instance
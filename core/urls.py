@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.urls import path, include
-from boards_app.api.views import EmailCheckView
+from boards_app.api.views import EmailCheckView, UserAutocompleteView
+from boards_app.api.async_views import AsyncEmailCheckView
+from tasks_app.api.views import DashboardView
+from .async_views import hybrid_view
 
 # Root URL configuration for the project.
 #
@@ -9,12 +12,18 @@ from boards_app.api.views import EmailCheckView
 # - /api/ → Authentication routes (e.g., login, registration)
 # - /api/boards/ → Board management endpoints
 # - /api/email-check/ → Endpoint to check if an email is already in use
+# - /api/users/autocomplete/ → Prefix search over user emails and names
 # - /api/tasks/ → Task-related endpoints
+# - /api/dashboard/ → Personal task counts per board
+#
+# With ASYNC_READ_VIEWS the e-mail check is served by its async view.
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('auth_app.api.urls')),
     path('api/boards/', include('boards_app.api.urls')),
-    path('api/email-check/', EmailCheckView.as_view(), name='email-check'),
+    path('api/email-check/', hybrid_view(EmailCheckView, AsyncEmailCheckView), name='email-check'),
+    path('api/users/autocomplete/', UserAutocompleteView.as_view(), name='user-autocomplete'),
     path('api/tasks/', include('tasks_app.api.urls')), 
+    path('api/dashboard/', DashboardView.as_view(), name='dashboard'),
 ]
@@ -0,0 +1,220 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from core.db import is_lock_error, run_with_retry
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Mutation:
+    """
+    One submitted unit of work and the future its caller waits on.
+    """
+
+    __slots__ = ('fn', 'args', 'kwargs', 'future')
+
+    def __init__(self, fn, args, kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+
+
+class WritePipeline:
+    """
+    Funnel database mutations through a single writer thread.
+
+    SQLite allows one writer at a time, so concurrent request threads
+    writing on their own mostly wait for (and retry on) the write lock.
+    Here the writer thread takes whatever mutations are queued (up to
+    `max_batch`, waiting at most `max_wait` seconds for more) and runs
+    them in one transaction: one lock acquisition and one commit for the
+    whole batch. Each mutation runs in its own savepoint, so a failing
+    mutation (e.g. a validation error or a 412 conflict) is rolled back
+    alone and its exception is passed to its caller. Futures are resolved
+    only after the batch has been committed.
+
+    Args:
+        using (str): The database alias.
+        max_batch (int): Maximum number of mutations per transaction.
+        max_wait (float): Seconds to wait for further mutations once the
+            first one of a batch has arrived.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, max_batch=64, max_wait=0.002):
+        self.using = using
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Start the writer thread if it is not running yet.
+        """
+
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='write-pipeline', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """
+        Let the writer thread finish the queued mutations and exit.
+        """
+
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(None)
+        thread.join()
+        self._thread = None
+
+    def in_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Queue a mutation and return a future for its result.
+        """
+
+        self.start()
+        mutation = _Mutation(fn, args, kwargs)
+        self._queue.put(mutation)
+        return mutation.future
+
+    def run(self, fn, *args, timeout=None, **kwargs):
+        """
+        Queue a mutation and wait until it has been committed.
+
+        Called from the writer thread itself (a mutation submitting another
+        one), the function is run directly inside the current batch.
+
+        On a timeout a mutation that is still queued is cancelled and never
+        runs. One that the writer has already started cannot be stopped: it
+        may still be committed after the caller got the TimeoutError, so
+        callers must not report such a write as failed for certain.
+
+        Returns:
+            The return value of `fn`.
+
+        Raises:
+            Exception: Whatever `fn` raised.
+            TimeoutError: If the mutation was not committed within `timeout` seconds.
+        """
+
+        if self.in_writer_thread():
+            return fn(*args, **kwargs)
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            if not future.cancel():
+                logger.warning('Write pipeline timed out on a running mutation; it may still be committed')
+            raise
+
+    def _next_batch(self):
+        """
+        Return the next batch and whether the pipeline was stopped.
+        """
+
+        batch = []
+        item = self._queue.get()
+        while item is not None:
+            batch.append(item)
+            if len(batch) == self.max_batch:
+                return batch, False
+            try:
+                item = self._queue.get(timeout=self.max_wait)
+            except queue.Empty:
+                return batch, False
+        return batch, True
+
+    def _execute(self, batch):
+        outcomes = []
+        for mutation in batch:
+            try:
+                with transaction.atomic(using=self.using):
+                    outcomes.append((True, mutation.fn(*mutation.args, **mutation.kwargs)))
+            except Exception as exc:
+                if is_lock_error(exc):
+                    # Retry the whole batch (see _commit).
+                    raise
+                outcomes.append((False, exc))
+        return outcomes
+
+    def _run(self):
+        stopped = False
+        while not stopped:
+            batch, stopped = self._next_batch()
+            batch = [mutation for mutation in batch if mutation.future.set_running_or_notify_cancel()]
+            if batch:
+                self._commit(batch)
+        connections[self.using].close()
+
+    def _commit(self, batch):
+        try:
+            outcomes = run_with_retry(self._execute, batch, using=self.using)
+        except Exception as exc:
+            logger.exception('Write pipeline batch of %d mutations failed', len(batch))
+            for mutation in batch:
+                mutation.future.set_exception(exc)
+        else:
+            for mutation, (succeeded, value) in zip(batch, outcomes):
+                if succeeded:
+                    mutation.future.set_result(value)
+                else:
+                    mutation.future.set_exception(value)
+        finally:
+            connections[self.using].close_if_unusable_or_obsolete()
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def write_pipeline_enabled():
+    """
+    Return True if mutations should go through the write pipeline
+    (setting WRITE_PIPELINE_ENABLED).
+    """
+
+    return getattr(settings, 'WRITE_PIPELINE_ENABLED', False)
+
+
+def get_write_pipeline():
+    """
+    Return the process-wide write pipeline, creating it on first use.
+    """
+
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = WritePipeline(
+                max_batch=getattr(settings, 'WRITE_PIPELINE_MAX_BATCH', 64),
+                max_wait=getattr(settings, 'WRITE_PIPELINE_MAX_WAIT', 0.002),
+            )
+        return _pipeline
+
+
+def run_write(fn, *args, **kwargs):
+    """
+    Run a mutation through the write pipeline if it is enabled, otherwise
+    in its own transaction with the lock retry policy.
+
+    Returns:
+        The return value of `fn`.
+    """
+
+    if write_pipeline_enabled():
+        timeout = getattr(settings, 'WRITE_PIPELINE_TIMEOUT', 10.0)
+        return get_write_pipeline().run(fn, *args, timeout=timeout, **kwargs)
+    return run_with_retry(fn, *args, **kwargs)
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'type', 'status', 'attempts', 'max_attempts', 'run_at', 'locked_by', 'finished_at')
+    list_filter = ('status', 'type')
+    readonly_fields = ('attempts', 'locked_by', 'locked_until', 'last_error', 'created_at', 'updated_at', 'finished_at')
+    ordering = ('-id',)
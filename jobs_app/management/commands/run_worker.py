@@ -0,0 +1,43 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from jobs_app.registry import registered_job_types
+from jobs_app.worker import Worker
+
+
+class Command(BaseCommand):
+    """
+    Run background jobs (see jobs_app).
+
+    Runs until interrupted (SIGINT/SIGTERM let running jobs finish), or
+    with --once until no job is due, which suits cron and tests.
+    """
+
+    help = 'Run queued background jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=None, help='Jobs run concurrently (default: JOB_WORKER_THREADS).')
+        parser.add_argument('--type', action='append', dest='types', help='Only run jobs of this type; may be repeated.')
+        parser.add_argument('--poll-interval', type=float, default=None, help='Seconds between polls when idle (default: JOB_POLL_INTERVAL).')
+        parser.add_argument('--once', action='store_true', help='Exit when no job is due.')
+
+    def handle(self, *args, **options):
+        types = options['types']
+        unknown = set(types or ()) - set(registered_job_types())
+        if unknown:
+            self.stderr.write(self.style.ERROR(f'Unknown job types: {", ".join(sorted(unknown))}'))
+            return
+
+        worker = Worker(threads=options['threads'], types=types, poll_interval=options['poll_interval'])
+        if not options['once']:
+            signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+            self.stdout.write(
+                f'Worker {worker.name} running {", ".join(types or sorted(registered_job_types()))} '
+                f'with {worker.threads} threads'
+            )
+        try:
+            processed = worker.run(once=options['once'])
+        except KeyboardInterrupt:
+            processed = worker.processed
+        self.stdout.write(self.style.SUCCESS(f'Ran {processed} jobs.'))
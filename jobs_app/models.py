@@ -0,0 +1,65 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A unit of background work, run by `manage.py run_worker`.
+
+    A worker claims a queued job with a conditional UPDATE that sets
+    `locked_by` and a lease (`locked_until`) and counts the attempt. A job
+    whose lease ran out (its worker crashed or hung) can be claimed again.
+    Failed attempts are retried with exponential backoff via `run_at`
+    until `max_attempts` is reached. See jobs_app.queue.
+    """
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    type = models.CharField(max_length=100, help_text="Registered job type, e.g. 'boards.purge'")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0, help_text="Number of times the job was claimed")
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now, help_text="The job is not claimed before this time")
+    locked_by = models.CharField(max_length=255, blank=True, default='')
+    locked_until = models.DateTimeField(null=True, blank=True, help_text="End of the current lease")
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.type} #{self.pk} ({self.status})'
+
+    def heartbeat(self):
+        """
+        Extend the lease of this running job. Handlers that may run longer
+        than the lease call it regularly (see jobs_app.queue.extend_lease).
+
+        Raises:
+            LeaseLost: If another worker has taken over the job.
+        """
+
+        from jobs_app.queue import extend_lease
+        extend_lease(self)
+
+    class Meta:
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        ordering = ['run_at', 'id']
+        # Serve the claim query (due jobs in run_at order) and the
+        # per-type count of running jobs.
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+            models.Index(fields=['type', 'status', 'locked_until'], name='job_type_status_lease_idx'),
+        ]
@@ -0,0 +1,224 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.db import run_with_retry
+from .models import Job
+from .registry import get_job_type, registered_job_types
+
+
+logger = logging.getLogger(__name__)
+
+# Due jobs looked at per claim; the first one that can be claimed is taken.
+CLAIM_BATCH_SIZE = 20
+
+
+class LeaseLost(Exception):
+    """
+    Raised by `extend_lease` if another worker has taken over the job
+    (because its lease had run out) or the job was finished meanwhile.
+    """
+
+
+def lease_seconds(job_type):
+    """
+    Return the lease of a job type in seconds (setting JOB_LEASE_SECONDS
+    unless the type sets its own).
+    """
+
+    return job_type.lease or getattr(settings, 'JOB_LEASE_SECONDS', 300)
+
+
+def retry_delay(attempts):
+    """
+    Return the seconds to wait before the next attempt after `attempts`
+    failed ones: exponential from JOB_RETRY_BASE_DELAY, capped at
+    JOB_RETRY_MAX_DELAY.
+    """
+
+    base = getattr(settings, 'JOB_RETRY_BASE_DELAY', 10)
+    cap = getattr(settings, 'JOB_RETRY_MAX_DELAY', 3600)
+    return min(cap, base * 2 ** max(attempts - 1, 0))
+
+
+def enqueue(type_name, payload=None, run_at=None, max_attempts=None):
+    """
+    Queue a job. Inside a transaction the job is only visible to workers
+    once the transaction commits, and is rolled back with it.
+
+    Args:
+        type_name (str): A registered job type.
+        payload (dict): JSON-serializable arguments for the handler.
+        run_at (datetime): Earliest start, defaults to now.
+        max_attempts (int): Defaults to the job type's max_attempts.
+
+    Returns:
+        Job: The queued job.
+
+    Raises:
+        KeyError: If the job type is not registered.
+    """
+
+    job_type = get_job_type(type_name)
+    return Job.objects.create(
+        type=type_name,
+        payload=payload or {},
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or job_type.max_attempts,
+    )
+
+
+def _owned(job):
+    # Conditional on the claim, so a worker that lost its lease changes nothing.
+    return Job.objects.filter(
+        pk=job.pk, status=Job.STATUS_RUNNING, locked_by=job.locked_by, attempts=job.attempts
+    )
+
+
+def _running_count(type_name, now):
+    running = (
+        Job.objects.filter(type=type_name, status=Job.STATUS_RUNNING, locked_until__gt=now)
+        .order_by()
+        .values('type')
+        .annotate(count=models.Count('id'))
+        .values('count')
+    )
+    return Coalesce(models.Subquery(running), 0)
+
+
+def _try_claim(candidate, job_type, worker_id, now):
+    claim = Job.objects.filter(pk=candidate['id'], status=candidate['status'], attempts=candidate['attempts'])
+    if candidate['status'] == Job.STATUS_RUNNING:
+        claim = claim.filter(locked_until__lte=now)
+    if job_type.concurrency is not None:
+        # Counted in the same UPDATE, so two workers cannot both take the last slot.
+        claim = claim.alias(running=_running_count(job_type.name, now)).filter(running__lt=job_type.concurrency)
+    return claim.update(
+        status=Job.STATUS_RUNNING,
+        locked_by=worker_id,
+        locked_until=now + timedelta(seconds=lease_seconds(job_type)),
+        attempts=models.F('attempts') + 1,
+        updated_at=now,
+    )
+
+
+def _expire(candidate, now):
+    return Job.objects.filter(
+        pk=candidate['id'], status=Job.STATUS_RUNNING, attempts=candidate['attempts'], locked_until__lte=now
+    ).update(
+        status=Job.STATUS_FAILED, last_error='Lease expired.', locked_by='', locked_until=None,
+        updated_at=now, finished_at=now,
+    )
+
+
+def claim_job(worker_id, types=None, now=None):
+    """
+    Claim the next due job for a worker.
+
+    Due are queued jobs whose `run_at` has passed and running jobs whose
+    lease has expired. A job is claimed with one conditional UPDATE on its
+    status and attempt count, which only one worker can win; the same
+    UPDATE checks the type's concurrency limit. A job whose lease expired
+    on its last attempt is marked failed instead.
+
+    Args:
+        worker_id (str): Stored in Job.locked_by.
+        types (list): Only claim jobs of these types (default: all registered).
+        now (datetime): Defaults to the current time.
+
+    Returns:
+        Job or None: The claimed job, or None if no job can be claimed.
+    """
+
+    now = now or timezone.now()
+    job_types = registered_job_types()
+    if types:
+        job_types = {name: job_types[name] for name in types if name in job_types}
+    if not job_types:
+        return None
+
+    candidates = (
+        Job.objects
+        .filter(
+            models.Q(status=Job.STATUS_QUEUED, run_at__lte=now)
+            | models.Q(status=Job.STATUS_RUNNING, locked_until__lte=now),
+            type__in=list(job_types),
+        )
+        .order_by('run_at', 'id')
+        .values('id', 'type', 'status', 'attempts', 'max_attempts')[:CLAIM_BATCH_SIZE]
+    )
+    for candidate in candidates:
+        if candidate['status'] == Job.STATUS_RUNNING and candidate['attempts'] >= candidate['max_attempts']:
+            run_with_retry(_expire, candidate, now)
+            continue
+        if run_with_retry(_try_claim, candidate, job_types[candidate['type']], worker_id, now):
+            return Job.objects.get(pk=candidate['id'])
+    return None
+
+
+def extend_lease(job, now=None):
+    """
+    Extend the lease of a running job (see Job.heartbeat).
+
+    Writes at most once per third of the lease, so handlers may call it
+    after every step.
+
+    Raises:
+        LeaseLost: If the job is no longer held by this claim.
+    """
+
+    now = now or timezone.now()
+    lease = lease_seconds(get_job_type(job.type))
+    if job.locked_until and job.locked_until - now > timedelta(seconds=lease * 2 / 3):
+        return
+    locked_until = now + timedelta(seconds=lease)
+    if not run_with_retry(lambda: _owned(job).update(locked_until=locked_until, updated_at=now)):
+        raise LeaseLost(f'Lost the lease on job {job.pk}.')
+    job.locked_until = locked_until
+
+
+def complete_job(job, now=None):
+    """
+    Mark a claimed job as done.
+
+    Args:
+        job (Job): The claimed job.
+        now (datetime): Defaults to the current time.
+
+    Returns:
+        bool: False if the lease was lost before (another worker may run the job again).
+    """
+
+    now = now or timezone.now()
+    return bool(run_with_retry(lambda: _owned(job).update(
+        status=Job.STATUS_DONE, locked_by='', locked_until=None, last_error='',
+        updated_at=now, finished_at=now,
+    )))
+
+
+def fail_job(job, error, now=None):
+    """
+    Record a failed attempt of a claimed job: queue it again after
+    `retry_delay`, or mark it failed if it has no attempts left.
+
+    Args:
+        job (Job): The claimed job.
+        error (Exception or str): Stored in Job.last_error.
+        now (datetime): Defaults to the current time.
+
+    Returns:
+        bool: False if the lease was lost before.
+    """
+
+    now = now or timezone.now()
+    if job.attempts >= job.max_attempts:
+        changes = {'status': Job.STATUS_FAILED, 'finished_at': now}
+    else:
+        changes = {'status': Job.STATUS_QUEUED, 'run_at': now + timedelta(seconds=retry_delay(job.attempts))}
+    return bool(run_with_retry(lambda: _owned(job).update(
+        locked_by='', locked_until=None, last_error=str(error), updated_at=now, **changes
+    )))
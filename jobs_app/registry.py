@@ -0,0 +1,62 @@
+class JobType:
+    """
+    A registered job type.
+
+    Args:
+        name (str): The type name stored in Job.type.
+        handler (callable): Called with the claimed Job.
+        max_attempts (int): Attempts before the job is marked failed.
+        concurrency (int): Jobs of this type running at the same time
+            across all workers; None for no limit.
+        lease (int): Seconds a claim is valid without a heartbeat;
+            None for the JOB_LEASE_SECONDS setting.
+    """
+
+    def __init__(self, name, handler, max_attempts=5, concurrency=None, lease=None):
+        self.name = name
+        self.handler = handler
+        self.max_attempts = max_attempts
+        self.concurrency = concurrency
+        self.lease = lease
+
+
+_registry = {}
+
+
+def register_job(name, *, max_attempts=5, concurrency=None, lease=None):
+    """
+    Decorator registering a function as the handler of a job type.
+
+    Usage:
+        @register_job('boards.purge', concurrency=1)
+        def purge(job):
+            ...
+
+    Handlers live in the `jobs` module of an app, which is imported when
+    Django starts (see JobsAppConfig.ready).
+    """
+
+    def decorator(handler):
+        _registry[name] = JobType(name, handler, max_attempts, concurrency, lease)
+        return handler
+
+    return decorator
+
+
+def get_job_type(name):
+    """
+    Return the registered JobType.
+
+    Raises:
+        KeyError: If no job type with this name is registered.
+    """
+
+    return _registry[name]
+
+
+def registered_job_types():
+    """
+    Return all registered job types by name.
+    """
+
+    return dict(_registry)
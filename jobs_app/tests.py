@@ -0,0 +1,146 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobs_app import registry
+from jobs_app.models import Job
+from jobs_app.queue import LeaseLost, _try_claim, claim_job, complete_job, enqueue, extend_lease, fail_job
+from jobs_app.registry import JobType
+
+
+LEASE = 60
+
+
+def noop(job):
+    pass
+
+
+@override_settings(JOB_RETRY_BASE_DELAY=10, JOB_RETRY_MAX_DELAY=25)
+class QueueTests(TestCase):
+    """
+    Claims, leases and retries of jobs_app.queue, with an explicit clock.
+
+    Only the job types registered here exist during a test, so jobs of
+    the apps' own types are never claimed.
+    """
+
+    def setUp(self):
+        job_types = {
+            'tests.job': JobType('tests.job', noop, max_attempts=3, lease=LEASE),
+            'tests.single': JobType('tests.single', noop, concurrency=1, lease=LEASE),
+        }
+        patcher = mock.patch.dict(registry._registry, job_types, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.now = timezone.now()
+
+    def at(self, seconds):
+        return self.now + timedelta(seconds=seconds)
+
+    def enqueue(self, type_name='tests.job', run_at=None):
+        return enqueue(type_name, {}, run_at=run_at or self.now)
+
+    def test_claim_sets_lease_and_counts_attempt(self):
+        queued = self.enqueue()
+        job = claim_job('w1', now=self.now)
+        self.assertEqual(job.pk, queued.pk)
+        self.assertEqual((job.status, job.locked_by, job.attempts), (Job.STATUS_RUNNING, 'w1', 1))
+        self.assertEqual(job.locked_until, self.at(LEASE))
+
+    def test_job_is_not_claimed_before_run_at(self):
+        self.enqueue(run_at=self.at(10))
+        self.assertIsNone(claim_job('w1', now=self.at(9)))
+        self.assertIsNotNone(claim_job('w1', now=self.at(10)))
+
+    def test_only_one_worker_wins_a_claim(self):
+        job = self.enqueue()
+        # Both workers read the job as queued; the second UPDATE matches nothing.
+        candidate = Job.objects.values('id', 'type', 'status', 'attempts', 'max_attempts').get(pk=job.pk)
+        job_type = registry.get_job_type('tests.job')
+        self.assertEqual(_try_claim(candidate, job_type, 'w1', self.now), 1)
+        self.assertEqual(_try_claim(candidate, job_type, 'w2', self.now), 0)
+        self.assertEqual(Job.objects.get(pk=job.pk).locked_by, 'w1')
+        self.assertIsNone(claim_job('w2', now=self.now))
+
+    def test_expired_lease_is_taken_over(self):
+        self.enqueue()
+        first = claim_job('w1', now=self.now)
+        self.assertIsNone(claim_job('w2', now=self.at(LEASE - 1)))
+
+        second = claim_job('w2', now=self.at(LEASE))
+        self.assertEqual((second.pk, second.locked_by, second.attempts), (first.pk, 'w2', 2))
+        # The first worker no longer owns the job and cannot change it.
+        with self.assertRaises(LeaseLost):
+            extend_lease(first, now=self.at(LEASE))
+        self.assertFalse(complete_job(first, now=self.at(LEASE)))
+        self.assertFalse(fail_job(first, 'late', now=self.at(LEASE)))
+        self.assertTrue(complete_job(second, now=self.at(LEASE + 1)))
+        self.assertEqual(Job.objects.get(pk=first.pk).status, Job.STATUS_DONE)
+
+    def test_heartbeat_keeps_the_lease(self):
+        self.enqueue()
+        job = claim_job('w1', now=self.now)
+        extend_lease(job, now=self.at(LEASE - 1))
+        self.assertEqual(job.locked_until, self.at(2 * LEASE - 1))
+        self.assertIsNone(claim_job('w2', now=self.at(LEASE + 1)))
+
+    def test_lease_expired_on_last_attempt_fails_the_job(self):
+        self.enqueue()
+        for attempt in range(3):
+            job = claim_job('w1', now=self.at(attempt * LEASE))
+            self.assertEqual(job.attempts, attempt + 1)
+        self.assertIsNone(claim_job('w1', now=self.at(3 * LEASE)))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.last_error), (Job.STATUS_FAILED, 'Lease expired.'))
+
+    def test_failed_attempts_back_off_exponentially(self):
+        self.enqueue()
+        claimed_at = self.now
+        for delay in (10, 20):
+            job = claim_job('w1', now=claimed_at)
+            self.assertTrue(fail_job(job, ValueError('boom'), now=claimed_at))
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.run_at, job.last_error), (Job.STATUS_QUEUED, claimed_at + timedelta(seconds=delay), 'boom'))
+            self.assertIsNone(claim_job('w1', now=job.run_at - timedelta(seconds=1)))
+            claimed_at = job.run_at
+
+        # The third attempt is the last one.
+        job = claim_job('w1', now=claimed_at)
+        self.assertTrue(fail_job(job, 'boom', now=claimed_at))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.finished_at), (Job.STATUS_FAILED, claimed_at))
+        self.assertIsNone(claim_job('w1', now=self.at(3600)))
+
+    @override_settings(JOB_RETRY_MAX_DELAY=15)
+    def test_backoff_is_capped(self):
+        self.enqueue()
+        job = claim_job('w1', now=self.now)
+        fail_job(job, 'boom', now=self.now)
+        job = claim_job('w1', now=self.at(10))
+        fail_job(job, 'boom', now=self.at(10))
+        job.refresh_from_db()
+        self.assertEqual(job.run_at, self.at(25))
+
+    def test_concurrency_limit_per_type(self):
+        first, second = self.enqueue('tests.single'), self.enqueue('tests.single')
+        other = self.enqueue('tests.job')
+
+        running = claim_job('w1', now=self.now)
+        self.assertEqual(running.pk, first.pk)
+        # The second 'tests.single' job waits; other types are not held up.
+        self.assertEqual(claim_job('w2', now=self.now).pk, other.pk)
+        self.assertIsNone(claim_job('w3', now=self.now))
+
+        self.assertTrue(complete_job(running, now=self.at(1)))
+        self.assertEqual(claim_job('w3', now=self.at(1)).pk, second.pk)
+
+    def test_expired_lease_frees_the_concurrency_slot(self):
+        first, second = self.enqueue('tests.single'), self.enqueue('tests.single', run_at=self.at(1))
+        claim_job('w1', now=self.now)
+        self.assertIsNone(claim_job('w2', types=['tests.single'], now=self.at(LEASE - 1)))
+        # The hung job is claimed again first (it is due earliest).
+        self.assertEqual(claim_job('w2', now=self.at(LEASE)).pk, first.pk)
+        self.assertIsNone(claim_job('w3', now=self.at(LEASE)))
+        self.assertEqual(Job.objects.get(pk=second.pk).status, Job.STATUS_QUEUED)
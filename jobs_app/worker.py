@@ -0,0 +1,104 @@
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .queue import LeaseLost, claim_job, complete_job, fail_job
+from .registry import get_job_type
+
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """
+    Runs background jobs in a pool of threads.
+
+    Each thread claims a job, runs its handler, marks the job done (or
+    records the failed attempt) and claims the next one; idle threads poll
+    for new jobs every `poll_interval` seconds. Each thread uses its own
+    database connection, handled like a request's (`close_old_connections`
+    around each job).
+
+    Args:
+        threads (int): Jobs run concurrently, defaults to JOB_WORKER_THREADS.
+        types (list): Only run jobs of these types (default: all registered).
+        poll_interval (float): Seconds an idle thread waits, defaults to
+            JOB_POLL_INTERVAL.
+        name (str): Worker name stored in Job.locked_by, defaults to host and PID.
+    """
+
+    def __init__(self, threads=None, types=None, poll_interval=None, name=None):
+        self.threads = threads or getattr(settings, 'JOB_WORKER_THREADS', 2)
+        self.types = types
+        self.poll_interval = poll_interval if poll_interval is not None else getattr(settings, 'JOB_POLL_INTERVAL', 1.0)
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.processed = 0
+
+    def stop(self):
+        """
+        Let the threads finish their current job and exit.
+        """
+
+        self._stop.set()
+
+    def run(self, once=False):
+        """
+        Run jobs until `stop()` is called, or with `once` until no job is due.
+
+        Returns:
+            int: Number of jobs run.
+        """
+
+        with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='job-worker') as pool:
+            futures = [pool.submit(self._loop, once) for _ in range(self.threads)]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                self.stop()
+                raise
+        return self.processed
+
+    def _loop(self, once):
+        worker_id = f'{self.name}:{threading.current_thread().name}'
+        while not self._stop.is_set():
+            close_old_connections()
+            try:
+                job = claim_job(worker_id, self.types)
+            except Exception:
+                logger.exception('Claiming a job failed')
+                job = None
+            if job is None:
+                if once:
+                    break
+                self._stop.wait(self.poll_interval)
+                continue
+            self.run_job(job)
+        close_old_connections()
+
+    def run_job(self, job):
+        """
+        Run the handler of a claimed job and record the outcome.
+        """
+
+        try:
+            get_job_type(job.type).handler(job)
+        except LeaseLost as e:
+            logger.warning('%s: %s', job, e)
+        except Exception as e:
+            logger.exception('%s failed (attempt %s of %s)', job, job.attempts, job.max_attempts)
+            if not fail_job(job, e):
+                logger.warning('%s: lease lost before the failure was recorded', job)
+        else:
+            if not complete_job(job):
+                logger.warning('%s: lease lost before completion', job)
+        finally:
+            with self._lock:
+                self.processed += 1
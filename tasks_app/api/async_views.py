@@ -0,0 +1,94 @@
+from boards_app.api.permissions import IsAuthenticatedWithCustomMessage
+from core.async_views import AsyncReadView, JSONResponse, as_json_response
+from core.fieldsets import requested_fields, restrict_queryset
+from tasks_app.api.projections import fast_read_path_enabled, task_projection_for
+from tasks_app.api.serializers import TaskSerializer, aside_loaded_users, wants_side_loaded_users
+from tasks_app.api.views import internal_error_response_500, join_task_users
+from tasks_app.models import Task
+
+
+async def atask_list_response(queryset, context, fast_path, empty_detail):
+    """
+    Async counterpart of `task_list_response` for JSON clients.
+
+    The tasks are loaded with the async ORM and returned as one rendered
+    JSON body. Unlike `task_list_response` the list is not streamed: the
+    whole list is held in memory, and an error while loading it is always
+    answered with a 500, never with an aborted 200.
+
+    Args:
+        queryset (QuerySet): The tasks to return.
+        context (dict): The serializer context ('fields', 'side_load_users').
+        fast_path (bool): Use the serializer-free read path.
+        empty_detail (str): Returned as {"detail": ...} when there are no tasks.
+
+    Returns:
+        JSONResponse: The task list.
+    """
+
+    if fast_path:
+        data = await task_projection_for(context).arows(queryset)
+    else:
+        tasks = [task async for task in join_task_users(queryset, context)]
+        data = TaskSerializer(tasks, many=True, context=context).data
+    if not data:
+        return JSONResponse({"detail": empty_detail})
+    if context['side_load_users']:
+        return JSONResponse({'tasks': data, 'users': await aside_loaded_users(data)})
+    return JSONResponse(data)
+
+
+class AsyncTaskListView(AsyncReadView):
+    """
+    Base class of the async personal task lists.
+
+    Subclasses set `endpoint` (the URL name, for FAST_READ_ENDPOINTS),
+    `empty_detail` and implement `get_queryset(user)`.
+    """
+
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+    endpoint = None
+    empty_detail = None
+
+    def get_queryset(self, user):
+        raise NotImplementedError
+
+    async def get(self, request):
+        try:
+            context = {
+                'request': request,
+                'side_load_users': wants_side_loaded_users(request),
+                'fields': requested_fields(request),
+            }
+            queryset = restrict_queryset(
+                self.get_queryset(request.user), TaskSerializer(context=context), context['fields']
+            )
+            return await atask_list_response(
+                queryset, context, fast_read_path_enabled(self.endpoint), self.empty_detail
+            )
+        except Exception as e:
+            return as_json_response(internal_error_response_500(e))
+
+
+class AsyncTaskAssignedToMeView(AsyncTaskListView):
+    """
+    Async variant of TaskAssignedToMeView (GET).
+    """
+
+    endpoint = 'assigned-to-me'
+    empty_detail = "No tasks assigned to you."
+
+    def get_queryset(self, user):
+        return Task.objects.filter(assignee=user, board__deleted_at__isnull=True)
+
+
+class AsyncTaskReviewingView(AsyncTaskListView):
+    """
+    Async variant of TaskReviewingView (GET).
+    """
+
+    endpoint = 'task-reviewing'
+    empty_detail = "No tasks under review."
+
+    def get_queryset(self, user):
+        return Task.objects.filter(reviewer=user, board__deleted_at__isnull=True)
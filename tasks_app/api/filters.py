@@ -0,0 +1,286 @@
+import base64
+import datetime
+import json
+
+from django.db import models
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from tasks_app.models import Task, TaskComment
+
+
+# Sort keys accepted by `?ordering=`. Every sort is made unique with 'id'
+# as tie-breaker, which is what the keyset cursor relies on.
+SORT_FIELDS = {
+    'due_date': 'due_date',
+    'title': 'title',
+    'id': 'id',
+}
+DEFAULT_ORDERING = 'due_date'
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+STATUS_VALUES = {choice for choice, _ in Task.STATUS_CHOICES}
+PRIORITY_VALUES = {choice for choice, _ in Task.PRIORITY_CHOICES}
+
+
+def _parse_choices(value, allowed, name):
+    values = {part.strip() for part in value.split(',') if part.strip()}
+    invalid = values - allowed
+    if invalid:
+        raise ValidationError({name: f"Invalid value(s): {', '.join(sorted(invalid))}."})
+    return values
+
+
+def _parse_user(value, name, user):
+    if value == 'me':
+        return user.id
+    if value == 'none':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: "Must be a user ID, 'me' or 'none'."})
+
+
+def _parse_date(value, name):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({name: "Must be a date in the format YYYY-MM-DD."})
+
+
+def _parse_bool(value, name):
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValidationError({name: "Must be true or false."})
+
+
+def encode_cursor(values):
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+    """
+    raw = json.dumps(values, default=str, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor created by `encode_cursor`: a [sort value, id] pair.
+
+    Only the shape and the ID are checked here; the sort value is
+    validated by the caller, which knows its type.
+
+    Raises:
+        ValidationError: If the cursor is malformed or the ID is not an integer.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValidationError({"cursor": "Invalid cursor."})
+    if not isinstance(values[1], int) or isinstance(values[1], bool):
+        raise ValidationError({"cursor": "Invalid cursor."})
+    return values
+
+
+class BoardTaskQuery:
+    """
+    Parsed and validated query parameters of the board task list.
+
+    Filters:
+        ?status=to-do,review     One or more statuses.
+        ?priority=high           One or more priorities.
+        ?assignee=<id|me|none>   Assigned user.
+        ?reviewer=<id|me|none>   Reviewing user.
+        ?due_from=YYYY-MM-DD     Due on or after the date.
+        ?due_to=YYYY-MM-DD       Due on or before the date.
+        ?overdue=true            Due before today and not done.
+
+    Sorting and pagination:
+        ?ordering=due_date|-due_date|title|-title|id|-id
+        ?limit=<n>               Page size (default 50, max 200).
+        ?cursor=<next>           Cursor from the previous page.
+
+    The filters and sort keys are backed by the (board, <filter>, due_date, id)
+    and (board, title, id) indexes on Task. A due date range (due_from,
+    due_to, overdue) sorted by title or id is the exception: SQLite
+    searches the range on a due date index and sorts only the matching
+    rows, since no single index orders by one column within a range of
+    another.
+    """
+
+    def __init__(self, params, user):
+        self.filters = models.Q()
+        self._parse_filters(params, user)
+
+        ordering = params.get('ordering', DEFAULT_ORDERING)
+        self.descending = ordering.startswith('-')
+        sort_key = ordering.lstrip('-')
+        if sort_key not in SORT_FIELDS:
+            raise ValidationError({"ordering": f"Must be one of: {', '.join(SORT_FIELDS)} (optionally prefixed with '-')."})
+        self.sort_field = SORT_FIELDS[sort_key]
+
+        try:
+            self.limit = int(params.get('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({"limit": "Limit must be an integer."})
+        self.limit = max(1, min(self.limit, MAX_PAGE_SIZE))
+
+        cursor = params.get('cursor')
+        self.cursor = self._parse_cursor(cursor) if cursor else None
+
+    def _parse_filters(self, params, user):
+        if params.get('status'):
+            self.filters &= models.Q(status__in=_parse_choices(params['status'], STATUS_VALUES, 'status'))
+        if params.get('priority'):
+            self.filters &= models.Q(priority__in=_parse_choices(params['priority'], PRIORITY_VALUES, 'priority'))
+        for name in ('assignee', 'reviewer'):
+            if params.get(name):
+                user_id = _parse_user(params[name], name, user)
+                if user_id is None:
+                    self.filters &= models.Q(**{f'{name}__isnull': True})
+                else:
+                    self.filters &= models.Q(**{f'{name}_id': user_id})
+        if params.get('due_from'):
+            self.filters &= models.Q(due_date__gte=_parse_date(params['due_from'], 'due_from'))
+        if params.get('due_to'):
+            self.filters &= models.Q(due_date__lte=_parse_date(params['due_to'], 'due_to'))
+        if params.get('overdue') and _parse_bool(params['overdue'], 'overdue'):
+            self.filters &= models.Q(due_date__lt=timezone.localdate()) & ~models.Q(status=Task.STATUS_DONE)
+
+    def _parse_cursor(self, cursor):
+        """
+        Decode the cursor and check that its sort value fits the sort field.
+
+        Raises:
+            ValidationError: If the cursor is malformed.
+        """
+        value, last_id = decode_cursor(cursor)
+        if self.sort_field == 'due_date':
+            if value is not None:
+                if not isinstance(value, str):
+                    raise ValidationError({"cursor": "Invalid cursor."})
+                value = _parse_date(value, 'cursor')
+        elif self.sort_field == 'title':
+            if not isinstance(value, str):
+                raise ValidationError({"cursor": "Invalid cursor."})
+        elif value != last_id:
+            raise ValidationError({"cursor": "Invalid cursor."})
+        return value, last_id
+
+    def ordering(self):
+        prefix = '-' if self.descending else ''
+        return [f'{prefix}{self.sort_field}', f'{prefix}id']
+
+    def _after_cursor(self):
+        """
+        Return the keyset condition selecting rows after the cursor.
+
+        Follows SQLite's NULL ordering: NULLs come first in ascending and
+        last in descending order.
+        """
+        value, last_id = self.cursor
+        field = self.sort_field
+        id_after = models.Q(id__lt=last_id) if self.descending else models.Q(id__gt=last_id)
+
+        if field == 'id':
+            return id_after
+        if value is None:
+            if self.descending:
+                return models.Q(**{f'{field}__isnull': True}) & id_after
+            return (models.Q(**{f'{field}__isnull': True}) & id_after) | models.Q(**{f'{field}__isnull': False})
+
+        lookup = 'lt' if self.descending else 'gt'
+        condition = models.Q(**{f'{field}__{lookup}': value}) | (models.Q(**{field: value}) & id_after)
+        if self.descending:
+            condition |= models.Q(**{f'{field}__isnull': True})
+        return condition
+
+    def apply(self, queryset):
+        """
+        Filter and sort the queryset and skip the rows up to the cursor.
+
+        The result is not sliced; take `limit + 1` rows to find out whether
+        there is a next page.
+        """
+        queryset = queryset.filter(self.filters)
+        if self.cursor is not None:
+            queryset = queryset.filter(self._after_cursor())
+        return queryset.order_by(*self.ordering())
+
+    def key_columns(self):
+        """
+        Return the columns of the sort key a cursor is built from.
+        """
+        return (self.sort_field, 'id')
+
+    def next_cursor(self, key):
+        """
+        Return the cursor for the page following the current one.
+
+        Args:
+            key (tuple): The `key_columns()` values of the last row of the
+                page, taken from the rows already fetched.
+        """
+        value, last_id = key
+        if isinstance(value, datetime.date):
+            value = value.isoformat()
+        return encode_cursor([value, last_id])
+
+
+def comment_feed_keys(user, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return the (created_at, id) keys of one page of comments on tasks the
+    user is assigned to or reviewing, oldest first.
+
+    Instead of an OR over the task join plus DISTINCT, the user's tasks are
+    selected by a UNION of two subqueries (by assignee and by reviewer),
+    each served by its foreign key index; the comments of those tasks come
+    from the (task, created_at, id) index. The UNION already removes tasks
+    the user both works on and reviews, so no DISTINCT over comments is
+    needed.
+
+    Args:
+        user (CustomUser): The user.
+        cursor (str): Cursor returned for the previous page.
+        limit (int): Page size; one extra key is returned if there is a next page.
+
+    Returns:
+        list: (created_at, id) tuples.
+
+    Raises:
+        ValidationError: If the cursor is malformed.
+    """
+
+    after = models.Q()
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        try:
+            created_at = datetime.datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            raise ValidationError({"cursor": "Invalid cursor."})
+        if timezone.is_naive(created_at):
+            raise ValidationError({"cursor": "Invalid cursor."})
+        after = models.Q(created_at__gt=created_at) | models.Q(created_at=created_at, id__gt=last_id)
+
+    tasks = Task.objects.filter(board__deleted_at__isnull=True).order_by().values('id')
+    task_ids = tasks.filter(assignee=user).union(tasks.filter(reviewer=user))
+    return list(
+        TaskComment.objects.filter(after, task_id__in=task_ids)
+        .order_by('created_at', 'id')
+        .values_list('created_at', 'id')[:limit + 1]
+    )
+
+
+def comment_feed_cursor(key):
+    """
+    Return the cursor for the page following the comment with the given
+    (created_at, id) key.
+    """
+    created_at, comment_id = key
+    return encode_cursor([created_at.isoformat(), comment_id])
@@ -37,13 +37,11 @@ class IsMemberOfBoard(BasePermission):
             except (TypeError, ValueError):
                 raise ValidationError({"board": "Board must be a valid integer ID."})
 
+            if request.user.can_access_board(board_id):
+                return True
             if not Board.objects.filter(id=board_id).exists():
                 raise NotFound("Board not found.")
-
-            board = Board.objects.get(id=board_id)
-            if request.user not in board.members.all() and board.owner != request.user.id:
-                return False
-            return True
+            return False
 
         return True
 
@@ -58,10 +56,7 @@ class IsMemberOfBoard(BasePermission):
             bool: True if access is granted.
         """
 
-        user = request.user
-        owner = obj.board.owner
-        board = obj.board
-        if user not in board.members.all() and user != owner:
+        if not request.user.can_access_board(obj.board_id):
             raise PermissionDenied("You are not a member of this board.")
 
         return True
@@ -99,13 +94,11 @@ class IsMemberOfBoardComments(BasePermission):
         if not task_id:
             raise PermissionDenied("Task-id is missing.")
 
-        try:
-            task = Task.objects.select_related("board").get(id=task_id)
-        except Task.DoesNotExist:
+        board_id = Task.objects.filter(id=task_id).values_list("board_id", flat=True).first()
+        if board_id is None:
             raise NotFound("Task does not exist.")
 
-        board = task.board
-        if user not in board.members.all() and user.id != board.owner:
+        if not user.can_access_board(board_id):
             raise PermissionDenied("You are not a member of this board.")
 
         return True
@@ -118,9 +111,7 @@ class IsMemberOfBoardComments(BasePermission):
             bool: True if the user is authorized.
         """
 
-        user = request.user
-        board = obj.task.board
-        if user not in board.members.all() and user.id != board.owner:
+        if not request.user.can_access_board(obj.task.board_id):
             raise PermissionDenied("You are not a member of this board.")
         return True
 
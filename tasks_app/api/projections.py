@@ -0,0 +1,178 @@
+from functools import lru_cache
+
+from django.conf import settings
+
+from core.streaming import chunked
+
+
+# Output fields of TaskSerializer and TasksBoardDetailsSerializer, in order.
+TASK_FIELDS = (
+    'id', 'board', 'title', 'description', 'status',
+    'priority', 'assignee', 'reviewer',
+    'due_date', 'comments_count'
+)
+BOARD_DETAIL_TASK_FIELDS = tuple(name for name in TASK_FIELDS if name != 'board')
+
+USER_COLUMNS = ('id', 'email', 'fullname')
+
+
+def fast_read_path_enabled(name):
+    """
+    Return True if the serializer-free read path is enabled for an endpoint.
+
+    Args:
+        name (str): The URL name of the endpoint, e.g. 'assigned-to-me'.
+    """
+    return name in getattr(settings, 'FAST_READ_ENDPOINTS', ())
+
+
+def _int_or_none(value):
+    return None if value is None else int(value)
+
+def _str_or_none(value):
+    return None if value is None else str(value)
+
+def _date_or_none(value):
+    return None if value is None else value.isoformat()
+
+# Converters matching the DRF field classes the serializers use for each column.
+_CONVERTERS = {
+    'id': int,
+    'board': _int_or_none,
+    'title': _str_or_none,
+    'description': _str_or_none,
+    'status': _str_or_none,
+    'priority': _str_or_none,
+    'due_date': _date_or_none,
+    'comments_count': _int_or_none,
+}
+
+
+class TaskProjection:
+    """
+    Serializer-free mapper from `values_list()` rows to task dicts.
+
+    Produces exactly the output of TaskSerializer (or TasksBoardDetailsSerializer
+    if `include_board` is False), including sparse fieldsets and side-loaded
+    users, but skips DRF's field-by-field conversion. Column lists and
+    converters are compiled once per combination of options, see `get()`.
+    """
+
+    def __init__(self, fields, side_load_users):
+        self.columns = []
+        self.mappers = []
+
+        for name in fields:
+            if name in ('assignee', 'reviewer'):
+                self._add_user(name, side_load_users)
+            else:
+                column = 'board_id' if name == 'board' else name
+                self.mappers.append((name, self._scalar(self._column(column), _CONVERTERS[name])))
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def get(cls, include_board=True, fields=None, side_load_users=False):
+        """
+        Return the compiled projection for the given options.
+
+        Args:
+            include_board (bool): Emit the 'board' field (TaskSerializer shape).
+            fields (frozenset or None): Sparse fieldset, None for all fields.
+            side_load_users (bool): Emit user IDs instead of nested users.
+        """
+        names = TASK_FIELDS if include_board else BOARD_DETAIL_TASK_FIELDS
+        if fields is not None:
+            names = tuple(name for name in names if name in fields)
+        return cls(names, side_load_users)
+
+    def _column(self, column):
+        self.columns.append(column)
+        return len(self.columns) - 1
+
+    @staticmethod
+    def _scalar(index, convert):
+        def mapper(row):
+            return convert(row[index])
+        return mapper
+
+    def _add_user(self, name, side_load_users):
+        if side_load_users:
+            self.mappers.append((name, self._scalar(self._column(f'{name}_id'), _int_or_none)))
+            return
+
+        id_index, email_index, fullname_index = (
+            self._column(f'{name}__{column}') for column in USER_COLUMNS
+        )
+
+        def mapper(row):
+            if row[id_index] is None:
+                return None
+            return {'id': row[id_index], 'email': str(row[email_index]), 'fullname': str(row[fullname_index])}
+
+        self.mappers.append((name, mapper))
+
+    def row_to_dict(self, row):
+        return {name: mapper(row) for name, mapper in self.mappers}
+
+    def rows(self, queryset):
+        """
+        Evaluate the queryset with a single projected query and map the rows.
+
+        Returns:
+            list: Task dicts as the serializer would produce them.
+        """
+        if not self.columns:
+            return [{} for _ in queryset.values_list('pk')]
+        row_to_dict = self.row_to_dict
+        return [row_to_dict(row) for row in queryset.values_list(*self.columns)]
+
+    def rows_with_keys(self, queryset, key_columns):
+        """
+        Like `rows()`, but also return extra columns of every row, read by
+        the same query (e.g. the sort key for a pagination cursor).
+
+        Returns:
+            tuple: (task dicts, list of tuples of the `key_columns` values)
+        """
+        width = len(self.columns)
+        values = list(queryset.values_list(*self.columns, *key_columns))
+        row_to_dict = self.row_to_dict
+        return [row_to_dict(row) for row in values], [row[width:] for row in values]
+
+    async def arows(self, queryset):
+        """
+        Async variant of `rows()`, evaluated with the async ORM.
+
+        Returns:
+            list: Task dicts as the serializer would produce them.
+        """
+        if not self.columns:
+            return [{} async for _ in queryset.values_list('pk')]
+        row_to_dict = self.row_to_dict
+        return [row_to_dict(row) async for row in queryset.values_list(*self.columns)]
+
+    def iter_rows(self, queryset, chunk_size):
+        """
+        Like `rows()`, but fetch and map the rows in chunks.
+
+        Yields:
+            list: Task dicts of one chunk.
+        """
+        columns = self.columns or ['pk']
+        row_to_dict = self.row_to_dict if self.columns else (lambda row: {})
+        rows = queryset.values_list(*columns).iterator(chunk_size=chunk_size)
+        for chunk in chunked(rows, chunk_size):
+            yield [row_to_dict(row) for row in chunk]
+
+
+def task_projection_for(context, include_board=True):
+    """
+    Return the projection matching a serializer context
+    ('fields' and 'side_load_users', see the task serializers).
+    """
+    fields = context.get('fields')
+    return TaskProjection.get(
+        include_board=include_board,
+        fields=frozenset(fields) if fields is not None else None,
+        side_load_users=bool(context.get('side_load_users')),
+    )
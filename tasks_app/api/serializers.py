@@ -1,9 +1,13 @@
 from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
 
 from tasks_app.models import Task, TaskComment
 from auth_app.api.serializers import UserSerializer
 from auth_app.models import CustomUser
 from boards_app.models import Board
+from core.fieldsets import SparseFieldsetMixin
+from core.streaming import iter_json_array
+from core.updates import apply_changes, save_changed
 
 def user_field():
     """
@@ -27,6 +31,109 @@ def pk_field_for(source_name):
         allow_null=True   
     )
 
+def wants_side_loaded_users(request):
+    """
+    Return True if the client asked for the normalized response shape
+    via `?include=users`.
+    """
+    if request is None:
+        return False
+    include = request.query_params.get('include', '')
+    return 'users' in [part.strip() for part in include.split(',')]
+
+def side_loaded_users(task_rows):
+    """
+    Build the deduplicated users map for serialized tasks.
+
+    Expects task rows serialized with side-loaded users, i.e. 'assignee'
+    and 'reviewer' hold user IDs. All referenced users are loaded with a
+    single query.
+
+    Returns:
+        dict: User data keyed by user ID.
+    """
+    user_ids = set()
+    collect_user_ids(task_rows, user_ids)
+    return users_by_id(user_ids)
+
+def collect_user_ids(task_rows, user_ids):
+    """
+    Add the assignee and reviewer IDs of serialized tasks to the given set.
+    """
+    for row in task_rows:
+        for name in SideLoadedUsersMixin.user_fields:
+            if row.get(name) is not None:
+                user_ids.add(row[name])
+
+def users_by_id(user_ids):
+    """
+    Load the given users with a single query.
+
+    Returns:
+        dict: User data keyed by user ID.
+    """
+    users = CustomUser.objects.filter(id__in=user_ids).only('id', 'email', 'fullname').order_by('id')
+    return {str(user.id): UserSerializer(user).data for user in users}
+
+async def aside_loaded_users(task_rows):
+    """
+    Async variant of `side_loaded_users`.
+    """
+    user_ids = set()
+    collect_user_ids(task_rows, user_ids)
+    users = CustomUser.objects.filter(id__in=user_ids).only('id', 'email', 'fullname').order_by('id')
+    return {str(user.id): UserSerializer(user).data async for user in users}
+
+def with_side_loaded_users(task_rows):
+    """
+    Wrap a list of serialized tasks together with its users map.
+    """
+    return {'tasks': task_rows, 'users': side_loaded_users(task_rows)}
+
+def iter_with_side_loaded_users(task_chunks):
+    """
+    Streaming variant of `with_side_loaded_users`.
+
+    Encodes the chunks of serialized tasks as they come and appends the
+    users map once all tasks are sent, so only the user IDs are kept.
+
+    Yields:
+        bytes: Parts of the JSON object.
+    """
+    user_ids = set()
+
+    def collecting():
+        for chunk in task_chunks:
+            collect_user_ids(chunk, user_ids)
+            yield chunk
+
+    # Sent together with the first chunk of tasks (see iter_json_array).
+    tasks = iter_json_array(collecting())
+    yield b'{"tasks":' + next(tasks)
+    yield from tasks
+    yield b',"users":'
+    yield JSONRenderer().render(users_by_id(user_ids))
+    yield b'}'
+
+class SideLoadedUsersMixin:
+    """
+    Replaces the nested assignee and reviewer objects with plain user IDs
+    when the serializer context contains 'side_load_users'.
+
+    The referenced users are then sent once, next to the tasks,
+    see `side_loaded_users`.
+    """
+
+    user_fields = ('assignee', 'reviewer')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get('side_load_users'):
+            for name in self.user_fields:
+                if name in fields:
+                    fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+        return fields
+
 class UserIDField(serializers.PrimaryKeyRelatedField):
     """
     A custom field that ensures the input is a plain ID (not a dict).
@@ -39,14 +146,16 @@ class UserIDField(serializers.PrimaryKeyRelatedField):
             )
         return super().to_internal_value(data)
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetMixin, SideLoadedUsersMixin, serializers.ModelSerializer):
     """
     Serializer for displaying task data.
 
     Includes task information such as:
     - title, description, status, priority
-    - read-only user info for assignee and reviewer
+    - read-only user info for assignee and reviewer (user IDs if side-loaded)
     - due date and comment count
+
+    Supports sparse fieldsets via context['fields'].
     """
 
     assignee = user_field()
@@ -62,13 +171,15 @@ class TaskSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'comments_count']
 
 
-class TasksBoardDetailsSerializer(serializers.ModelSerializer):
+class TasksBoardDetailsSerializer(SparseFieldsetMixin, SideLoadedUsersMixin, serializers.ModelSerializer):
     """
     Serializer for displaying tasks inside board detail views.
 
     Includes:
     - full task information
-    - assignee and reviewer as nested user data
+    - assignee and reviewer as nested user data (user IDs if side-loaded)
+
+    Supports sparse fieldsets via context['fields'].
     """
    
     assignee = user_field()
@@ -179,17 +290,14 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
     
     def update(self, instance, validated_data):
         """
-        Update all task fields with incoming validated data.
+        Update the task fields with incoming validated data.
+
+        Only the columns whose value changed are written; a PATCH that
+        changes nothing issues no UPDATE at all. With context['expected_version']
+        the write only succeeds if the task still has that version.
         """
 
-        instance.title = validated_data.get('title', instance.title)
-        instance.description = validated_data.get('description', instance.description)
-        instance.status = validated_data.get('status', instance.status)
-        instance.priority = validated_data.get('priority', instance.priority)
-        instance.assignee = validated_data.get('assignee', instance.assignee)
-        instance.reviewer = validated_data.get('reviewer', instance.reviewer)
-        instance.due_date = validated_data.get('due_date', instance.due_date)
-        instance.save()
+        save_changed(instance, apply_changes(instance, validated_data), self.context.get('expected_version'))
         return instance
 
 class TaskCommentSerializer(serializers.ModelSerializer):
@@ -2,7 +2,9 @@ from django.contrib import admin
 from django.urls import path, include
 
 from .views import TaskAssignedToMeView, TaskReviewingView
-from tasks_app.api.views import CreateTaskView, TaskDetailView, TaskCreateCommentView, TaskDeleteCommentView
+from tasks_app.api.async_views import AsyncTaskAssignedToMeView, AsyncTaskReviewingView
+from core.async_views import hybrid_view
+from tasks_app.api.views import CreateTaskView, TaskDetailView, TaskCreateCommentView, TaskDeleteCommentView, TaskSearchView, TaskCommentsView
 
 # URL configuration for task-related API endpoints.
 #
@@ -10,14 +12,21 @@ from tasks_app.api.views import CreateTaskView, TaskDetailView, TaskCreateCommen
 # - POST   /                       → Create a new task (CreateTaskView)
 # - GET    /assigned-to-me/       → List tasks assigned to the current user (TaskAssignedToMeView)
 # - GET    /reviewing/            → List tasks where the current user is the reviewer (TaskReviewingView)
+# - GET    /search/?q=<text>      → Full-text search over tasks and comments (TaskSearchView)
+# - GET    /comments/             → Comments on tasks the user is assigned to or reviewing (TaskCommentsView)
 # - PATCH  /<int:pk>/             → Update a specific task by ID (TaskDetailView)
 # - POST   /<int:pk>/comments/    → Add a comment to a task (TaskCreateCommentView)
 # - DELETE /<int:task_id>/comments/<int:comment_id> → Delete a specific comment from a task (TaskDeleteCommentView)
+#
+# With ASYNC_READ_VIEWS /assigned-to-me/ and /reviewing/ are served by the
+# async views in async_views.py.
 
 urlpatterns = [
     path('', CreateTaskView.as_view(), name='task-create'),
-    path('assigned-to-me/', TaskAssignedToMeView.as_view(), name='assigned-to-me'),
-    path('reviewing/', TaskReviewingView.as_view(), name='task-reviewing'),
+    path('assigned-to-me/', hybrid_view(TaskAssignedToMeView, AsyncTaskAssignedToMeView), name='assigned-to-me'),
+    path('reviewing/', hybrid_view(TaskReviewingView, AsyncTaskReviewingView), name='task-reviewing'),
+    path('search/', TaskSearchView.as_view(), name='task-search'),
+    path('comments/', TaskCommentsView.as_view(), name='my-task-comments'),
     path('<int:pk>/', TaskDetailView.as_view(), name='task-detail'),
     path('<int:pk>/comments/', TaskCreateCommentView.as_view(), name='task-comments'),
     path('<int:task_id>/comments/<int:comment_id>/', TaskDeleteCommentView.as_view(), name='task-delete-comment'),
@@ -1,9 +1,12 @@
+import itertools
+
 from django.http import Http404
 from django.db import models
 from rest_framework.generics import get_object_or_404
 
 
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework.generics import ListCreateAPIView, CreateAPIView, ListAPIView
 from rest_framework.permissions import IsAuthenticated
@@ -11,11 +14,20 @@ from rest_framework import generics
 from rest_framework.exceptions import NotFound, ValidationError, PermissionDenied, ParseError
 
 from tasks_app.api.serializers import TaskSerializer, TaskCreateSerializer, TaskUpdateSerializer, TaskCommentSerializer
+from tasks_app.api.serializers import wants_side_loaded_users, with_side_loaded_users, iter_with_side_loaded_users, side_loaded_users
+from tasks_app.api.filters import BoardTaskQuery, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, comment_feed_keys, comment_feed_cursor
+from tasks_app.api.projections import fast_read_path_enabled, task_projection_for
 from tasks_app.models import Task, TaskComment
+from tasks_app.search import search, search_supported
+from tasks_app.dashboard import dashboard_counts
 from boards_app.api.permissions import IsAuthenticatedWithCustomMessage
 from boards_app.models import Board
 from .permissions import IsMemberOfBoard, IsMemberOfBoardComments, IsAuthorOfComment
 from auth_app.models import CustomUser
+from core.concurrency import PreconditionFailed, if_match_version, with_etag
+from core.fieldsets import requested_fields, restrict_queryset
+from core.streaming import StreamingJSONResponse, iter_json_array, iter_serialized, stream_chunk_size, wants_streaming
+from core.write_pipeline import run_write
 
 
 def internal_error_response_500(e):
@@ -27,6 +39,82 @@ def internal_error_response_500(e):
         status=500
     )
 
+def task_list_response(request, queryset, context, fast_path, empty_detail=None):
+    """
+    Build the response for a list of tasks serialized with TaskSerializer.
+
+    JSON clients get a streamed response that fetches and encodes the tasks
+    in chunks; the browsable API gets a regular Response. With `fast_path`
+    the tasks are built by a TaskProjection instead of the serializer.
+    The queryset is evaluated exactly once; there is no separate
+    `exists()` query for the empty check.
+
+    Args:
+        request: The DRF request.
+        queryset (QuerySet): The tasks to return.
+        context (dict): The serializer context ('fields', 'side_load_users').
+        fast_path (bool): Use the serializer-free read path.
+        empty_detail (str): If given, returned as {"detail": ...} instead
+            of an empty list when there are no tasks.
+
+    Returns:
+        Response or StreamingJSONResponse: The task list.
+    """
+
+    if not fast_path:
+        queryset = join_task_users(queryset, context)
+
+    if wants_streaming(request):
+        if fast_path:
+            chunks = task_projection_for(context).iter_rows(queryset, stream_chunk_size())
+        else:
+            chunks = iter_serialized(queryset, TaskSerializer, context)
+        if empty_detail is not None:
+            first = next(chunks, None)
+            if first is None:
+                return Response({"detail": empty_detail})
+            chunks = itertools.chain([first], chunks)
+        if context['side_load_users']:
+            return StreamingJSONResponse(iter_with_side_loaded_users(chunks))
+        return StreamingJSONResponse(iter_json_array(chunks))
+
+    if fast_path:
+        data = task_projection_for(context).rows(queryset)
+    else:
+        data = TaskSerializer(queryset, many=True, context=context).data
+    if empty_detail is not None and not data:
+        return Response({"detail": empty_detail})
+    if context['side_load_users']:
+        return Response(with_side_loaded_users(data))
+    return Response(data)
+
+def join_task_users(queryset, context):
+    """
+    Join the assignee and reviewer for the nested user representation,
+    so serializing a task list takes one query instead of two per task.
+
+    Not needed when users are side-loaded (only their IDs are read) or with
+    a sparse fieldset (`restrict_queryset` joins the requested users).
+    """
+
+    if context['side_load_users'] or context['fields'] is not None:
+        return queryset
+    return queryset.select_related('assignee', 'reviewer')
+
+def refresh_comments_count(task_id):
+    """
+    Store the task's current number of comments.
+
+    A plain UPDATE that leaves the task's version alone: the count is
+    derived from the comments, and bumping the version would turn every
+    client's ETag stale (and their next If-Match update into a 412) each
+    time someone comments.
+    """
+
+    Task.objects.filter(pk=task_id).update(
+        comments_count=TaskComment.objects.filter(task_id=task_id).count()
+    )
+
 def validate_pk_task(task_id):
     """
     Validate that a task with the given ID exists.
@@ -72,22 +160,31 @@ class TaskAssignedToMeView(ListCreateAPIView):
     View to list all tasks assigned to the authenticated user.
 
     Only GET is allowed. Returns all tasks where the user is the assignee.
+    With `?include=users` the response is {"tasks": [...], "users": {...}}.
+    With `?fields=id,title,...` only the given task fields are returned.
     """
 
     http_method_names = ['get'] 
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticatedWithCustomMessage] 
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['side_load_users'] = wants_side_loaded_users(self.request)
+        context['fields'] = requested_fields(self.request)
+        return context
+
     def get_queryset(self):
         """
-        Return all tasks where the current user is the assignee or reviewer.
+        Return all tasks where the current user is the assignee.
+
+        A plain filter on the indexed assignee column; no OR or DISTINCT.
+        Tasks of deleted boards still waiting for their purge are left out.
 
         Returns:
             QuerySet: Filtered task queryset.
         """
-        return Task.objects.filter(
-            models.Q(assignee=self.request.user) | models.Q(reviewer=self.request.user)
-        ).distinct()
+        return Task.objects.filter(assignee=self.request.user, board__deleted_at__isnull=True)
 
     def list(self, request, *args, **kwargs):
         """
@@ -97,11 +194,12 @@ class TaskAssignedToMeView(ListCreateAPIView):
             Response: JSON list of tasks.
         """
         try:
-            queryset = self.get_queryset().filter(assignee=request.user)
-            if not queryset.exists():
-                return Response({"detail": "No tasks assigned to you."})
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            context = self.get_serializer_context()
+            queryset = restrict_queryset(self.get_queryset(), self.get_serializer(), context['fields'])
+            return task_list_response(
+                request, queryset, context, fast_read_path_enabled('assigned-to-me'),
+                empty_detail="No tasks assigned to you."
+            )
         except Exception as e:
             return internal_error_response_500(e)
     
@@ -162,7 +260,7 @@ class CreateTaskView(CreateAPIView):
 
             serializer = self.get_serializer(data=data)
             serializer.is_valid(raise_exception=True)
-            task = serializer.save()
+            task = run_write(serializer.create, dict(serializer.validated_data))
 
             return Response(TaskSerializer(task).data, status=status.HTTP_201_CREATED)
 
@@ -176,12 +274,21 @@ class CreateTaskView(CreateAPIView):
 class TaskReviewingView(ListAPIView):
     """
     View to list all tasks currently under review by the authenticated user.
+
+    With `?include=users` the response is {"tasks": [...], "users": {...}}.
+    With `?fields=id,title,...` only the given task fields are returned.
     """
     http_method_names = ['get'] 
 
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticatedWithCustomMessage] 
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['side_load_users'] = wants_side_loaded_users(self.request)
+        context['fields'] = requested_fields(self.request)
+        return context
+
     def get_queryset(self):
         """
         Return all tasks where the current user is the reviewer.
@@ -190,7 +297,7 @@ class TaskReviewingView(ListAPIView):
             QuerySet: Tasks to review.
         """
         
-        return Task.objects.filter(reviewer=self.request.user).distinct()
+        return Task.objects.filter(reviewer=self.request.user, board__deleted_at__isnull=True)
 
     def list(self, request, *args, **kwargs):
         """
@@ -200,11 +307,12 @@ class TaskReviewingView(ListAPIView):
             Response: List of task data.
         """
         try:
-            queryset = self.get_queryset()
-            if not queryset.exists():
-                return Response({"detail": "No tasks under review."})
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            context = self.get_serializer_context()
+            queryset = restrict_queryset(self.get_queryset(), self.get_serializer(), context['fields'])
+            return task_list_response(
+                request, queryset, context, fast_read_path_enabled('task-reviewing'),
+                empty_detail="No tasks under review."
+            )
         except Exception as e:
             return internal_error_response_500(e)
 
@@ -213,6 +321,9 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     View to retrieve, update, or delete a specific task.
 
+    Responses carry the task's version as ETag; send it back as `If-Match`
+    to update only if nobody else changed the task in between (412 otherwise).
+
     Permissions:
         - Only members of the associated board can access.
         - Only the assignee or board owner may delete the task.
@@ -229,32 +340,62 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
             QuerySet: All tasks.
         """
         return Task.objects.all()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method in ('PUT', 'PATCH'):
+            context['expected_version'] = if_match_version(self.request)
+        return context
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Return the task with its version as ETag.
+        """
+        instance = self.get_object()
+        return with_etag(Response(self.get_serializer(instance).data), instance)
     
     def update(self, request, *args, **kwargs):
         """
         Update the task with provided data.
 
+        With an `If-Match: "<version>"` header (the ETag of the task) the
+        update is only applied if the task has not been changed since.
+
         Returns:
-            Response: Updated task data.
+            Response: Updated task data with the new ETag.
+
+        Raises:
+            PreconditionFailed: 412 if the task was modified in the meantime.
         """
         try:
-            instance = self.get_object()
-
-            serializer = self.get_serializer(
-                instance, 
-                data=request.data, 
-                partial=kwargs.pop('partial', False)
-            )
-            serializer.is_valid(raise_exception=True)
-            task = serializer.save()
-            return Response(self.get_serializer(task).data, status=status.HTTP_200_OK)
+            task = run_write(self.save_update, request.data, kwargs.pop('partial', False))
+            return with_etag(Response(self.get_serializer(task).data, status=status.HTTP_200_OK), task)
         
+        except PreconditionFailed as e:
+            raise e
+
         except (ValidationError, ParseError, PermissionDenied, Http404, NotFound) as e:
             return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
             return internal_error_response_500(e)
 
+    def save_update(self, data, partial):
+        """
+        Load the task, validate the data against it and save the changes.
+
+        This is the unit `run_write` retries after a lock error, so every
+        attempt starts from a freshly loaded task: the serializer copies the
+        new values onto its instance (and bumps its version) before the
+        write is committed, and reusing that instance would make a retry
+        write nothing or fail with a false 412.
+
+        Returns:
+            Task: The updated task.
+        """
+        serializer = self.get_serializer(self.get_object(), data=data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
 
     def destroy(self, request, *args, **kwargs):
         """
@@ -277,35 +418,65 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
 
         except Exception as e:
             return internal_error_response_500(e)
-        
-        
+
+    def perform_destroy(self, instance):
+        """
+        Delete the task (through the write pipeline if it is enabled).
+
+        Deleted by primary key, since `instance.delete()` clears the
+        instance's pk and could not be retried.
+        """
+        run_write(lambda: Task.objects.filter(pk=instance.pk).delete())
 
 
-class TaskCommentsView(generics.ListAPIView):
+class TaskCommentsView(APIView):
     """
     View to list all comments on tasks where the user is assignee or reviewer.
+
+    GET:
+        Comments are returned oldest first, paginated by a keyset cursor on
+        (created_at, id):
+            ?limit=<n>       Page size (default 50, max 200).
+            ?cursor=<next>   Cursor from the previous page.
+        Response: {"results": [...], "next": <cursor or null>}.
+
+    Permissions:
+        Requires authentication.
     """
 
-    serializer_class = TaskCommentSerializer
     permission_classes = [IsAuthenticatedWithCustomMessage]
 
-    def get_queryset(self):
+    def get(self, request):
         """
-        Return all comments for tasks the user is assigned to or reviewing.
+        Return one page of comments.
 
-        Returns:
-            QuerySet: Filtered comments.
+        The page keys come from a UNION query (see comment_feed_keys), the
+        comments themselves from one lookup by primary key.
+
+        Raises:
+            ValidationError: If the limit or the cursor is invalid.
         """
 
         try:
-            user = self.request.user
-
-            return TaskComment.objects.filter(
-                models.Q(task__assignee=user) | models.Q(task__reviewer=user)
-            ).select_related("task", "author").distinct().order_by("created_at")
+            limit = int(request.query_params.get('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({"limit": "Limit must be an integer."})
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
 
+        try:
+            keys = comment_feed_keys(request.user, request.query_params.get('cursor'), limit)
+            has_next = len(keys) > limit
+            keys = keys[:limit]
+            comments = TaskComment.objects.filter(id__in=[key[1] for key in keys]).select_related('author')
+            comments = sorted(comments, key=lambda comment: (comment.created_at, comment.id))
+            return Response({
+                "results": TaskCommentSerializer(comments, many=True).data,
+                "next": comment_feed_cursor(keys[-1]) if has_next else None,
+            })
+        except ValidationError as e:
+            raise e
         except Exception as e:
-            raise NotFound(f"Error loading the comments: {str(e)}")
+            return internal_error_response_500(e)
 
 
 class TaskCreateCommentView(generics.ListCreateAPIView):
@@ -333,21 +504,36 @@ class TaskCreateCommentView(generics.ListCreateAPIView):
         task = self._get_task(task_id)
         return task.comments.select_related("author").order_by("created_at")
 
+    def list(self, request, *args, **kwargs):
+        """
+        Return the comments of the task, streamed in chunks for JSON clients.
+        """
+
+        if not wants_streaming(request):
+            return super().list(request, *args, **kwargs)
+        chunks = iter_serialized(self.get_queryset(), self.get_serializer_class(), self.get_serializer_context())
+        return StreamingJSONResponse(iter_json_array(chunks))
+
     def perform_create(self, serializer):
         """
         Save a new comment for the specified task and update the task's comment count.
 
+        Both writes run in one transaction, through the write pipeline if
+        it is enabled (see core.write_pipeline.run_write).
+
         Args:
             serializer: Validated serializer instance.
 
         Returns:
             TaskComment: The created comment.
         """
-        task = self._get_task(self.kwargs.get('pk'))
-        comment = serializer.save(author=self.request.user, task=task)
+        serializer.instance = run_write(self._create_comment, serializer.validated_data)
+        return serializer.instance
 
-        task.comments_count = task.comments.count()
-        task.save()
+    def _create_comment(self, validated_data):
+        task = self._get_task(self.kwargs.get('pk'))
+        comment = TaskComment.objects.create(author=self.request.user, task=task, **validated_data)
+        refresh_comments_count(task.pk)
         return comment
 
     def create(self, request, *args, **kwargs):
@@ -452,7 +638,162 @@ class TaskDeleteCommentView(generics.DestroyAPIView):
         Args:
             instance (TaskComment): The comment to delete.
         """
-        task = instance.task
-        instance.delete()
-        task.comments_count = task.comments.count()
-        task.save()
\ No newline at end of file
+        run_write(self._delete_comment, instance)
+
+    def _delete_comment(self, instance):
+        # By primary key: `instance.delete()` clears the pk, so a retry would fail.
+        TaskComment.objects.filter(pk=instance.pk).delete()
+        refresh_comments_count(instance.task_id)
+
+
+class TaskSearchView(APIView):
+    """
+    Full-text search over task titles, descriptions and comments.
+
+    GET:
+        Query params:
+            ?q=<text>     Words to search for; each word matches as a prefix.
+            ?limit=<n>    Maximum number of results (default 20, max 100).
+        Only boards the user owns or is a member of are searched.
+        Results are ranked by relevance (BM25) and contain an HTML-escaped,
+        highlighted snippet.
+
+    Permissions:
+        Requires authentication.
+    """
+
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+    max_limit = 100
+
+    def get(self, request):
+        """
+        Return the ranked search hits for the query.
+
+        Raises:
+            ValidationError: If the query or the limit is missing or invalid.
+        """
+
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            raise ValidationError({"q": "Search query is missing."})
+
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            raise ValidationError({"limit": "Limit must be an integer."})
+        limit = max(1, min(limit, self.max_limit))
+
+        if not search_supported():
+            return Response(
+                {"detail": "Search is not available on this database."},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+
+        try:
+            return Response(search(request.user, text, limit=limit))
+        except Exception as e:
+            return internal_error_response_500(e)
+
+
+class BoardTaskListView(APIView):
+    """
+    Filtered, sorted and paginated list of the tasks of one board.
+
+    GET:
+        Filters, sorting and pagination are described in BoardTaskQuery.
+        Response: {"results": [...], "next": <cursor or null>}; pass `next`
+        as `?cursor=` to get the following page. Tasks are serialized like
+        TaskSerializer; `?fields=` and `?include=users` work as on the other
+        task lists (side-loaded users are returned under "users").
+
+    Permissions:
+        Requires authentication; the user must own or be a member of the board.
+    """
+
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+
+    def check_board_access(self, request, board_id):
+        """
+        Ensure the board exists and the user owns or is a member of it.
+
+        Raises:
+            NotFound: If the board does not exist.
+            PermissionDenied: If the user has no access to the board.
+        """
+
+        if request.user.can_access_board(board_id):
+            return
+        if not Board.objects.filter(pk=board_id).exists():
+            raise NotFound("Board not found.")
+        raise PermissionDenied("You are not a member of this board.")
+
+    def get(self, request, pk):
+        """
+        Return one page of the board's tasks.
+
+        Raises:
+            ValidationError: If a filter, the ordering or the cursor is invalid.
+        """
+
+        self.check_board_access(request, pk)
+        # Parses and validates every parameter, including the cursor, so
+        # invalid input is a 400 before any query runs.
+        query = BoardTaskQuery(request.query_params, request.user)
+        context = {
+            'request': request,
+            'fields': requested_fields(request),
+            'side_load_users': wants_side_loaded_users(request),
+        }
+
+        try:
+            page = query.apply(Task.objects.filter(board_id=pk))[:query.limit + 1]
+            if fast_read_path_enabled('board-tasks'):
+                rows, keys = task_projection_for(context).rows_with_keys(page, query.key_columns())
+            else:
+                page = restrict_queryset(
+                    join_task_users(page, context), TaskSerializer(context=context), context['fields'],
+                    extra_columns=query.key_columns(),
+                )
+                tasks = list(page)
+                rows = TaskSerializer(tasks, many=True, context=context).data
+                keys = [tuple(getattr(task, column) for column in query.key_columns()) for task in tasks]
+
+            has_next = len(rows) > query.limit
+            rows = rows[:query.limit]
+            # The cursor comes from the last row of this page, not from a
+            # second query that could see a different page.
+            data = {"results": rows, "next": query.next_cursor(keys[query.limit - 1]) if has_next else None}
+            if context['side_load_users']:
+                data['users'] = side_loaded_users(rows)
+            return Response(data)
+        except ValidationError as e:
+            raise e
+        except Exception as e:
+            return internal_error_response_500(e)
+
+
+class DashboardView(APIView):
+    """
+    Personal task counts for the home screen.
+
+    GET:
+        Returns per board and in total how many of the user's tasks are
+        assigned to them, under their review, overdue, due this week and of
+        high priority. Computed with one grouped aggregate query, see
+        tasks_app.dashboard.dashboard_counts.
+
+    Permissions:
+        Requires authentication.
+    """
+
+    permission_classes = [IsAuthenticatedWithCustomMessage]
+
+    def get(self, request):
+        """
+        Return the dashboard counts of the authenticated user.
+        """
+
+        try:
+            return Response(dashboard_counts(request.user))
+        except Exception as e:
+            return internal_error_response_500(e)
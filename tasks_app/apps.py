@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(sender, using, **kwargs):
+    """
+    Reinstall the full-text search triggers after migrations.
+
+    SQLite rebuilds a table for many schema changes, which drops its triggers.
+    """
+    from django.db import connections
+    from tasks_app.search import install_search_index, search_index_exists
+
+    connection = connections[using]
+    if search_index_exists(connection):
+        install_search_index(connection)
 
 
 class TasksAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks_app'
+
+    def ready(self):
+        post_migrate.connect(ensure_search_index, sender=self)
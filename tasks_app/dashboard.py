@@ -0,0 +1,54 @@
+import datetime
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from tasks_app.models import Task
+
+
+COUNTERS = ('assigned', 'reviewing', 'overdue', 'due_this_week', 'high_priority')
+
+
+def dashboard_counts(user, today=None):
+    """
+    Count the user's tasks per board with a single grouped query.
+
+    A task belongs to the user if they are its assignee or reviewer. Overdue,
+    due-this-week and high-priority only count tasks that are not done;
+    the week runs from Monday to Sunday.
+
+    Args:
+        user (CustomUser): The user the dashboard is built for.
+        today (date): Reference date, defaults to the current local date.
+
+    Returns:
+        dict: {"boards": [per-board counts], "total": counts over all boards}.
+    """
+
+    today = today or timezone.localdate()
+    week_start = today - datetime.timedelta(days=today.weekday())
+    week_end = week_start + datetime.timedelta(days=6)
+    open_tasks = ~Q(status=Task.STATUS_DONE)
+
+    rows = (
+        Task.objects
+        .filter(Q(assignee=user) | Q(reviewer=user), board__deleted_at__isnull=True)
+        .values('board_id', 'board__title')
+        .annotate(
+            assigned=Count('id', filter=Q(assignee=user)),
+            reviewing=Count('id', filter=Q(reviewer=user)),
+            overdue=Count('id', filter=open_tasks & Q(due_date__lt=today)),
+            due_this_week=Count('id', filter=open_tasks & Q(due_date__range=(week_start, week_end))),
+            high_priority=Count('id', filter=open_tasks & Q(priority=Task.PRIORITY_HIGH)),
+        )
+        .order_by('board_id')
+    )
+
+    boards = []
+    total = dict.fromkeys(COUNTERS, 0)
+    for row in rows:
+        counts = {name: row[name] for name in COUNTERS}
+        boards.append({'board_id': row['board_id'], 'title': row['board__title'], **counts})
+        for name in COUNTERS:
+            total[name] += counts[name]
+    return {'boards': boards, 'total': total}
@@ -0,0 +1,113 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+
+from auth_app.models import CustomUser
+from boards_app.models import Board
+from tasks_app.api.filters import comment_feed_cursor, comment_feed_keys
+from tasks_app.models import Task, TaskComment
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the comment feed of TaskCommentsView.
+
+    Creates users, tasks and comments inside a transaction that is rolled
+    back at the end, then times the former OR/DISTINCT query against the
+    UNION keyset query: the whole feed (as the view used to return it)
+    against one page, and page by page for the first page and a page deep
+    in the feed. Both queries must return the same comments.
+    """
+
+    help = 'Compare the OR/DISTINCT and the UNION comment feed queries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--comments', type=int, default=1000000, help='Number of generated comments.')
+        parser.add_argument('--tasks', type=int, default=20000, help='Number of generated tasks.')
+        parser.add_argument('--users', type=int, default=200, help='Number of generated users.')
+        parser.add_argument('--limit', type=int, default=50, help='Page size.')
+        parser.add_argument('--repeat', type=int, default=5, help='Timing runs per query (best is reported).')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self._create_data(options['comments'], options['tasks'], options['users'])
+            self._benchmark(user, options['limit'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def _create_data(self, comment_count, task_count, user_count):
+        self.stdout.write(f'Creating {comment_count} comments on {task_count} tasks...')
+        users = CustomUser.objects.bulk_create([
+            CustomUser(
+                email=f'bench-{i}@kanmind.invalid',
+                email_key=f'bench-{i}@kanmind.invalid',
+                fullname=f'Bench User {i}',
+            )
+            for i in range(user_count)
+        ])
+        board = Board.objects.create(title='Comment feed benchmark', owner=users[0])
+        tasks = Task.objects.bulk_create([
+            Task(
+                board=board,
+                title=f'Task {i}',
+                assignee=users[i % user_count],
+                reviewer=users[(i * 7 + 3) % user_count],
+            )
+            for i in range(task_count)
+        ], batch_size=5000)
+
+        batch = []
+        for i in range(comment_count):
+            batch.append(TaskComment(
+                task=tasks[i % task_count],
+                author=users[i % user_count],
+                content=f'Comment {i}',
+            ))
+            if len(batch) == 10000:
+                TaskComment.objects.bulk_create(batch)
+                batch = []
+        TaskComment.objects.bulk_create(batch)
+        return users[0]
+
+    def _time(self, fn, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def _benchmark(self, user, limit, repeat):
+        or_distinct = TaskComment.objects.filter(
+            models.Q(task__assignee=user) | models.Q(task__reviewer=user)
+        ).distinct().order_by('created_at', 'id').values_list('created_at', 'id')
+
+        total = or_distinct.count()
+        if total <= limit:
+            raise CommandError('Not enough comments for the user; increase --comments.')
+        middle = or_distinct[total // 2]
+        cursor = comment_feed_cursor(middle)
+        self.stdout.write(f'The user sees {total} comments.')
+
+        cases = [
+            ('first page', None, lambda: list(or_distinct.all()[:limit + 1])),
+            ('deep page', cursor, lambda: list(or_distinct.all().filter(
+                models.Q(created_at__gt=middle[0]) | models.Q(created_at=middle[0], id__gt=middle[1])
+            )[:limit + 1])),
+        ]
+        full_time, _ = self._time(lambda: list(or_distinct.all()), repeat)
+        page_time, _ = self._time(lambda: comment_feed_keys(user, None, limit), repeat)
+        self.stdout.write(
+            f'{"whole feed":<10}  OR/DISTINCT {full_time * 1000:8.2f} ms   '
+            f'UNION page {page_time * 1000:8.2f} ms   (former unpaginated view vs. one page)'
+        )
+        for label, page_cursor, old_query in cases:
+            old_time, old_keys = self._time(old_query, repeat)
+            new_time, new_keys = self._time(lambda: comment_feed_keys(user, page_cursor, limit), repeat)
+            if [key[1] for key in old_keys] != [key[1] for key in new_keys]:
+                raise CommandError(f'{label}: the queries return different comments.')
+            self.stdout.write(
+                f'{label:<10}  OR/DISTINCT {old_time * 1000:8.2f} ms   '
+                f'UNION {new_time * 1000:8.2f} ms   ({old_time / new_time:.1f}x)'
+            )
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+
+from core.db import is_lock_error, run_with_retry
+from core.write_pipeline import WritePipeline
+
+
+PROFILES = {
+    # Django's defaults: rollback journal, deferred transactions.
+    'default': {'OPTIONS': {}, 'CONN_MAX_AGE': 0},
+    'production': {
+        'OPTIONS': settings.SQLITE_PRODUCTION_OPTIONS,
+        'CONN_MAX_AGE': settings.SQLITE_PRODUCTION_CONN_MAX_AGE,
+    },
+}
+
+SCHEMA = [
+    'CREATE TABLE bench_task (id INTEGER PRIMARY KEY, comments_count INTEGER NOT NULL)',
+    'CREATE TABLE bench_comment (id INTEGER PRIMARY KEY, task_id INTEGER NOT NULL, content TEXT NOT NULL)',
+    'CREATE INDEX bench_comment_task ON bench_comment (task_id)',
+]
+
+
+class Command(BaseCommand):
+    """
+    Benchmark concurrent writers on SQLite with and without the production
+    profile (core.settings.SQLITE_PRODUCTION_OPTIONS), the lock retry
+    policy (core.db.run_with_retry) and the write pipeline
+    (core.write_pipeline).
+
+    Every profile gets its own temporary database file. Writer threads run
+    the same transaction as posting a comment: read the task, insert the
+    comment, recount and update the task. Reported are committed
+    transactions per second and transactions lost to "database is locked".
+    """
+
+    help = 'Measure concurrent write throughput of the SQLite database profiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent writer threads.')
+        parser.add_argument('--writes', type=int, default=200, help='Transactions per thread.')
+        parser.add_argument('--tasks', type=int, default=50, help='Number of tasks the comments are spread over.')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in PROFILES:
+                for mode in ('direct', 'retry', 'pipeline'):
+                    alias = self._register(profile, os.path.join(directory, f'{profile}-{mode}.sqlite3'))
+                    try:
+                        self._run(alias, profile, mode, options)
+                    finally:
+                        connections[alias].close()
+
+    def _register(self, profile, path):
+        alias = f'bench_{profile}_{os.path.basename(path)}'
+        connections.settings[alias] = connections.configure_settings({
+            'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': path, **PROFILES[profile]},
+        })['default']
+        return alias
+
+    def _run(self, alias, profile, mode, options):
+        with connections[alias].cursor() as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+            cursor.executemany(
+                'INSERT INTO bench_task (id, comments_count) VALUES (%s, 0)',
+                [(i,) for i in range(options['tasks'])],
+            )
+
+        committed = []
+        failed = []
+        reuse_connections = bool(PROFILES[profile]['CONN_MAX_AGE'])
+        pipeline = WritePipeline(using=alias) if mode == 'pipeline' else None
+
+        def add_comment(task_id, n):
+            with connections[alias].cursor() as cursor:
+                cursor.execute('SELECT comments_count FROM bench_task WHERE id = %s', [task_id])
+                cursor.fetchone()
+                cursor.execute('INSERT INTO bench_comment (task_id, content) VALUES (%s, %s)', [task_id, f'comment {n}'])
+                cursor.execute('SELECT COUNT(*) FROM bench_comment WHERE task_id = %s', [task_id])
+                count = cursor.fetchone()[0]
+                cursor.execute('UPDATE bench_task SET comments_count = %s WHERE id = %s', [count, task_id])
+
+        def writer(index):
+            for n in range(options['writes']):
+                task_id = (index * options['writes'] + n) % options['tasks']
+                try:
+                    if pipeline is not None:
+                        pipeline.run(add_comment, task_id, n)
+                    else:
+                        run_with_retry(add_comment, task_id, n, using=alias, attempts=None if mode == 'retry' else 1)
+                    committed.append(1)
+                except OperationalError as exc:
+                    if not is_lock_error(exc):
+                        raise
+                    failed.append(1)
+                if not reuse_connections:
+                    # Like the end of a request with CONN_MAX_AGE = 0.
+                    connections[alias].close()
+            connections[alias].close()
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(options['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        if pipeline is not None:
+            pipeline.stop()
+
+        self.stdout.write(
+            f'{profile:<10} {mode:<8}  '
+            f'{len(committed) / elapsed:8.0f} commits/s   '
+            f'{len(committed):6d} committed   {len(failed):6d} locked'
+        )
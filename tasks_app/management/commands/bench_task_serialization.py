@@ -0,0 +1,111 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from auth_app.models import CustomUser
+from boards_app.models import Board
+from tasks_app.api.projections import TaskProjection
+from tasks_app.api.serializers import TaskSerializer, TasksBoardDetailsSerializer
+from tasks_app.models import Task
+
+
+VARIANTS = [
+    {'include_board': True, 'fields': None, 'side_load_users': False},
+    {'include_board': True, 'fields': None, 'side_load_users': True},
+    {'include_board': True, 'fields': frozenset({'id', 'title', 'status', 'priority'}), 'side_load_users': False},
+    {'include_board': True, 'fields': frozenset({'id', 'assignee', 'due_date'}), 'side_load_users': False},
+    {'include_board': False, 'fields': None, 'side_load_users': False},
+    {'include_board': False, 'fields': frozenset({'id', 'reviewer'}), 'side_load_users': True},
+]
+
+
+class Command(BaseCommand):
+    """
+    Compare the serializer-free task projection with the DRF serializers.
+
+    Creates a throw-away board with generated tasks inside a transaction
+    that is rolled back at the end. For every variant (sparse fieldsets,
+    side-loaded users, board detail shape) the rendered JSON of both paths
+    must be byte-identical; afterwards both paths are timed.
+    """
+
+    help = 'Verify and benchmark the fast task read path against the serializers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10000, help='Number of generated tasks.')
+        parser.add_argument('--repeat', type=int, default=3, help='Timing runs per path (best is reported).')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            board = self._create_data(options['tasks'])
+            mismatches = self._compare(board)
+            self._benchmark(board, options['repeat'])
+            transaction.set_rollback(True)
+
+        if mismatches:
+            raise CommandError(f'{mismatches} variant(s) differ from the serializer output.')
+        self.stdout.write(self.style.SUCCESS('All variants are byte-identical.'))
+
+    def _create_data(self, count):
+        users = [
+            CustomUser(
+                email=f'bench-{i}@kanmind.invalid',
+                email_key=f'bench-{i}@kanmind.invalid',
+                fullname=f'Bench User {i}',
+            )
+            for i in range(5)
+        ]
+        users = CustomUser.objects.bulk_create(users)
+        board = Board.objects.create(title='Serialization benchmark', owner=users[0])
+        statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+        priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+
+        Task.objects.bulk_create([
+            Task(
+                board=board,
+                title=f'Task {i} – äöü "quoted"',
+                description=None if i % 7 == 0 else f'Description of task {i}\nline two',
+                status=statuses[i % len(statuses)],
+                priority=priorities[i % len(priorities)],
+                assignee=None if i % 5 == 0 else users[i % len(users)],
+                reviewer=None if i % 3 == 0 else users[(i + 1) % len(users)],
+                due_date=None if i % 11 == 0 else f'2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+                comments_count=i % 4,
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        return board
+
+    def _serializer_data(self, board, variant):
+        context = {'fields': variant['fields'], 'side_load_users': variant['side_load_users']}
+        serializer_class = TaskSerializer if variant['include_board'] else TasksBoardDetailsSerializer
+        queryset = Task.objects.filter(board=board).select_related('assignee', 'reviewer')
+        return serializer_class(queryset, many=True, context=context).data
+
+    def _projection_data(self, board, variant):
+        projection = TaskProjection.get(**variant)
+        return projection.rows(Task.objects.filter(board=board))
+
+    def _compare(self, board):
+        renderer = JSONRenderer()
+        mismatches = 0
+        for variant in VARIANTS:
+            expected = renderer.render(self._serializer_data(board, variant))
+            actual = renderer.render(self._projection_data(board, variant))
+            if expected != actual:
+                mismatches += 1
+                self.stdout.write(self.style.ERROR(f'Mismatch for {variant}'))
+        return mismatches
+
+    def _benchmark(self, board, repeat):
+        renderer = JSONRenderer()
+        variant = VARIANTS[0]
+        for label, build in (('serializer', self._serializer_data), ('projection', self._projection_data)):
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                renderer.render(build(board, variant))
+                timings.append(time.perf_counter() - start)
+            self.stdout.write(f'{label:>10}: {min(timings) * 1000:.1f} ms')
@@ -0,0 +1,78 @@
+import itertools
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http import QueryDict
+
+from tasks_app.api.filters import BoardTaskQuery, SORT_FIELDS, encode_cursor
+from tasks_app.models import Task
+
+
+FILTERS = [
+    {},
+    {'status': 'review'},
+    {'priority': 'high'},
+    {'assignee': '1'},
+    {'assignee': 'none'},
+    {'reviewer': '1'},
+    {'due_from': '2025-01-01', 'due_to': '2025-12-31'},
+    {'overdue': 'true'},
+]
+
+# Combinations whose index does not cover the sort (a due date range sorted
+# by title or id) still search an index, but SQLite sorts the matching rows.
+# They are reported, not treated as failure.
+SORTED_IN_MEMORY = 'USE TEMP B-TREE'
+
+
+class _User:
+    id = 1
+
+
+class Command(BaseCommand):
+    """
+    Print the SQLite query plan of every filter/sort combination of the
+    board task list and check that each one is served by an index.
+
+    Fails if any combination scans the task table instead of searching
+    one of the board indexes.
+    """
+
+    help = 'EXPLAIN the board task list queries for all filter and sort combinations.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, default=1, help='Board ID used in the queries.')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan of every query.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The query plan checks are written for SQLite.')
+
+        failures = 0
+        orderings = [prefix + key for key in SORT_FIELDS for prefix in ('', '-')]
+        for filters, ordering, paged in itertools.product(FILTERS, orderings, (False, True)):
+            params = QueryDict(mutable=True)
+            params.update(filters)
+            params['ordering'] = ordering
+            if paged:
+                value = 'x' if ordering.lstrip('-') == 'title' else '2025-06-01'
+                params['cursor'] = encode_cursor([1 if ordering.lstrip('-') == 'id' else value, 1])
+
+            query = BoardTaskQuery(params, _User())
+            queryset = query.apply(Task.objects.filter(board_id=options['board']))[:query.limit + 1]
+            plan = queryset.values_list('id').explain()
+
+            label = f"{dict(filters) or 'no filter'} ordering={ordering}{' +cursor' if paged else ''}"
+            scans = [line for line in plan.splitlines() if 'SCAN' in line and 'USING' not in line]
+            if scans:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f'FULL SCAN  {label}'))
+            elif SORTED_IN_MEMORY in plan:
+                self.stdout.write(self.style.WARNING(f'INDEX+SORT {label}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'INDEX      {label}'))
+            if options['verbose_plans'] or scans:
+                self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f'{failures} query plan(s) scan the task table.')
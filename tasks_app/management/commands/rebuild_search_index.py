@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks_app.search import rebuild_search_index, search_supported
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the full-text search index of tasks and comments.
+
+    Needed after restoring data that bypassed the triggers, e.g. a database
+    copied from a system without the search index.
+    """
+
+    help = 'Rebuild the FTS5 search index over task titles, descriptions and comments.'
+
+    def handle(self, *args, **options):
+        if not search_supported():
+            raise CommandError('Full-text search requires the SQLite backend.')
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
@@ -0,0 +1,104 @@
+from django.db import migrations
+
+
+# A frozen copy of tasks_app.search as of this migration, so later changes
+# to that module do not change what this migration does. The FTS5 tables
+# use the task and comment tables as external content; the triggers keep
+# them in sync with every write.
+SEARCH_INDEX_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_app_task_fts USING fts5(
+        title, description,
+        content='tasks_app_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_app_taskcomment_fts USING fts5(
+        content,
+        content='tasks_app_taskcomment', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_task_fts_insert AFTER INSERT ON tasks_app_task BEGIN
+        INSERT INTO tasks_app_task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_task_fts_delete AFTER DELETE ON tasks_app_task BEGIN
+        INSERT INTO tasks_app_task_fts(tasks_app_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_task_fts_update AFTER UPDATE OF title, description ON tasks_app_task BEGIN
+        INSERT INTO tasks_app_task_fts(tasks_app_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_app_task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_taskcomment_fts_insert AFTER INSERT ON tasks_app_taskcomment BEGIN
+        INSERT INTO tasks_app_taskcomment_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_taskcomment_fts_delete AFTER DELETE ON tasks_app_taskcomment BEGIN
+        INSERT INTO tasks_app_taskcomment_fts(tasks_app_taskcomment_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_taskcomment_fts_update AFTER UPDATE OF content ON tasks_app_taskcomment BEGIN
+        INSERT INTO tasks_app_taskcomment_fts(tasks_app_taskcomment_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+        INSERT INTO tasks_app_taskcomment_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+]
+
+DROP_SEARCH_INDEX_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_app_task_fts_insert",
+    "DROP TRIGGER IF EXISTS tasks_app_task_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_app_task_fts_update",
+    "DROP TRIGGER IF EXISTS tasks_app_taskcomment_fts_insert",
+    "DROP TRIGGER IF EXISTS tasks_app_taskcomment_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_app_taskcomment_fts_update",
+    "DROP TABLE IF EXISTS tasks_app_task_fts",
+    "DROP TABLE IF EXISTS tasks_app_taskcomment_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for statement in SEARCH_INDEX_SQL:
+            cursor.execute(statement)
+        for table in ('tasks_app_task_fts', 'tasks_app_taskcomment_fts'):
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+
+
+def remove_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for statement in DROP_SEARCH_INDEX_SQL:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_app', '0007_alter_task_due_date'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, remove_search_index),
+    ]
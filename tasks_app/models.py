@@ -49,6 +49,7 @@ class Task(models.Model):
     reviewer = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='reviewed_tasks', blank=True, null=True)
     due_date = models.DateField(null=True, blank=True)
     comments_count = models.PositiveIntegerField(default=0)
+    version = models.PositiveIntegerField(default=1, editable=False)
     
     def __str__(self):
         """
@@ -59,7 +60,17 @@ class Task(models.Model):
     class Meta:
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
-        ordering = ['title'] 
+        ordering = ['title']
+        # Serve the board task list (see tasks_app.api.filters): an equality
+        # filter followed by the due date sort/range and the id tie-breaker.
+        indexes = [
+            models.Index(fields=['board', 'due_date', 'id'], name='task_board_due_idx'),
+            models.Index(fields=['board', 'status', 'due_date', 'id'], name='task_board_status_due_idx'),
+            models.Index(fields=['board', 'priority', 'due_date', 'id'], name='task_board_priority_due_idx'),
+            models.Index(fields=['board', 'assignee', 'due_date', 'id'], name='task_board_assignee_due_idx'),
+            models.Index(fields=['board', 'reviewer', 'due_date', 'id'], name='task_board_reviewer_due_idx'),
+            models.Index(fields=['board', 'title', 'id'], name='task_board_title_idx'),
+        ]
 
 class TaskComment(models.Model):
     """
@@ -85,4 +96,9 @@ class TaskComment(models.Model):
     class Meta:
         verbose_name = "Task-Comment"
         verbose_name_plural = "Task-Comments"
-        ordering = ['created_at'] 
\ No newline at end of file
+        ordering = ['created_at']
+        # Serves the comments of a task in (created_at, id) keyset order.
+        indexes = [
+            models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_idx'),
+        ]
+ 
\ No newline at end of file
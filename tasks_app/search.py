@@ -0,0 +1,254 @@
+import html
+import re
+
+from django.db import connection as default_connection
+
+
+# FTS5 tables use the task and comment tables as external content, so the
+# text is stored only once. The triggers keep the index in sync with every
+# write, including bulk and raw SQL writes.
+SEARCH_INDEX_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_app_task_fts USING fts5(
+        title, description,
+        content='tasks_app_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_app_taskcomment_fts USING fts5(
+        content,
+        content='tasks_app_taskcomment', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_task_fts_insert AFTER INSERT ON tasks_app_task BEGIN
+        INSERT INTO tasks_app_task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_task_fts_delete AFTER DELETE ON tasks_app_task BEGIN
+        INSERT INTO tasks_app_task_fts(tasks_app_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_task_fts_update AFTER UPDATE OF title, description ON tasks_app_task BEGIN
+        INSERT INTO tasks_app_task_fts(tasks_app_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tasks_app_task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_taskcomment_fts_insert AFTER INSERT ON tasks_app_taskcomment BEGIN
+        INSERT INTO tasks_app_taskcomment_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_taskcomment_fts_delete AFTER DELETE ON tasks_app_taskcomment BEGIN
+        INSERT INTO tasks_app_taskcomment_fts(tasks_app_taskcomment_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_app_taskcomment_fts_update AFTER UPDATE OF content ON tasks_app_taskcomment BEGIN
+        INSERT INTO tasks_app_taskcomment_fts(tasks_app_taskcomment_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+        INSERT INTO tasks_app_taskcomment_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+]
+
+DROP_SEARCH_INDEX_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_app_task_fts_insert",
+    "DROP TRIGGER IF EXISTS tasks_app_task_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_app_task_fts_update",
+    "DROP TRIGGER IF EXISTS tasks_app_taskcomment_fts_insert",
+    "DROP TRIGGER IF EXISTS tasks_app_taskcomment_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_app_taskcomment_fts_update",
+    "DROP TABLE IF EXISTS tasks_app_task_fts",
+    "DROP TABLE IF EXISTS tasks_app_taskcomment_fts",
+]
+
+SEARCH_SQL = """
+    WITH accessible_boards(id) AS (
+        SELECT id FROM boards_app_board
+        WHERE deleted_at IS NULL AND (
+            owner_id = %(user_id)s
+            OR id IN (SELECT board_id FROM boards_app_board_members WHERE customuser_id = %(user_id)s)
+        )
+    )
+    SELECT type, task_id, comment_id, board_id, title FROM (
+        SELECT *, COALESCE(score / NULLIF(MIN(score) OVER (), 0), 0) AS relevance FROM (
+            SELECT 'task' AS type, t.id AS task_id, NULL AS comment_id, t.board_id, t.title,
+                   bm25(tasks_app_task_fts, 10.0, 1.0) AS score
+            FROM tasks_app_task_fts
+            JOIN tasks_app_task t ON t.id = tasks_app_task_fts.rowid
+            WHERE tasks_app_task_fts MATCH %(query)s
+              AND t.board_id IN (SELECT id FROM accessible_boards)
+        )
+        UNION ALL
+        SELECT *, COALESCE(score / NULLIF(MIN(score) OVER (), 0), 0) FROM (
+            SELECT 'comment' AS type, t.id AS task_id, c.id AS comment_id, t.board_id, t.title,
+                   bm25(tasks_app_taskcomment_fts) AS score
+            FROM tasks_app_taskcomment_fts
+            JOIN tasks_app_taskcomment c ON c.id = tasks_app_taskcomment_fts.rowid
+            JOIN tasks_app_task t ON t.id = c.task_id
+            WHERE tasks_app_taskcomment_fts MATCH %(query)s
+              AND t.board_id IN (SELECT id FROM accessible_boards)
+        )
+    )
+    ORDER BY relevance DESC, task_id, comment_id
+    LIMIT %(limit)s
+"""
+
+# Snippets are only built for the hits on the page, not for every match.
+SNIPPET_SQL = {
+    'task': """
+        SELECT rowid, snippet(tasks_app_task_fts, -1, %s, %s, '…', 16)
+        FROM tasks_app_task_fts WHERE tasks_app_task_fts MATCH %s AND rowid IN ({})
+    """,
+    'comment': """
+        SELECT rowid, snippet(tasks_app_taskcomment_fts, 0, %s, %s, '…', 16)
+        FROM tasks_app_taskcomment_fts WHERE tasks_app_taskcomment_fts MATCH %s AND rowid IN ({})
+    """,
+}
+
+# Placeholders FTS5 puts around matches; replaced by the highlight markup
+# once the snippet has been HTML-escaped (private use characters, which
+# normal text does not contain).
+MATCH_START = '\ue000'
+MATCH_END = '\ue001'
+
+SEARCH_COLUMNS = ['type', 'task_id', 'comment_id', 'board_id', 'title', 'snippet']
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_supported(connection=default_connection):
+    """
+    Return True if the database backend provides the FTS5 search index.
+    """
+    return connection.vendor == 'sqlite'
+
+
+def search_index_exists(connection=default_connection):
+    """
+    Return True if the FTS5 tables have been created by the migration.
+    """
+    if not search_supported(connection):
+        return False
+    return 'tasks_app_task_fts' in connection.introspection.table_names()
+
+
+def install_search_index(connection=default_connection):
+    """
+    Create the FTS5 tables and triggers if they do not exist yet.
+
+    Safe to call repeatedly. It runs after every migration because SQLite
+    table rebuilds (e.g. when adding a column) drop the triggers.
+    """
+    if not search_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        for statement in SEARCH_INDEX_SQL:
+            cursor.execute(statement)
+
+
+def drop_search_index(connection=default_connection):
+    """
+    Remove the FTS5 tables and their triggers.
+    """
+    if not search_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        for statement in DROP_SEARCH_INDEX_SQL:
+            cursor.execute(statement)
+
+
+def rebuild_search_index(connection=default_connection):
+    """
+    Rebuild both FTS5 indexes from the task and comment tables.
+    """
+    install_search_index(connection)
+    if not search_supported(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("INSERT INTO tasks_app_task_fts(tasks_app_task_fts) VALUES ('rebuild')")
+        cursor.execute("INSERT INTO tasks_app_taskcomment_fts(tasks_app_taskcomment_fts) VALUES ('rebuild')")
+        cursor.execute("INSERT INTO tasks_app_task_fts(tasks_app_task_fts) VALUES ('optimize')")
+        cursor.execute("INSERT INTO tasks_app_taskcomment_fts(tasks_app_taskcomment_fts) VALUES ('optimize')")
+
+
+def build_match_query(text):
+    """
+    Turn user input into a safe FTS5 query.
+
+    Every word is quoted (so FTS5 operators in the input have no effect)
+    and matched as a prefix. All words must match.
+
+    Returns:
+        str or None: The MATCH expression, or None if the input has no words.
+    """
+    tokens = TOKEN_RE.findall(text)
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def highlight_snippet(snippet, highlight):
+    """
+    HTML-escape a snippet and wrap its matches in the highlight markup.
+
+    The snippet is user content, so it is escaped before the markup is
+    added; clients can render it as HTML.
+    """
+    if snippet is None:
+        return None
+    escaped = html.escape(snippet)
+    return escaped.replace(MATCH_START, highlight[0]).replace(MATCH_END, highlight[1])
+
+
+def search(user, text, limit=20, highlight=('<mark>', '</mark>')):
+    """
+    Full-text search over task titles, descriptions and comments.
+
+    Only tasks on boards the user owns or is a member of are returned.
+    Results are ranked by BM25, title matches weigh more than descriptions.
+    BM25 scores of the task and the comment index are not comparable, so
+    each is divided by the best score of its own index and the hits are
+    ranked by that relevance (1.0 = best hit of its kind).
+
+    Args:
+        user (CustomUser): The searching user.
+        text (str): The raw search input.
+        limit (int): Maximum number of results.
+        highlight (tuple): Markup placed around matches in the snippets,
+            which are HTML-escaped (see `highlight_snippet`).
+
+    Returns:
+        list: One dict per hit with the keys in SEARCH_COLUMNS.
+    """
+    query = build_match_query(text)
+    if query is None:
+        return []
+
+    params = {'user_id': user.id, 'query': query, 'limit': limit}
+    with default_connection.cursor() as cursor:
+        cursor.execute(SEARCH_SQL, params)
+        hits = [dict(zip(SEARCH_COLUMNS, row)) for row in cursor.fetchall()]
+
+        snippets = {}
+        for kind, sql in SNIPPET_SQL.items():
+            ids = [hit['comment_id' if kind == 'comment' else 'task_id'] for hit in hits if hit['type'] == kind]
+            if ids:
+                cursor.execute(sql.format(', '.join(['%s'] * len(ids))), [MATCH_START, MATCH_END, query, *ids])
+                snippets.update(((kind, rowid), snippet) for rowid, snippet in cursor.fetchall())
+
+    for hit in hits:
+        rowid = hit['comment_id'] if hit['type'] == 'comment' else hit['task_id']
+        hit['snippet'] = highlight_snippet(snippets.get((hit['type'], rowid)), highlight)
+    return hits
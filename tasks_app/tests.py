@@ -0,0 +1,611 @@
+import datetime
+import itertools
+from unittest import mock
+
+from django.db import connection
+from django.http import QueryDict
+from django.utils import timezone
+from django.test import TestCase, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from auth_app.models import CustomUser
+from boards_app.deletion import request_board_deletion
+from boards_app.models import Board
+from core.streaming import iter_json_array
+from tasks_app.api.filters import BoardTaskQuery, SORT_FIELDS, encode_cursor
+from tasks_app.api.projections import TaskProjection
+from tasks_app.api.serializers import TaskSerializer, TasksBoardDetailsSerializer
+from tasks_app.dashboard import COUNTERS, dashboard_counts
+from tasks_app.models import Task, TaskComment
+from tasks_app.search import search_supported
+
+
+def create_user(email, fullname='Test User'):
+    # No password: hashing would dominate the test run.
+    return CustomUser.objects.create_user(email=email, password=None, fullname=fullname)
+
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.get_or_create(user=user)[0].key}')
+    return client
+
+
+def create_tasks(board, users, count):
+    # Covers the cases the projection converts by hand: missing users,
+    # descriptions and due dates, non-ASCII and quotes in strings.
+    statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+    priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+    return Task.objects.bulk_create([
+        Task(
+            board=board,
+            title=f'Task {i} – äöü "quoted" \\ <b>',
+            description=None if i % 7 == 0 else f'Description of task {i}\nline two',
+            status=statuses[i % len(statuses)],
+            priority=priorities[i % len(priorities)],
+            assignee=None if i % 5 == 0 else users[i % len(users)],
+            reviewer=None if i % 3 == 0 else users[(i + 1) % len(users)],
+            due_date=None if i % 11 == 0 else f'2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+            comments_count=i % 4,
+        )
+        for i in range(count)
+    ])
+
+
+class TaskProjectionTests(TestCase):
+    """
+    The serializer-free projection must render exactly like the serializers.
+    """
+
+    TASK_FIELDS = TaskSerializer.Meta.fields
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [create_user(f'user-{i}@example.com', f'Üser "{i}"') for i in range(4)]
+        cls.board = Board.objects.create(title='Board', owner=cls.users[0], member_count=4)
+        cls.board.members.add(*cls.users)
+        create_tasks(cls.board, cls.users, 40)
+
+    def variants(self):
+        fieldsets = [None, frozenset({'id', 'assignee', 'due_date'}), frozenset({'unknown'})]
+        fieldsets += [frozenset({name}) for name in self.TASK_FIELDS]
+        for include_board, fields, side_load_users in itertools.product((True, False), fieldsets, (False, True)):
+            yield {'include_board': include_board, 'fields': fields, 'side_load_users': side_load_users}
+
+    def queryset(self):
+        return Task.objects.filter(board=self.board).order_by('id')
+
+    def serialized(self, variant):
+        serializer_class = TaskSerializer if variant['include_board'] else TasksBoardDetailsSerializer
+        context = {'fields': variant['fields'], 'side_load_users': variant['side_load_users']}
+        tasks = self.queryset().select_related('assignee', 'reviewer')
+        return JSONRenderer().render(serializer_class(tasks, many=True, context=context).data)
+
+    def test_rows_render_like_the_serializers(self):
+        for variant in self.variants():
+            with self.subTest(**variant):
+                rows = TaskProjection.get(**variant).rows(self.queryset())
+                self.assertEqual(JSONRenderer().render(rows), self.serialized(variant))
+
+    def test_chunked_and_keyed_rows_match_rows(self):
+        for variant in self.variants():
+            with self.subTest(**variant):
+                projection = TaskProjection.get(**variant)
+                rows = projection.rows(self.queryset())
+                chunks = list(projection.iter_rows(self.queryset(), 7))
+                self.assertEqual([row for chunk in chunks for row in chunk], rows)
+                self.assertTrue(all(len(chunk) <= 7 for chunk in chunks))
+                keyed_rows, keys = projection.rows_with_keys(self.queryset(), ('due_date', 'id'))
+                self.assertEqual(keyed_rows, rows)
+                self.assertEqual(keys, list(self.queryset().values_list('due_date', 'id')))
+
+
+class FastReadEndpointTests(TestCase):
+    """
+    Every endpoint in FAST_READ_ENDPOINTS must answer exactly like its
+    serializer path.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [create_user(f'user-{i}@example.com', f'User {i}') for i in range(3)]
+        cls.user = cls.users[0]
+        cls.board = Board.objects.create(title='Board', owner=cls.user, member_count=3)
+        cls.board.members.add(*cls.users)
+        create_tasks(cls.board, cls.users, 30)
+
+    def setUp(self):
+        self.client = client_for(self.user)
+
+    def urls(self):
+        board_url = f'/api/boards/{self.board.pk}/'
+        for url in ('/api/tasks/assigned-to-me/', '/api/tasks/reviewing/', board_url, f'{board_url}tasks/'):
+            for params in ({}, {'fields': 'id,assignee,due_date'}, {'include': 'users'}):
+                yield url, params
+
+    def get(self, url, params):
+        response = self.client.get(url, params, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        if response.streaming:
+            return b''.join(response.streaming_content)
+        return response.content
+
+    def test_fast_path_matches_serializer_path(self):
+        for url, params in self.urls():
+            with self.subTest(url=url, **params):
+                fast = self.get(url, params)
+                with override_settings(FAST_READ_ENDPOINTS=[]):
+                    self.assertEqual(fast, self.get(url, params))
+
+
+class TaskListQueryCountTests(TestCase):
+    """
+    The assigned-to-me and reviewing lists read their tasks with one query,
+    whichever path, representation and response type serves them.
+    """
+
+    URLS = ('/api/tasks/assigned-to-me/', '/api/tasks/reviewing/')
+    PARAMS = ({}, {'fields': 'id,title'}, {'fields': 'id,assignee,reviewer'}, {'include': 'users'})
+    # Browsable API (regular Response) and JSON (streamed) clients.
+    ACCEPT = ('text/html', 'application/json')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [create_user(f'user-{i}@example.com', f'User {i}') for i in range(3)]
+        cls.user = cls.users[0]
+        cls.idle_user = create_user('idle@example.com')
+        cls.board = Board.objects.create(title='Board', owner=cls.user, member_count=3)
+        cls.board.members.add(*cls.users)
+        create_tasks(cls.board, cls.users, 30)
+
+    def fetch(self, client, url, params, accept):
+        response = client.get(url, params, HTTP_ACCEPT=accept)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        self.assertEqual(response.status_code, 200, content)
+        return content
+
+    def assert_queries(self, user, has_tasks):
+        client = client_for(user)
+        for fast_path_endpoints, url, params, accept in itertools.product(
+            (['assigned-to-me', 'task-reviewing'], []), self.URLS, self.PARAMS, self.ACCEPT,
+        ):
+            with self.subTest(url=url, fast_path=bool(fast_path_endpoints), accept=accept, **params):
+                side_loaded = has_tasks and 'include' in params
+                # Token lookup, the tasks and, if side-loaded, their users.
+                with override_settings(FAST_READ_ENDPOINTS=fast_path_endpoints):
+                    with self.assertNumQueries(2 + side_loaded):
+                        self.fetch(client, url, params, accept)
+
+    def test_tasks_are_read_with_one_query(self):
+        self.assert_queries(self.user, has_tasks=True)
+
+    def test_empty_list_needs_no_extra_query(self):
+        self.assert_queries(self.idle_user, has_tasks=False)
+
+
+@override_settings(ASYNC_READ_VIEWS=False)
+class BoardAccessQueryTests(TestCase):
+    """
+    Permission checks read the user's boards once per request
+    (CustomUser.accessible_board_ids) and never reuse them in a later one.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner@example.com')
+        cls.member = create_user('member@example.com')
+        cls.board = Board.objects.create(title='Board', owner=cls.owner, member_count=2)
+        cls.board.members.add(cls.owner, cls.member)
+        cls.task = create_tasks(cls.board, [cls.owner, cls.member], 5)[0]
+
+    def setUp(self):
+        self.client = client_for(self.member)
+
+    def request(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data, format='json')
+        board_lookups = [q['sql'] for q in queries if 'UNION' in q['sql']]
+        self.assertEqual(len(board_lookups), 1, board_lookups)
+        return response, len(queries)
+
+    def test_detail_reads_check_access_with_one_query(self):
+        # Token, board, accessible boards, owner, members and tasks.
+        response, count = self.request('get', f'/api/boards/{self.board.pk}/')
+        self.assertEqual((response.status_code, count), (200, 6))
+        # Token, task and accessible boards.
+        response, count = self.request('get', f'/api/tasks/{self.task.pk}/')
+        self.assertEqual((response.status_code, count), (200, 3))
+        # Token, accessible boards and the tasks.
+        response, count = self.request('get', f'/api/boards/{self.board.pk}/tasks/')
+        self.assertEqual((response.status_code, count), (200, 3))
+
+    def test_writes_and_nested_checks_share_the_lookup(self):
+        for method, url, data, status in [
+            ('patch', f'/api/tasks/{self.task.pk}/', {'title': 'Changed'}, 200),
+            ('patch', f'/api/boards/{self.board.pk}/', {'title': 'Changed'}, 200),
+            ('post', f'/api/tasks/{self.task.pk}/comments/', {'content': 'Hi'}, 201),
+            ('get', f'/api/tasks/{self.task.pk}/comments/', None, 200),
+        ]:
+            with self.subTest(method=method, url=url):
+                self.assertEqual(self.request(method, url, data)[0].status_code, status)
+
+    def test_membership_changes_apply_to_the_next_request(self):
+        url = f'/api/tasks/{self.task.pk}/'
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.board.members.remove(self.member)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.get(f'/api/boards/{self.board.pk}/').status_code, 403)
+        self.board.members.add(self.member)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+@override_settings(FAST_READ_ENDPOINTS=[])
+@override_settings(ASYNC_READ_VIEWS=False)
+class StreamingTaskListTests(TestCase):
+    """
+    Streamed JSON task lists: encoding and errors before and after the
+    response has started. Only the DRF views stream.
+    """
+
+    URL = '/api/tasks/assigned-to-me/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('user@example.com')
+        cls.board = Board.objects.create(title='Board', owner=cls.user, member_count=1)
+        cls.board.members.add(cls.user)
+        create_tasks(cls.board, [cls.user], 4)
+
+    def setUp(self):
+        self.client = client_for(self.user)
+
+    def failing_chunks(self, good_chunks):
+        def iter_serialized(*args, **kwargs):
+            yield from [[{'id': i}] for i in range(good_chunks)]
+            raise RuntimeError('database went away')
+
+        return mock.patch('tasks_app.api.views.iter_serialized', iter_serialized)
+
+    def test_json_array_matches_renderer(self):
+        for chunks in ([], [[]], [[1], [], [2, 3]], [[{'a': 'ä'}]]):
+            with self.subTest(chunks=chunks):
+                items = [item for chunk in chunks for item in chunk]
+                self.assertEqual(b''.join(iter_json_array(chunks)), JSONRenderer().render(items))
+
+    def test_error_in_first_chunk_is_answered_with_500(self):
+        for params in ({}, {'include': 'users'}):
+            with self.subTest(**params), self.failing_chunks(0), self.assertLogs(level='ERROR'):
+                response = self.client.get(self.URL, params, HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 500)
+                self.assertFalse(response.streaming)
+
+    def test_error_after_first_chunk_aborts_the_stream(self):
+        with self.failing_chunks(1):
+            response = self.client.get(self.URL, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 200)
+            with self.assertRaises(RuntimeError), self.assertLogs('core.streaming', 'ERROR'):
+                b''.join(response.streaming_content)
+
+
+class BoardTaskQueryPlanTests(TestCase):
+    """
+    EXPLAIN every filter/sort combination of the board task list.
+    """
+
+    FILTERS = [
+        {},
+        {'status': 'review'},
+        {'priority': 'high'},
+        {'assignee': 'me'},
+        {'assignee': 'none'},
+        {'reviewer': 'me'},
+        {'due_from': '2025-01-01', 'due_to': '2025-12-31'},
+        {'overdue': 'true'},
+    ]
+    # A due date range sorted by another column cannot be served by one
+    # index; SQLite searches the range and sorts the matching rows.
+    RANGE_FILTERS = ('due_from', 'overdue')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('plan@example.com')
+
+    def plans(self):
+        orderings = [prefix + key for key in SORT_FIELDS for prefix in ('', '-')]
+        for filters, ordering, paged in itertools.product(self.FILTERS, orderings, (False, True)):
+            params = QueryDict(mutable=True)
+            params.update(filters)
+            params['ordering'] = ordering
+            sort_key = ordering.lstrip('-')
+            if paged:
+                value = {'title': 'x', 'id': 1}.get(sort_key, '2025-06-01')
+                params['cursor'] = encode_cursor([value, 1])
+            query = BoardTaskQuery(params, self.user)
+            queryset = query.apply(Task.objects.filter(board_id=1))[:query.limit + 1]
+            label = f'{filters} ordering={ordering} cursor={paged}'
+            yield label, filters, sort_key, queryset.values_list('id').explain()
+
+    @skipUnlessDBFeature('supports_explaining_query_execution')
+    def test_every_combination_searches_an_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('The plan assertions are written for SQLite.')
+        for label, _, _, plan in self.plans():
+            with self.subTest(label):
+                scans = [line for line in plan.splitlines() if 'SCAN' in line and 'USING' not in line]
+                self.assertEqual(scans, [], plan)
+
+    @skipUnlessDBFeature('supports_explaining_query_execution')
+    def test_only_range_filters_sort_in_memory(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('The plan assertions are written for SQLite.')
+        for label, filters, sort_key, plan in self.plans():
+            with self.subTest(label):
+                range_sorted = sort_key != 'due_date' and any(name in filters for name in self.RANGE_FILTERS)
+                if not range_sorted:
+                    self.assertNotIn('USE TEMP B-TREE', plan)
+
+
+class BoardTaskListTests(TestCase):
+    """
+    Pagination and validation of GET /api/boards/<pk>/tasks/.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('owner@example.com')
+        cls.board = Board.objects.create(title='Board', owner=cls.user, member_count=1)
+        cls.board.members.add(cls.user)
+        Task.objects.bulk_create([
+            Task(board=cls.board, title=f'Task {i % 4}', due_date=None if i % 3 == 0 else f'2025-01-{i % 28 + 1:02d}')
+            for i in range(25)
+        ])
+
+    def setUp(self):
+        self.client = client_for(self.user)
+
+    def fetch_all(self, **params):
+        ids, cursor = [], None
+        while True:
+            query = dict(params, limit=4, **({'cursor': cursor} if cursor else {}))
+            response = self.client.get(f'/api/boards/{self.board.pk}/tasks/', query)
+            self.assertEqual(response.status_code, 200, response.content)
+            ids += [task['id'] for task in response.data['results']]
+            cursor = response.data['next']
+            if cursor is None:
+                return ids
+
+    def test_cursor_pages_cover_every_task_once_in_order(self):
+        for ordering in ('due_date', '-due_date', 'title', '-title', 'id', '-id'):
+            with self.subTest(ordering):
+                expected = list(
+                    Task.objects.filter(board=self.board)
+                    .order_by(*BoardTaskQuery({'ordering': ordering}, self.user).ordering())
+                    .values_list('id', flat=True)
+                )
+                self.assertEqual(self.fetch_all(ordering=ordering), expected)
+                self.assertEqual(self.fetch_all(ordering=ordering, fields='id,title'), expected)
+
+    def test_invalid_cursor_is_rejected(self):
+        for ordering, cursor in [
+            ('due_date', ['x', 'abc']),
+            ('due_date', ['2025-13-01', 1]),
+            ('title', [5, 1]),
+            ('id', ['x', 1]),
+        ]:
+            with self.subTest(ordering=ordering, cursor=cursor):
+                response = self.client.get(
+                    f'/api/boards/{self.board.pk}/tasks/',
+                    {'ordering': ordering, 'cursor': encode_cursor(cursor)},
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('cursor', response.data)
+
+
+class TaskOptimisticLockingTests(TestCase):
+    """
+    GET and PATCH /api/tasks/<pk>/ with `ETag` and `If-Match`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('owner@example.com')
+        board = Board.objects.create(title='Board', owner=cls.user, member_count=1)
+        board.members.add(cls.user)
+        cls.task = Task.objects.create(board=board, title='Task')
+
+    def setUp(self):
+        self.client = client_for(self.user)
+        self.url = f'/api/tasks/{self.task.pk}/'
+
+    def patch(self, data, if_match):
+        return self.client.patch(self.url, data, format='json', headers={'If-Match': if_match})
+
+    def test_etag_round_trip(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(etag, '"1"')
+        response = self.patch({'title': 'Changed'}, etag)
+        self.assertEqual((response.status_code, response['ETag']), (200, '"2"'))
+        self.assertEqual(self.client.get(self.url)['ETag'], '"2"')
+
+    def test_stale_or_malformed_if_match_fails(self):
+        self.patch({'title': 'Changed'}, '"1"')
+        for if_match in ('"1"', '"two"'):
+            with self.subTest(if_match):
+                self.assertEqual(self.patch({'title': 'Lost update'}, if_match).status_code, 412)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.title, self.task.version), ('Changed', 2))
+
+
+class TaskSearchTests(TestCase):
+    """
+    GET /api/tasks/search/: snippet escaping and board access.
+    """
+
+    URL = '/api/tasks/search/'
+    SCRIPT = '<script>alert("x")</script>'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = create_user('member@example.com')
+        cls.stranger = create_user('stranger@example.com')
+        cls.board = Board.objects.create(title='Board', owner=cls.member, member_count=1)
+        cls.board.members.add(cls.member)
+        cls.task = Task.objects.create(board=cls.board, title=f'Deploy {cls.SCRIPT}', description='')
+        cls.comment = TaskComment.objects.create(task=cls.task, author=cls.member, content=f'Comment {cls.SCRIPT} deploy')
+
+    def setUp(self):
+        if not search_supported():
+            self.skipTest('Search needs the SQLite FTS5 index.')
+
+    def search(self, user, q):
+        response = client_for(user).get(self.URL, {'q': q})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_snippets_are_html_escaped(self):
+        hits = self.search(self.member, 'script')
+        self.assertEqual({hit['type'] for hit in hits}, {'task', 'comment'})
+        for hit in hits:
+            with self.subTest(hit['type']):
+                self.assertNotIn('<script', hit['snippet'])
+                self.assertIn('&lt;<mark>script</mark>&gt;', hit['snippet'])
+                self.assertIn('&quot;x&quot;', hit['snippet'])
+
+    def test_non_member_finds_nothing(self):
+        self.assertEqual(self.search(self.stranger, 'deploy'), [])
+
+    def test_deleted_board_is_not_searched(self):
+        self.assertEqual(len(self.search(self.member, 'deploy')), 2)
+        request_board_deletion(self.board, self.member)
+        self.assertEqual(self.search(self.member, 'deploy'), [])
+
+
+class DashboardTests(TestCase):
+    """
+    Grouped conditional counts of tasks_app.dashboard.
+    """
+
+    TODAY = datetime.date(2025, 6, 11)  # a Wednesday; the week is June 9-15
+    DUE_DATES = [None, datetime.date(2025, 6, 1), datetime.date(2025, 6, 9), TODAY, datetime.date(2025, 6, 15), datetime.date(2025, 6, 16)]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.other = create_user('user@example.com'), create_user('other@example.com')
+        cls.boards = [Board.objects.create(title=f'Board {i}', owner=cls.user) for i in range(2)]
+        roles = [(cls.user, None), (None, cls.user), (cls.user, cls.user), (cls.other, cls.other)]
+        Task.objects.bulk_create([
+            Task(board=board, title='Task', status=status, priority=priority, due_date=due_date, assignee=assignee, reviewer=reviewer)
+            for board in cls.boards
+            for (status, _), (priority, _), due_date, (assignee, reviewer) in itertools.product(
+                Task.STATUS_CHOICES, Task.PRIORITY_CHOICES, cls.DUE_DATES, roles,
+            )
+            if board == cls.boards[0] or priority != Task.PRIORITY_LOW
+        ])
+
+    def expected(self, board):
+        week = (datetime.date(2025, 6, 9), datetime.date(2025, 6, 15))
+        counts = dict.fromkeys(COUNTERS, 0)
+        for task in Task.objects.filter(board=board):
+            if self.user.pk not in (task.assignee_id, task.reviewer_id):
+                continue
+            is_open = task.status != Task.STATUS_DONE
+            counts['assigned'] += task.assignee_id == self.user.pk
+            counts['reviewing'] += task.reviewer_id == self.user.pk
+            counts['overdue'] += is_open and task.due_date is not None and task.due_date < self.TODAY
+            counts['due_this_week'] += is_open and task.due_date is not None and week[0] <= task.due_date <= week[1]
+            counts['high_priority'] += is_open and task.priority == Task.PRIORITY_HIGH
+        return counts
+
+    def test_counts_match_the_tasks(self):
+        with self.assertNumQueries(1):
+            data = dashboard_counts(self.user, today=self.TODAY)
+        self.assertEqual(
+            data['boards'],
+            [{'board_id': board.pk, 'title': board.title, **self.expected(board)} for board in self.boards],
+        )
+        self.assertEqual(
+            data['total'],
+            {name: sum(self.expected(board)[name] for board in self.boards) for name in COUNTERS},
+        )
+
+    def test_user_without_tasks_and_deleted_boards(self):
+        self.assertEqual(dashboard_counts(create_user('idle@example.com'), today=self.TODAY), {
+            'boards': [], 'total': dict.fromkeys(COUNTERS, 0),
+        })
+        request_board_deletion(self.boards[1], self.user)
+        data = dashboard_counts(self.user, today=self.TODAY)
+        self.assertEqual([board['board_id'] for board in data['boards']], [self.boards[0].pk])
+
+    def test_endpoint_reads_counts_with_one_query(self):
+        client = client_for(self.user)
+        # Token lookup and the grouped count.
+        with self.assertNumQueries(2):
+            response = client.get('/api/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['boards']), 2)
+
+
+class CommentFeedTests(TestCase):
+    """
+    GET /api/tasks/comments/: keyset pagination over the UNION feed.
+    """
+
+    URL = '/api/tasks/comments/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.other = create_user('user@example.com'), create_user('other@example.com')
+        board = Board.objects.create(title='Board', owner=cls.other)
+        tasks = [
+            Task.objects.create(board=board, title='Assigned', assignee=cls.user),
+            Task.objects.create(board=board, title='Reviewing', reviewer=cls.user),
+            Task.objects.create(board=board, title='Both', assignee=cls.user, reviewer=cls.user),
+        ]
+        unrelated = Task.objects.create(board=board, title='Other', assignee=cls.other)
+        comments = TaskComment.objects.bulk_create([
+            TaskComment(task=task, author=cls.other, content=f'Comment {i}')
+            for i in range(7) for task in [*tasks, unrelated]
+        ])
+        # Several comments per timestamp, so the id decides within a timestamp.
+        base = timezone.now().replace(microsecond=0)
+        for i, comment in enumerate(comments):
+            TaskComment.objects.filter(pk=comment.pk).update(created_at=base + datetime.timedelta(seconds=i // 5))
+        cls.expected = list(
+            TaskComment.objects.filter(task__in=tasks).order_by('created_at', 'id').values_list('id', flat=True)
+        )
+
+    def setUp(self):
+        self.client = client_for(self.user)
+
+    def test_pages_cover_every_comment_once_in_order(self):
+        for limit in (1, 3, 5, 21, 50):
+            with self.subTest(limit=limit):
+                ids, cursor = [], None
+                while True:
+                    params = {'limit': limit, **({'cursor': cursor} if cursor else {})}
+                    response = self.client.get(self.URL, params)
+                    self.assertEqual(response.status_code, 200, response.content)
+                    ids += [comment['id'] for comment in response.data['results']]
+                    cursor = response.data['next']
+                    if cursor is None:
+                        break
+                self.assertEqual(ids, self.expected)
+
+    def test_malformed_cursors_are_rejected(self):
+        for cursor in [
+            'not base64 !',
+            encode_cursor({'created_at': '2025-01-01T00:00:00+00:00'}),
+            encode_cursor(['2025-01-01T00:00:00+00:00']),
+            encode_cursor(['2025-01-01T00:00:00+00:00', 'x']),
+            encode_cursor(['2025-01-01T00:00:00+00:00', True]),
+            encode_cursor(['2025-01-01T00:00:00', 1]),
+            encode_cursor(['yesterday', 1]),
+            encode_cursor([5, 1]),
+        ]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.URL, {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('cursor', response.data)